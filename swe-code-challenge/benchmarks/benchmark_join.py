@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Benchmarks the join between the status file and history file collections.
+
+Builds synthetic collections at increasing sizes and times
+StatusFileSectionCollection.get_user_installed_packages. The time per package
+should stay flat as the sizes grow since the join is a single linear pass.
+
+Usage:
+    python3 benchmarks/benchmark_join.py
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), ".." ) )
+
+from my_module.models import StatusFileSection, StatusFileSectionCollection, HistoryFileSection, HistoryFileSectionCollection
+
+
+SIZES = [1000, 2000, 4000, 8000, 16000]
+PACKAGES_PER_TRANSACTION = 5
+REPEATS = 5
+
+
+def build_collections(package_count: int) -> tuple:
+    """Builds a status file collection with the given number of packages and a history
+    file collection where every other package was installed by a user
+
+    Args:
+        package_count (int): The number of packages in the status file
+
+    Returns:
+        tuple: The StatusFileSectionCollection and HistoryFileSectionCollection
+    """
+    status_file_section_collection = StatusFileSectionCollection()
+    history_file_section_collection = HistoryFileSectionCollection()
+    start_date = datetime( 2020, 1, 1 )
+
+    for index in range( package_count ):
+        status_file_section = StatusFileSection()
+        status_file_section.package = f"package-{index}"
+        status_file_section.version = f"1.{index}-1"
+        status_file_section.installed_size = str( index )
+        status_file_section_collection.append( status_file_section )
+
+    user_packages = [f"package-{index}" for index in range( 0, package_count, 2 )]
+
+    for offset in range( 0, len( user_packages ), PACKAGES_PER_TRANSACTION ):
+        history_file_section = HistoryFileSection()
+        history_file_section.start_date = start_date + timedelta( minutes=offset )
+        history_file_section.end_date = start_date + timedelta( minutes=offset, seconds=30 )
+        history_file_section.requested_by = "benchmark"
+        history_file_section.packages = user_packages[offset:offset + PACKAGES_PER_TRANSACTION]
+        history_file_section_collection.append( history_file_section )
+
+    return status_file_section_collection, history_file_section_collection
+
+
+def time_join(status_file_section_collection: StatusFileSectionCollection, history_file_section_collection: HistoryFileSectionCollection) -> float:
+    """Times the join, keeping the best of several runs
+
+    Returns:
+        float: The fastest run in seconds
+    """
+    best = float( "inf" )
+
+    for _ in range( REPEATS ):
+        started = time.perf_counter()
+        status_file_section_collection.get_user_installed_packages( history_file_section_collection )
+        best = min( best, time.perf_counter() - started )
+
+    return best
+
+
+def main():
+    print( f"{'packages':>10} {'transactions':>13} {'seconds':>10} {'us/package':>11}" )
+
+    for size in SIZES:
+        status_file_section_collection, history_file_section_collection = build_collections( size )
+        seconds = time_join( status_file_section_collection, history_file_section_collection )
+        transactions = len( history_file_section_collection.get_history_file_section_collection() )
+
+        print( f"{size:>10} {transactions:>13} {seconds:>10.5f} {seconds / size * 1e6:>11.3f}" )
+
+
+if __name__ == "__main__":
+    main()
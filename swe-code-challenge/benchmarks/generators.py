@@ -0,0 +1,181 @@
+"""Generators for synthetic dpkg status files and apt history logs.
+
+The generated files follow the layout of the real files closely enough to exercise
+every code path of the parsers, including the edge cases found on long lived hosts:
+multi-line descriptions, packages removed but for their configuration files (without an
+Installed-Size), Commandline lines without an install command, transactions for packages
+that were later removed and a truncated final stanza.
+
+Usage:
+    python3 benchmarks/generators.py --packages 10000 --transactions 1000 --output-dir /tmp/synthetic
+"""
+import os
+import random
+import argparse
+from datetime import datetime, timedelta
+from typing import TextIO
+
+
+SECTIONS = ["admin", "devel", "libs", "net", "python", "utils", "web", "text", "editors", "oldlibs"]
+USERS = ["root", "alice", "bob", "carol", "deploy", "ci"]
+WORDS = ["library", "tools", "development", "files", "runtime", "support", "network", "utility", "data", "module", "bindings", "daemon"]
+NON_INSTALL_COMMANDS = ["apt-get upgrade -y", "apt-get autoremove -y", "apt upgrade", "apt-get dist-upgrade", "apt-get update"]
+
+
+def package_name(index: int) -> str:
+    """Builds the name of the package at the index
+
+    Args:
+        index (int): The index of the package
+
+    Returns:
+        str: The package name
+    """
+    return f"pkg-{WORDS[index % len( WORDS )]}-{index}"
+
+
+def write_status_file(status_file: TextIO, package_count: int, seed: int = 0):
+    """Writes a status file with the given number of packages
+
+    Args:
+        status_file (TextIO): The stream the status file is written to
+        package_count (int): The number of packages
+        seed (int): The seed of the random generator so the same file is produced every run
+    """
+    generator = random.Random( seed )
+
+    for index in range( package_count ):
+        name = package_name( index )
+        # A removed package keeps its stanza until it is purged but has no installed size
+        config_files = generator.random() < 0.02
+        lines = [
+            f"Package: {name}",
+            "Status: deinstall ok config-files" if config_files else "Status: install ok installed",
+            f"Priority: {generator.choice( ['optional', 'important', 'required'] )}",
+            f"Section: {generator.choice( SECTIONS )}",
+        ]
+
+        if not config_files:
+            lines.append( f"Installed-Size: {generator.randint( 1, 250000 )}" )
+
+        lines += [
+            "Maintainer: Synthetic Maintainers <synthetic@example.com>",
+            "Architecture: amd64",
+            f"Version: {generator.randint( 0, 9 )}.{generator.randint( 0, 40 )}-{generator.randint( 1, 9 )}",
+        ]
+
+        if index:
+            dependencies = sorted( { package_name( generator.randrange( index ) ) for _ in range( generator.randint( 0, 5 ) ) } )
+
+            if dependencies:
+                lines.append( f"Depends: {', '.join( dependencies )}" )
+
+        if generator.random() < 0.1:
+            lines.append( "Conffiles:" )
+            lines.append( f" /etc/{name}/{name}.conf 0123456789abcdef0123456789abcdef" )
+
+        lines.append( f"Description: {' '.join( generator.choices( WORDS, k=4 ) )}" )
+
+        # Multi-line descriptions with paragraph separators and bullet lists
+        for paragraph in range( generator.randint( 1, 3 ) ):
+            if paragraph:
+                lines.append( " ." )
+
+            for _ in range( generator.randint( 1, 4 ) ):
+                lines.append( f" {' '.join( generator.choices( WORDS, k=10 ) )}" )
+
+            if generator.random() < 0.3:
+                lines.append( f"  * {' '.join( generator.choices( WORDS, k=5 ) )}" )
+
+        status_file.write( "\n".join( lines ) + "\n\n" )
+
+
+def write_history_log(history_log: TextIO, transaction_count: int, package_count: int, seed: int = 0, truncate: bool = True):
+    """Writes an apt history log with the given number of transactions
+
+    Args:
+        history_log (TextIO): The stream the history log is written to
+        transaction_count (int): The number of transactions
+        package_count (int): The number of packages in the matching status file
+        seed (int): The seed of the random generator so the same file is produced every run
+        truncate (bool): Whether the last transaction is cut off before its End-Date as if apt was still running
+    """
+    generator = random.Random( seed )
+    start_date = datetime( 2018, 1, 1 )
+
+    for index in range( transaction_count ):
+        start_date += timedelta( minutes=generator.randint( 1, 600 ) )
+        end_date = start_date + timedelta( seconds=generator.randint( 1, 300 ) )
+        lines = [f"Start-Date: {start_date:%Y-%m-%d  %H:%M:%S}"]
+
+        roll = generator.random()
+
+        if roll < 0.6:
+            # Some installs name packages that are not in the status file, they were removed later
+            packages = [package_name( generator.randrange( int( package_count * 1.1 ) + 1 ) ) for _ in range( generator.randint( 1, 6 ) )]
+            flags = generator.choice( ["", "-y ", "--no-install-recommends ", "-y --reinstall "] )
+            lines.append( f"Commandline: apt-get install {flags}{' '.join( packages )}" )
+            lines.append( f"Requested-By: {generator.choice( USERS )} ({generator.randint( 1000, 1010 )})" )
+            lines.append( "Install: " + ", ".join( f"{package}:amd64 (1.0-1)" for package in packages ) )
+        elif roll < 0.8:
+            lines.append( f"Commandline: {generator.choice( NON_INSTALL_COMMANDS )}" )
+            upgraded = [package_name( generator.randrange( package_count ) ) for _ in range( generator.randint( 1, 20 ) )]
+            lines.append( "Upgrade: " + ", ".join( f"{package}:amd64 (1.0-1, 1.0-2)" for package in upgraded ) )
+        elif roll < 0.9:
+            removed = package_name( generator.randrange( package_count ) )
+            lines.append( f"Commandline: apt-get remove -y {removed}" )
+            lines.append( f"Requested-By: {generator.choice( USERS )} ({generator.randint( 1000, 1010 )})" )
+            lines.append( f"Remove: {removed}:amd64 (1.0-1)" )
+        else:
+            # Unattended upgrades do not have a Commandline
+            upgraded = package_name( generator.randrange( package_count ) )
+            lines.append( f"Upgrade: {upgraded}:amd64 (1.0-1, 1.0-2)" )
+
+        if truncate and index == transaction_count - 1:
+            # The last transaction is cut off in the middle of a line
+            history_log.write( "\n".join( lines )[:-5] )
+            return
+
+        lines.append( f"End-Date: {end_date:%Y-%m-%d  %H:%M:%S}" )
+        history_log.write( "\n".join( lines ) + "\n\n" )
+
+
+def generate(output_directory: str, package_count: int, transaction_count: int, seed: int = 0) -> tuple:
+    """Writes a status file and history log into the output directory
+
+    Args:
+        output_directory (str): The directory the files are written to
+        package_count (int): The number of packages in the status file
+        transaction_count (int): The number of transactions in the history log
+        seed (int): The seed of the random generator
+
+    Returns:
+        tuple: The paths of the status file and history log
+    """
+    os.makedirs( output_directory, exist_ok=True )
+    status_file_path = os.path.join( output_directory, "status" )
+    history_log_path = os.path.join( output_directory, "history.log" )
+
+    with open( status_file_path, "w" ) as status_file:
+        write_status_file( status_file, package_count, seed )
+
+    with open( history_log_path, "w" ) as history_log:
+        write_history_log( history_log, transaction_count, package_count, seed )
+
+    return status_file_path, history_log_path
+
+
+def main():
+    argument_parser = argparse.ArgumentParser( description="Generates a synthetic dpkg status file and apt history log" )
+    argument_parser.add_argument( "--packages", type=int, default=1000, help="Number of packages in the status file" )
+    argument_parser.add_argument( "--transactions", type=int, default=100, help="Number of transactions in the history log" )
+    argument_parser.add_argument( "--seed", type=int, default=0, help="Seed of the random generator" )
+    argument_parser.add_argument( "--output-dir", required=True, help="Directory the files are written to" )
+    arguments = argument_parser.parse_args()
+
+    for path in generate( arguments.output_dir, arguments.packages, arguments.transactions, arguments.seed ):
+        print( path )
+
+
+if __name__ == "__main__":
+    main()
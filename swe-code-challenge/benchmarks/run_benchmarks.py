@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Times each stage of parse_for_package_list on synthetic data.
+
+The tokenize, parse, join and output stages are timed separately for the status file and
+history log at each size and the results are written as JSON.  Passing the results of an
+earlier run with --compare prints how much each stage changed.
+
+Usage:
+    python3 benchmarks/run_benchmarks.py --case 1000:100 --case 20000:5000 --output results.json
+    python3 benchmarks/run_benchmarks.py --output new.json --compare results.json
+"""
+import io
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+
+sys.path.insert( 0, os.path.join( os.path.dirname( os.path.abspath( __file__ ) ), ".." ) )
+sys.path.insert( 0, os.path.dirname( os.path.abspath( __file__ ) ) )
+
+import generators
+from my_module.parsers import HistoryFileParser, StatusFileParser, MmapHistoryFileParser, MmapStatusFileParser
+
+
+DEFAULT_CASES = ["1000:100", "10000:1000", "50000:10000"]
+PARSERS = {
+    "text": ( HistoryFileParser, StatusFileParser ),
+    "mmap": ( MmapHistoryFileParser, MmapStatusFileParser ),
+}
+
+
+def time_stage(timings: dict, stage: str, function, *args):
+    """Runs the function and records how long it took under the stage's name
+
+    Args:
+        timings (dict): The timings of the current repeat keyed by stage
+        stage (str): The name of the stage
+        function: The function to time
+
+    Returns:
+        The value returned by the function
+    """
+    started = time.perf_counter()
+    value = function( *args )
+    timings[stage] = time.perf_counter() - started
+
+    return value
+
+
+def write_output(lines: list) -> str:
+    """Formats the output the same way parse_for_package_list does but into memory
+
+    Args:
+        lines (list): The formatted packages
+
+    Returns:
+        str: The output
+    """
+    output = io.StringIO()
+
+    for line in lines:
+        print( line, file=output )
+
+    return output.getvalue()
+
+
+def run_case(status_file_path: str, history_log_path: str, parser_name: str, repeats: int) -> dict:
+    """Times every stage of one case
+
+    Args:
+        status_file_path (str): The path to the synthetic status file
+        history_log_path (str): The path to the synthetic history log
+        parser_name (str): The name of the parsers to use
+        repeats (int): The number of times each stage is run
+
+    Returns:
+        dict: The best and mean time of each stage in seconds along with the record counts
+    """
+    logger = logging.getLogger( "benchmark" )
+    history_file_parser_class, status_file_parser_class = PARSERS[parser_name]
+    history_file_parser = history_file_parser_class( logger )
+    status_file_parser = status_file_parser_class( logger )
+    runs = []
+    counts = {}
+
+    for _ in range( repeats ):
+        timings = {}
+
+        with open( history_log_path, "r" ) as history_log:
+            history_contents = time_stage( timings, "history_read", history_log.read )
+
+        history_tokens = time_stage( timings, "history_tokenize", history_file_parser.tokenize, history_contents )
+        history_file_section_collection = time_stage( timings, "history_parse", history_file_parser.parse, history_tokens )
+
+        with open( status_file_path, "r" ) as status_file:
+            status_contents = time_stage( timings, "status_read", status_file.read )
+
+        status_tokens = time_stage( timings, "status_tokenize", status_file_parser.tokenize, status_contents )
+        status_file_section_collection = time_stage( timings, "status_parse", status_file_parser.parse, status_tokens )
+        lines = time_stage( timings, "join", status_file_section_collection.get_user_installed_packages, history_file_section_collection )
+        time_stage( timings, "output", write_output, lines )
+
+        timings["total"] = sum( timings.values() )
+        runs.append( timings )
+        counts = {
+            "history_sections": len( history_file_section_collection.get_history_file_section_collection() ),
+            "status_sections": len( status_file_section_collection ),
+            "output_lines": len( lines ),
+        }
+
+    stages = {
+        stage: {
+            "best": min( run[stage] for run in runs ),
+            "mean": sum( run[stage] for run in runs ) / len( runs ),
+        }
+        for stage in runs[0]
+    }
+
+    return { "stages": stages, "counts": counts }
+
+
+def get_git_commit() -> str:
+    """Gets the commit being benchmarked so results can be matched to a release
+
+    Returns:
+        str: The commit hash or unknown if git is not available
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname( os.path.abspath( __file__ ) )
+        ).stdout.strip()
+    except ( OSError, subprocess.CalledProcessError ):
+        return "unknown"
+
+
+def compare(results: dict, previous_results: dict):
+    """Prints the change of each stage's best time against an earlier run
+
+    Args:
+        results (dict): The results of this run
+        previous_results (dict): The results of the earlier run
+    """
+    previous_cases = { ( case["packages"], case["transactions"], case["parser"] ): case for case in previous_results["cases"] }
+
+    for case in results["cases"]:
+        previous_case = previous_cases.get( ( case["packages"], case["transactions"], case["parser"] ) )
+
+        if not previous_case:
+            continue
+
+        print( f"\n{case['parser']} {case['packages']} packages / {case['transactions']} transactions" )
+
+        for stage, timing in case["stages"].items():
+            previous_timing = previous_case["stages"].get( stage )
+
+            if previous_timing and previous_timing["best"]:
+                change = ( timing["best"] - previous_timing["best"] ) / previous_timing["best"] * 100
+                print( f"  {stage:<18} {previous_timing['best']:>10.4f}s -> {timing['best']:>10.4f}s {change:>+8.1f}%" )
+
+
+def main():
+    argument_parser = argparse.ArgumentParser( description="Times each stage of the parsers on synthetic data" )
+    argument_parser.add_argument( "--case", action="append", help="PACKAGES:TRANSACTIONS to benchmark, may be repeated" )
+    argument_parser.add_argument( "--parser", action="append", choices=sorted( PARSERS ), help="Parsers to benchmark, may be repeated" )
+    argument_parser.add_argument( "--repeats", type=int, default=3, help="Number of times each case is run" )
+    argument_parser.add_argument( "--seed", type=int, default=0, help="Seed of the data generators" )
+    argument_parser.add_argument( "--output", default="benchmark-results.json", help="File the JSON results are written to" )
+    argument_parser.add_argument( "--compare", help="JSON results of an earlier run to compare against" )
+    arguments = argument_parser.parse_args()
+
+    # Warnings for skipped lines are part of the parse cost but should not flood the console
+    logging.getLogger( "benchmark" ).addHandler( logging.NullHandler() )
+    logging.getLogger( "benchmark" ).propagate = False
+
+    results = {
+        "metadata": {
+            "created": datetime.now( timezone.utc ).isoformat(),
+            "commit": get_git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeats": arguments.repeats,
+        },
+        "cases": [],
+    }
+
+    with tempfile.TemporaryDirectory() as data_directory:
+        for case in arguments.case or DEFAULT_CASES:
+            package_count, transaction_count = ( int( value ) for value in case.split( ":" ) )
+            status_file_path, history_log_path = generators.generate(
+                os.path.join( data_directory, case.replace( ":", "-" ) ), package_count, transaction_count, arguments.seed
+            )
+
+            for parser_name in arguments.parser or ["text"]:
+                result = run_case( status_file_path, history_log_path, parser_name, arguments.repeats )
+                results["cases"].append( { "packages": package_count, "transactions": transaction_count, "parser": parser_name, **result } )
+
+                print( f"{parser_name} {package_count} packages / {transaction_count} transactions: {result['stages']['total']['best']:.4f}s" )
+
+    with open( arguments.output, "w" ) as output:
+        json.dump( results, output, indent=2 )
+
+    if arguments.compare:
+        with open( arguments.compare, "r" ) as previous_output:
+            compare( results, json.load( previous_output ) )
+
+
+if __name__ == "__main__":
+    main()
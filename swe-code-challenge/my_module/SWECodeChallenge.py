@@ -1,9 +1,40 @@
 import os
+import sys
+import signal
+import asyncio
+import itertools
 import logging
+import argparse
+from datetime import datetime, time
+from concurrent.futures import Executor
 from my_module.parsers.HistoryFileParser import HistoryFileParser
 from my_module.parsers.StatusFileParser import StatusFileParser
 from my_module.parsers.HistoryFileParserInterface import HistoryFileParserInterface
 from my_module.parsers.StatusFileParserInterface import StatusFileParserInterface
+from my_module.parsers.MmapHistoryFileParser import MmapHistoryFileParser
+from my_module.parsers.MmapStatusFileParser import MmapStatusFileParser
+from my_module.parsers.HistoryEventParser import HistoryEventParser
+from my_module.parsers.ExtendedStatesParser import ExtendedStatesParser
+from my_module.parsers.ExtendedStatesParserInterface import ExtendedStatesParserInterface
+from my_module.models.StatusFile.StatusFileSection import StatusFileSection
+from my_module.models.StatusFile.StatusFileSectionCollection import StatusFileSectionCollection
+from my_module.models.HistoryFile.HistoryFileSectionCollection import HistoryFileSectionCollection
+from my_module.models.HistoryFile.PackageEventReplay import PackageEventReplay
+from my_module.models.DependencyGraph.DependencyGraph import DependencyGraph
+from my_module.cache.StatusFileCache import StatusFileCache
+from my_module.cache.HistoryFileCache import HistoryFileCache
+from my_module.profiling.StageProfiler import StageProfiler
+from my_module.profiling.ParseDiagnostics import ParseDiagnostics
+from my_module.daemon.QueryDaemon import QueryDaemon
+from my_module.daemon.QueryClient import QueryClient
+from my_module.fleet.FleetAnalyzer import FleetAnalyzer
+from my_module.models.Result.UserInstalledPackage import UserInstalledPackage
+from my_module.models.Result.PackageChange import PackageChange
+from my_module.output.ResultWriterInterface import ResultWriterInterface
+from my_module.output.TextResultWriter import TextResultWriter
+from my_module.output.JsonLinesResultWriter import JsonLinesResultWriter
+from my_module.output.CsvResultWriter import CsvResultWriter
+from typing import AsyncIterator, Iterable, Iterator, Optional
 
 
 class SWECodeChallenge():
@@ -14,8 +45,11 @@ class SWECodeChallenge():
     # if needed.
     STATUS_FILE = "/var/lib/dpkg/status"
     HISTORY_LOG = "/var/log/apt/history.log"
+    EXTENDED_STATES = "/var/lib/apt/extended_states"
+    # Results joined in the executor per round trip from the event loop
+    ASYNC_BATCH_SIZE = 1024
     
-    def __init__(self, history_file_parser: HistoryFileParserInterface, status_file_parser: StatusFileParserInterface):
+    def __init__(self, history_file_parser: HistoryFileParserInterface, status_file_parser: StatusFileParserInterface, status_file_cache: Optional[StatusFileCache] = None, history_file_cache: Optional[HistoryFileCache] = None, profiler: Optional[StageProfiler] = None, status_file: Optional[str] = None, history_log: Optional[str] = None, history_event_parser: Optional[HistoryEventParser] = None, extended_states_parser: Optional[ExtendedStatesParserInterface] = None, extended_states: Optional[str] = None, logger: Optional[logging] = None, diagnostics: Optional[ParseDiagnostics] = None, extended_states_required: Optional[bool] = None):
         # Allows the user to inject the parser for the history.log file
         # This is type hinted as a HistoryFileParserInterface so that any HistoryFileParser 
         # can be injected if at a later time if a larger refactor would be done.  
@@ -28,33 +62,423 @@ class SWECodeChallenge():
         # This removes implicit dependency.
         self.__status_file_parser = status_file_parser # Make this status file parser
         
-    def parse_for_package_list(self):
+        # Allows the user to inject a cache of the parsed status file
+        # When no cache is injected the status file is streamed through the parser on every run
+        self.__status_file_cache = status_file_cache
+        
+        # Allows the user to inject a cache of the parsed history log
+        # When no cache is injected the history log and its rotated logs are parsed in full on every run
+        self.__history_file_cache = history_file_cache
+        
+        # Records the time, CPU time and allocations of each stage when profiling, a disabled profiler is a no-op
+        self.__profiler = profiler or StageProfiler()
+        
+        # The logger and diagnostics handed to the parsers created by default, they are not pulled out of the injected
+        # parsers since the parser interfaces do not provide them
+        self.__logger = logger or logging.getLogger( __name__ )
+        self.__diagnostics = diagnostics or ParseDiagnostics()
+        
+        # Allows the paths of the files to be overridden (Ex: a copy of another host's files), defaulting to this host's
+        self.__status_file = status_file or self.STATUS_FILE
+        self.__history_log = history_log or self.HISTORY_LOG
+        
+        # Allows the user to inject the parser for the events of the history logs, used when the history is replayed
+        self.__history_event_parser = history_event_parser or HistoryEventParser( self.__logger, self.__profiler, self.__diagnostics )
+        
+        # Allows the user to inject the parser for apt's extended_states file
+        # This is type hinted as an ExtendedStatesParserInterface so that any ExtendedStatesParser can be injected
+        self.__extended_states_parser = extended_states_parser or ExtendedStatesParser( self.__logger, self.__profiler, self.__diagnostics )
+        self.__extended_states = extended_states or self.EXTENDED_STATES
+        
+        # A missing extended_states file would make every installed package look manually installed, so a path that was
+        # asked for must exist while this host's may not exist if apt never installed a dependency
+        self.__extended_states_required = extended_states is not None if extended_states_required is None else extended_states_required
+        
+    def parse_for_package_list(self, since: Optional[datetime] = None, until: Optional[datetime] = None, user: Optional[str] = None, result_writer: Optional[ResultWriterInterface] = None, leaves: bool = False, section: Optional[str] = None, min_size: Optional[int] = None, sort: Optional[str] = None, top: Optional[int] = None):
+        # Outputs the package list as text to the console unless another writer was injected
+        result_writer = result_writer or TextResultWriter( sys.stdout )
+        
+        self.check_files_exist()
+        
+        # Loads the history log, along with any logs rotated from it, as a collection of objects with the relevant data
+        history_file_section_collection = self.load_history_file_section_collection()
+        
+        # Joins each package with the history collection as soon as its section of the status file is available
+        status_file_sections = self.__iter_status_file_sections()
+        
+        if leaves:
+            # The dependency graph needs every section so they are held rather than streamed
+            status_file_sections = list( status_file_sections )
+            
+        # Packages outside the section or smaller than the size are dropped before they are joined
+        user_installed_packages = self.query_user_installed_packages( self.filter_status_file_sections( status_file_sections, section, min_size ), history_file_section_collection, since, until, user )
+        
+        if leaves:
+            user_installed_packages = self.filter_leaves( user_installed_packages, status_file_sections )
+            
+        user_installed_packages = self.select_user_installed_packages( user_installed_packages, sort, top )
+        
+        # Writes the results in batches as they are joined, the parse and join are recorded as their own stages
+        with self.get_profiler().stage( "output" ) as stage:
+            stage.count = result_writer.write_results( user_installed_packages )
+                
+    async def parse_for_package_list_async(self, since: Optional[datetime] = None, until: Optional[datetime] = None, user: Optional[str] = None, executor: Optional[Executor] = None) -> AsyncIterator[UserInstalledPackage]:
+        """Loads the history logs and the status file concurrently in the executor, then streams the joined results
+        without blocking the event loop.  The parsing, decompressing and joining all run in the executor so the
+        event loop is only resumed once the history logs and status file are loaded and once per batch of results.
+
+        Args:
+            since (Optional[datetime]): The earliest start date included, no lower bound if None
+            until (Optional[datetime]): The latest start date included, no upper bound if None
+            user (Optional[str]): The requested by user, every user if None
+            executor (Optional[Executor]): A thread pool the files are loaded in, the event loop's default executor if None
+
+        Raises:
+            FileNotFoundError: If the status file or history log does not exist
+
+        Yields:
+            AsyncIterator[UserInstalledPackage]: A result for each package installed by a user
+        """
+        loop = asyncio.get_running_loop()
+        
+        await loop.run_in_executor( executor, self.check_files_exist )
+        
+        # Reading and decompressing the history logs overlaps with reading and parsing the status file
+        history_file_section_collection, status_file_section_collection = await asyncio.gather(
+            loop.run_in_executor( executor, self.load_history_file_section_collection ),
+            loop.run_in_executor( executor, self.load_status_file_section_collection )
+        )
+        
+        user_installed_packages = iter( self.query_user_installed_packages( status_file_section_collection.get_status_file_section_collection(), history_file_section_collection, since, until, user ) )
+        
+        while True:
+            # The join is advanced in the executor a batch at a time, only one batch is in flight so the generator is never shared
+            batch = await loop.run_in_executor( executor, list, itertools.islice( user_installed_packages, self.ASYNC_BATCH_SIZE ) )
+            
+            if not batch:
+                return
+            
+            for user_installed_package in batch:
+                yield user_installed_package
+        
+    def parse_for_replayed_package_list(self, since: Optional[datetime] = None, until: Optional[datetime] = None, user: Optional[str] = None, result_writer: Optional[ResultWriterInterface] = None, leaves: bool = False, section: Optional[str] = None, min_size: Optional[int] = None, sort: Optional[str] = None, top: Optional[int] = None):
+        """Replays every Install, Remove, Purge and Upgrade of the history logs in a single pass to find the
+        packages that are still explicitly installed, then outputs those the status file says are installed
+
+        Args:
+            since (Optional[datetime]): The earliest install date included, no lower bound if None
+            until (Optional[datetime]): The latest install date included, no upper bound if None
+            user (Optional[str]): The requested by user, every user if None
+            result_writer (Optional[ResultWriterInterface]): Writes the results, text to the console if None
+            leaves (bool): Whether only the packages that are not a dependency of another package listed are output
+            section (Optional[str]): Only the packages in this section are output, every section if None
+            min_size (Optional[int]): Only the packages with at least this installed size in KiB are output, every size if None
+            sort (Optional[str]): The order of the results, largest installed size first if size, the order of the status file otherwise
+            top (Optional[int]): The number of results output, every result if None
+        """
+        result_writer = result_writer or TextResultWriter( sys.stdout )
+        
+        self.check_files_exist()
+        
+        # Replays the events as they are parsed so only the current section of the history is held in memory
+        with self.get_profiler().stage( "history_replay" ):
+            replay = PackageEventReplay().replay( self.get_history_event_parser().iter_events( self.get_history_log() ) )
+            
+        explicitly_installed = replay.get_explicitly_installed( since, until, user )
+        
+        status_file_sections = list( self.__iter_status_file_sections() ) if leaves else self.__iter_status_file_sections()
+        user_installed_packages = self.get_profiler().iterate( "join", StatusFileSectionCollection.join_replayed_packages( self.filter_status_file_sections( status_file_sections, section, min_size ), explicitly_installed ) )
+        
+        if leaves:
+            user_installed_packages = self.filter_leaves( user_installed_packages, status_file_sections )
+            
+        user_installed_packages = self.select_user_installed_packages( user_installed_packages, sort, top )
+        
+        with self.get_profiler().stage( "output" ) as stage:
+            stage.count = result_writer.write_results( user_installed_packages )
+        
+    def parse_for_manual_package_list(self, since: Optional[datetime] = None, until: Optional[datetime] = None, user: Optional[str] = None, result_writer: Optional[ResultWriterInterface] = None, enrich: bool = False, leaves: bool = False, section: Optional[str] = None, min_size: Optional[int] = None, sort: Optional[str] = None, top: Optional[int] = None):
+        """Outputs the installed packages that apt's extended_states does not mark as installed automatically.
+        The history logs are only read to add the requested by user and install date when enrich is set or the
+        packages are narrowed by date or user, which needs the history.
+
+        Args:
+            since (Optional[datetime]): The earliest install date included, no lower bound if None
+            until (Optional[datetime]): The latest install date included, no upper bound if None
+            user (Optional[str]): The requested by user, every user if None
+            result_writer (Optional[ResultWriterInterface]): Writes the results, text to the console if None
+            enrich (bool): Whether the history logs are read for the requested by user and install date
+            leaves (bool): Whether only the packages that are not a dependency of another package listed are output
+            section (Optional[str]): Only the packages in this section are output, every section if None
+            min_size (Optional[int]): Only the packages with at least this installed size in KiB are output, every size if None
+            sort (Optional[str]): The order of the results, largest installed size first if size, the order of the status file otherwise
+            top (Optional[int]): The number of results output, every result if None
+        """
+        result_writer = result_writer or TextResultWriter( sys.stdout )
+        narrowed = bool( since or until or user )
+        
+        # Check to see if status file exists, extended_states may not exist if apt never installed a dependency
+        if( not os.path.exists( self.get_status_file() ) ):
+            raise FileNotFoundError( self.get_status_file() )
+        
+        if not os.path.exists( self.get_extended_states() ):
+            if self.is_extended_states_required():
+                raise FileNotFoundError( self.get_extended_states() )
+            
+            self.get_logger().warning( f"{self.get_extended_states()} does not exist, every installed package is listed as manually installed" )
+        
+        extended_states_collection = self.get_extended_states_parser().parse_extended_states( self.get_extended_states() )
+        history_file_section_collection = None
+        
+        if enrich or narrowed:
+            if( not os.path.exists( self.get_history_log() ) ):
+                raise FileNotFoundError( self.get_history_log() )
+            
+            history_file_section_collection = self.load_history_file_section_collection()
+            
+            if since or until:
+                history_file_section_collection = history_file_section_collection.get_history_file_section_collection_between( since, until )
+                
+            if user:
+                history_file_section_collection = history_file_section_collection.get_history_file_section_collection_by_user( user )
+        
+        status_file_sections = list( self.__iter_status_file_sections() ) if leaves else self.__iter_status_file_sections()
+        user_installed_packages = self.get_profiler().iterate( "join", StatusFileSectionCollection.join_manually_installed_packages( self.filter_status_file_sections( status_file_sections, section, min_size ), extended_states_collection, history_file_section_collection, narrowed ) )
+        
+        if leaves:
+            user_installed_packages = self.filter_leaves( user_installed_packages, status_file_sections )
+            
+        user_installed_packages = self.select_user_installed_packages( user_installed_packages, sort, top )
+        
+        with self.get_profiler().stage( "output" ) as stage:
+            stage.count = result_writer.write_results( user_installed_packages )
+        
+    def parse_for_package_changes(self, old_status_file: Optional[str] = None, since: Optional[datetime] = None, until: Optional[datetime] = None, user: Optional[str] = None, result_writer: Optional[ResultWriterInterface] = None) -> bool:
+        """Outputs the packages installed by a user that were added, removed or changed version between an older status file,
+        or the baseline in the cache when none is given, and the status file.  The sections of both are fingerprinted and only
+        the sections whose fingerprints differ are parsed.
+
+        Args:
+            old_status_file (Optional[str]): The path of the older status file, the baseline taken by the last diff if None
+            since (Optional[datetime]): The earliest install date included, no lower bound if None
+            until (Optional[datetime]): The latest install date included, no upper bound if None
+            user (Optional[str]): The requested by user, every user if None
+            result_writer (Optional[ResultWriterInterface]): Writes the changes, text to the console if None
+
+        Raises:
+            FileNotFoundError: If the older status file does not exist
+            Exception: If there is no older status file and the cache is disabled
+
+        Returns:
+            bool: False if there was no baseline to compare with, a baseline was taken and nothing was output
+        """
+        result_writer = result_writer or TextResultWriter( sys.stdout )
+        
+        self.check_files_exist()
+        
+        if old_status_file is not None and not os.path.exists( old_status_file ):
+            raise FileNotFoundError( old_status_file )
+        
+        if old_status_file is None and not self.get_status_file_cache():
+            raise Exception( "The status file can only be compared with the snapshot when the cache is enabled" )
+        
+        history_file_section_collection = self.load_history_file_section_collection()
+        
+        if since or until:
+            history_file_section_collection = history_file_section_collection.get_history_file_section_collection_between( since, until )
+            
+        if user:
+            history_file_section_collection = history_file_section_collection.get_history_file_section_collection_by_user( user )
+        
+        with self.get_profiler().stage( "status_diff" ) as stage:
+            sections = self.diff_status_files( old_status_file ) if old_status_file is not None else self.get_status_file_cache().diff( self.get_status_file() )
+            
+            if sections is None:
+                return False
+            
+            old_sections, new_sections = sections
+            stage.count = len( old_sections ) + len( new_sections )
+        
+        package_changes = self.get_profiler().iterate( "join", StatusFileSectionCollection.join_package_changes( old_sections, new_sections, history_file_section_collection ) )
+        
+        with self.get_profiler().stage( "output" ) as stage:
+            stage.count = result_writer.write_results( package_changes )
+            
+        return True
+        
+    def diff_status_files(self, old_status_file: str) -> tuple[list[StatusFileSection], list[StatusFileSection]]:
+        """Fingerprints the sections of both status files and parses only the sections that are in one of them
+
+        Args:
+            old_status_file (str): The path of the older status file
+
+        Returns:
+            tuple[list[StatusFileSection], list[StatusFileSection]]: The sections only in the older status file and
+            the sections only in the status file
+        """
+        with open( old_status_file, "r" ) as status_file:
+            old_sections = dict( self.get_status_file_parser().iter_fingerprints( status_file ) )
+            
+        new_sections = []
+        
+        with open( self.get_status_file(), "r" ) as status_file:
+            for fingerprint, section in self.get_status_file_parser().iter_fingerprints( status_file ):
+                # Sections in both files are dropped without being parsed
+                if old_sections.pop( fingerprint, None ) is None:
+                    new_sections.append( section )
+                    
+        return list( self.get_status_file_parser().iter_parse_tokens( old_sections.values() ) ), list( self.get_status_file_parser().iter_parse_tokens( new_sections ) )
+        
+    def check_files_exist(self):
+        """Checks that the status file and history log exist
+
+        Raises:
+            FileNotFoundError: If either file does not exist
+        """
         # Check to see if status file exists
-        if( not os.path.exists( self.STATUS_FILE ) ):
-            raise FileNotFoundError( self.STATUS_FILE )
+        if( not os.path.exists( self.get_status_file() ) ):
+            raise FileNotFoundError( self.get_status_file() )
         
         # Checks to see if history log exists
-        if( not os.path.exists( self.HISTORY_LOG ) ):
-            raise FileNotFoundError( self.HISTORY_LOG )
+        if( not os.path.exists( self.get_history_log() ) ):
+            raise FileNotFoundError( self.get_history_log() )
+        
+    def query_user_installed_packages(self, status_file_sections: Iterable[StatusFileSection], history_file_section_collection: HistoryFileSectionCollection, since: Optional[datetime] = None, until: Optional[datetime] = None, user: Optional[str] = None) -> Iterator[UserInstalledPackage]:
+        """Joins the status file sections with the history narrowed to the range and user given
+
+        Args:
+            status_file_sections (Iterable[StatusFileSection]): The sections of the status file, a generator is joined as it is read
+            history_file_section_collection (HistoryFileSectionCollection): The parsed history logs
+            since (Optional[datetime]): The earliest start date included, no lower bound if None
+            until (Optional[datetime]): The latest start date included, no upper bound if None
+            user (Optional[str]): The requested by user, every user if None
+
+        Returns:
+            Iterator[UserInstalledPackage]: A result for each package installed by a user
+        """
+        if since or until:
+            # Narrows the history to the transactions that started within the range using the collection's sorted start dates
+            history_file_section_collection = history_file_section_collection.get_history_file_section_collection_between( since, until )
         
-        # Pulls the history log's data and breaks it out into sections
-        with open( self.HISTORY_LOG, "r" ) as history_file:
-            history_file_tokens = self.get_history_file_parser().tokenize( history_file.read() ) 
+        if user:
+            # Narrows the history to the transactions requested by the user using the collection's user index
+            history_file_section_collection = history_file_section_collection.get_history_file_section_collection_by_user( user )
             
-        # Parses the history log and passes back a collection of objects with the relevant data
-        history_file_section_collection = self.get_history_file_parser().parse( history_file_tokens )
+        return self.get_profiler().iterate( "join", StatusFileSectionCollection.join_user_installed_packages( status_file_sections, history_file_section_collection ) )
+                
+    def filter_status_file_sections(self, status_file_sections: Iterable[StatusFileSection], section: Optional[str] = None, min_size: Optional[int] = None) -> Iterable[StatusFileSection]:
+        """Drops the sections outside the section or smaller than the size, the sections are passed through untouched when neither is given
+
+        Args:
+            status_file_sections (Iterable[StatusFileSection]): The sections of the status file, a generator is filtered as it is read
+            section (Optional[str]): The package's section, every section if None
+            min_size (Optional[int]): The smallest installed size in KiB kept, every size if None
+
+        Returns:
+            Iterable[StatusFileSection]: The sections that match
+        """
+        if section is None and min_size is None:
+            return status_file_sections
         
-        # Pulls the status file data and breaks it out into sections
-        with open( self.STATUS_FILE, "r" ) as status_file:
-            status_file_tokens = self.get_status_file_parser().tokenize( status_file.read() )
+        return self.get_profiler().iterate( "filter", StatusFileSectionCollection.filter_status_file_sections( status_file_sections, section, min_size ) )
         
-        # Parses the history log and passes back a collection of objects with the relevant data
-        status_file_section_collection = self.get_status_file_parser().parse( status_file_tokens )
+    def select_user_installed_packages(self, user_installed_packages: Iterable[UserInstalledPackage], sort: Optional[str] = None, top: Optional[int] = None) -> Iterable[UserInstalledPackage]:
+        """Orders the results and keeps the first of them before any is formatted
+
+        Args:
+            user_installed_packages (Iterable[UserInstalledPackage]): The results, a generator is only read in full when sorting
+            sort (Optional[str]): The order of the results, largest installed size first if size, the order they were given in otherwise
+            top (Optional[int]): The number of results kept, every result if None
+
+        Returns:
+            Iterable[UserInstalledPackage]: The results to output
+        """
+        if sort != StatusFileSectionCollection.SORT_SIZE:
+            return StatusFileSectionCollection.select_user_installed_packages( user_installed_packages, sort, top )
         
-        # Uses the collections to format output
-        for data in status_file_section_collection.get_user_installed_packages( history_file_section_collection ):
-            # Output to console
-            print(data)
+        with self.get_profiler().stage( "sort" ) as stage:
+            user_installed_packages = StatusFileSectionCollection.select_user_installed_packages( user_installed_packages, sort, top )
+            stage.count = len( user_installed_packages )
+            
+        return user_installed_packages
+        
+    def filter_leaves(self, user_installed_packages: Iterable[UserInstalledPackage], status_file_sections: Iterable[StatusFileSection]) -> list[UserInstalledPackage]:
+        """Drops the packages that another package in the results depends on directly or indirectly, leaving the top level packages
+
+        Args:
+            user_installed_packages (Iterable[UserInstalledPackage]): The results to filter, they are all read before any is returned
+            status_file_sections (Iterable[StatusFileSection]): Every section of the status file, the dependency graph is built from them
+
+        Returns:
+            list[UserInstalledPackage]: The results that are leaves of the dependency graph in the order they were given
+        """
+        with self.get_profiler().stage( "dependency_graph" ) as stage:
+            dependency_graph = DependencyGraph.from_status_file_sections( status_file_sections )
+            stage.count = len( dependency_graph )
+            
+        user_installed_packages = list( user_installed_packages )
+        
+        with self.get_profiler().stage( "leaves" ) as stage:
+            leaves = set( dependency_graph.get_leaves( package.package for package in user_installed_packages ) )
+            user_installed_packages = [package for package in user_installed_packages if package.package in leaves]
+            stage.count = len( user_installed_packages )
+            
+        return user_installed_packages
+        
+    def load_status_file_section_collection(self) -> StatusFileSectionCollection:
+        """Loads the whole parsed status file into memory from the cache when one was injected, otherwise parses the status file
+
+        Returns:
+            StatusFileSectionCollection: A collection of objects storing the data for each package
+        """
+        if self.get_status_file_cache():
+            with self.get_profiler().stage( "status_cache_load" ) as stage:
+                status_file_section_collection = self.get_status_file_cache().load( self.get_status_file() )
+                stage.count = len( status_file_section_collection )
+                
+            return status_file_section_collection
+        
+        # The raw sections are only kept when a field outside the columns was read (Ex: for the dependency graph)
+        status_file_section_collection = StatusFileSectionCollection.from_fields( self.get_status_file_parser().get_fields() )
+        
+        with open( self.get_status_file(), "r" ) as status_file:
+            for section in self.get_status_file_parser().iter_parse( status_file ):
+                status_file_section_collection.append( section )
+                
+        return status_file_section_collection
+                
+    def load_history_file_section_collection(self) -> HistoryFileSectionCollection:
+        """Loads the parsed history log from the cache when one was injected, otherwise parses the history logs
+
+        Returns:
+            HistoryFileSectionCollection: A collection of objects storing the data for packages installed
+        """
+        if not self.get_history_file_cache():
+            # Parses the history log, along with any logs rotated from it, and passes back a collection of objects with the relevant data
+            return self.get_history_file_parser().parse_history_logs( self.get_history_log() )
+        
+        # Loads the parsed history from the cache, only sections appended since the last run are parsed
+        with self.get_profiler().stage( "history_cache_load" ) as stage:
+            history_file_section_collection = self.get_history_file_cache().load( self.get_history_log() )
+            stage.count = len( history_file_section_collection.get_history_file_section_collection() )
+            
+        return history_file_section_collection
+    
+    def __iter_status_file_sections(self) -> Iterator[StatusFileSection]:
+        """Yields the sections of the status file from the cache when one was injected, otherwise streams the status file
+
+        Yields:
+            Iterator[StatusFileSection]: An object for each package in the status file
+        """
+        if self.get_status_file_cache():
+            # Loads the parsed status file from the cache, it is only parsed again if the status file changed
+            yield from self.load_status_file_section_collection().get_status_file_section_collection()
+            return
+        
+        # Streams the status file so each package is parsed, joined and printed as soon as its section is read
+        # rather than reading the whole file and collecting every section first
+        with open( self.get_status_file(), "r" ) as status_file:
+            yield from self.get_status_file_parser().iter_parse( status_file )
             
     def get_history_file_parser(self) -> HistoryFileParser:
         """Gets the history file parser injected into the class
@@ -71,21 +495,385 @@ class SWECodeChallenge():
             StatusFileParser: A parser created for the status file
         """
         return self.__status_file_parser
+    
+    def get_status_file_cache(self) -> Optional[StatusFileCache]:
+        """Gets the status file cache injected into the class
+
+        Returns:
+            Optional[StatusFileCache]: The cache of the parsed status file or None if caching is disabled
+        """
+        return self.__status_file_cache
+    
+    def get_history_file_cache(self) -> Optional[HistoryFileCache]:
+        """Gets the history file cache injected into the class
+
+        Returns:
+            Optional[HistoryFileCache]: The cache of the parsed history log or None if caching is disabled
+        """
+        return self.__history_file_cache
+    
+    def get_profiler(self) -> StageProfiler:
+        """Gets the profiler injected into the class
+
+        Returns:
+            StageProfiler: The profiler, disabled unless profiling was requested
+        """
+        return self.__profiler
+    
+    def get_logger(self) -> logging:
+        """Gets the logger injected into the class
+
+        Returns:
+            logging: Used to log by the parsers created by default
+        """
+        return self.__logger
+    
+    def get_diagnostics(self) -> ParseDiagnostics:
+        """Gets the diagnostics injected into the class
+
+        Returns:
+            ParseDiagnostics: Counts the malformed records found by the parsers created by default
+        """
+        return self.__diagnostics
+    
+    def get_history_event_parser(self) -> HistoryEventParser:
+        """Gets the parser used to replay the events of the history logs
+
+        Returns:
+            HistoryEventParser: The parser for the events of the history logs
+        """
+        return self.__history_event_parser
+    
+    def get_extended_states_parser(self) -> ExtendedStatesParserInterface:
+        """Gets the parser for apt's extended_states file
+
+        Returns:
+            ExtendedStatesParserInterface: The parser for the extended_states file
+        """
+        return self.__extended_states_parser
+    
+    def get_extended_states(self) -> str:
+        """Gets the path of apt's extended_states file being read
+
+        Returns:
+            str: The path of the extended_states file
+        """
+        return self.__extended_states
+    
+    def is_extended_states_required(self) -> bool:
+        """Checks whether a missing extended_states file is an error rather than a warning
+
+        Returns:
+            bool: True if the extended_states file was asked for rather than this host's default
+        """
+        return self.__extended_states_required
+    
+    def get_status_file(self) -> str:
+        """Gets the path of the status file being read
+
+        Returns:
+            str: The path of the status file
+        """
+        return self.__status_file
+    
+    def get_history_log(self) -> str:
+        """Gets the path of the history log being read
+
+        Returns:
+            str: The path of the current history log, its rotated logs are found next to it
+        """
+        return self.__history_log
+
+def parse_datetime_argument(value: str, end_of_day: bool = False) -> datetime:
+    """Converts a date given on the command line to a datetime
+
+    Args:
+        value (str): The date in ISO format (Ex: 2024-01-31 or 2024-01-31 09:15:00)
+        end_of_day (bool): Whether a date without a time is the last moment of the day rather than midnight
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not a valid date
+
+    Returns:
+        datetime: The date given
+    """
+    try:
+        parsed = datetime.fromisoformat( value )
+    except ValueError:
+        raise argparse.ArgumentTypeError( f"'{value}' is not a valid date, use YYYY-MM-DD or YYYY-MM-DD HH:MM:SS" )
+    
+    # A date alone (YYYY-MM-DD or YYYYMMDD) has no time part
+    if end_of_day and len( value.strip() ) <= 10:
+        return datetime.combine( parsed.date(), time.max, parsed.tzinfo )
+    
+    return parsed
+
+def parse_until_argument(value: str) -> datetime:
+    """Converts the --until date given on the command line to a datetime, a date alone includes the whole day
+
+    Args:
+        value (str): The date in ISO format (Ex: 2024-01-31 or 2024-01-31 09:15:00)
+
+    Returns:
+        datetime: The date given or the last moment of the day when no time was given
+    """
+    return parse_datetime_argument( value, end_of_day=True )
+
+def build_argument_parser() -> argparse.ArgumentParser:
+    """Builds the parser for the command line arguments
+
+    Returns:
+        argparse.ArgumentParser: The command line argument parser
+    """
+    argument_parser = argparse.ArgumentParser( description="Lists the packages explicitly installed by a user" )
+    argument_parser.add_argument( "--since", type=parse_datetime_argument, help="Only include packages installed on or after this date (YYYY-MM-DD[ HH:MM:SS])" )
+    argument_parser.add_argument( "--until", type=parse_until_argument, help="Only include packages installed on or before this date (YYYY-MM-DD[ HH:MM:SS]), a date without a time includes the whole day" )
+    argument_parser.add_argument( "--user", help="Only include packages installed by this user (Ex: the name shown on the Requested-By line)" )
+    argument_parser.add_argument( "--mode", choices=["commandline", "replay", "extended-states"], default="commandline", help="Find the packages named by install commands, replay every Install, Remove, Purge and Upgrade and check the result against the status file, or list the installed packages apt's extended_states does not mark as automatic" )
+    argument_parser.add_argument( "--enrich", action="store_true", help="In extended-states mode, read the history logs for the requested by user and install date of each package" )
+    argument_parser.add_argument( "--leaves", action="store_true", help="Only list the packages that no other package listed depends on, directly or indirectly, through Depends, Pre-Depends or Recommends" )
+    argument_parser.add_argument( "--section", help="Only include packages in this section of the archive (Ex: net, which also matches contrib/net)" )
+    argument_parser.add_argument( "--min-size", type=int, metavar="KIB", help="Only include packages whose installed size is at least this many KiB" )
+    argument_parser.add_argument( "--sort", choices=[StatusFileSectionCollection.SORT_STATUS, StatusFileSectionCollection.SORT_SIZE], default=StatusFileSectionCollection.SORT_STATUS, help="Output the packages in the order of the status file or the largest installed size first" )
+    argument_parser.add_argument( "--top", type=int, metavar="N", help="Only output the first N packages, with --sort size the N largest" )
+    argument_parser.add_argument( "--format", choices=sorted( RESULT_WRITERS ), default="text", help="Output each package as a line of text, a line of JSON or a row of CSV" )
+    argument_parser.add_argument( "--parser", choices=["text", "mmap"], default="text", help="Read the files as text line by line or memory map them and scan them as bytes" )
+    argument_parser.add_argument( "--workers", type=int, default=1, help="Processes used to parse large status files, 0 uses every CPU" )
+    argument_parser.add_argument( "--profile", action="store_true", help="Record the time, CPU time, record count and peak allocations of each stage" )
+    argument_parser.add_argument( "--profile-output", help="File the profile report is written to, defaults to standard error" )
+    argument_parser.add_argument( "--profile-format", choices=["json", "lines"], default="json", help="Write the profile as one JSON document or one JSON line per stage" )
+    argument_parser.add_argument( "--cache-dir", default=StatusFileCache.get_default_cache_directory(), help="Directory the parsed status file and history logs are cached in" )
+    argument_parser.add_argument( "--no-cache", action="store_true", help="Parse the status file and history logs in full on every run instead of using the cache" )
+    argument_parser.add_argument( "--status-file", default=SWECodeChallenge.STATUS_FILE, help="Path of the dpkg status file" )
+    argument_parser.add_argument( "--history-log", default=SWECodeChallenge.HISTORY_LOG, help="Path of the apt history log, its rotated logs are read from the same directory" )
+    argument_parser.add_argument( "--extended-states", help=f"Path of apt's extended_states file, it must exist when given, a missing {SWECodeChallenge.EXTENDED_STATES} is only warned about" )
+    argument_parser.add_argument( "--root", help="Directory the status file and history log paths are relative to (Ex: a copy of another host's root filesystem)" )
+    
+    mode = argument_parser.add_mutually_exclusive_group()
+    mode.add_argument( "--daemon", action="store_true", help="Keep the parsed files in memory, reload them when they change and answer queries on the socket" )
+    mode.add_argument( "--client", action="store_true", help="Ask a running daemon for the package list instead of parsing the files" )
+    mode.add_argument( "--fleet", metavar="DIRECTORY", help="List the packages of every host in the directory, one subdirectory per host, prefixing each line with the host" )
+    mode.add_argument( "--diff", metavar="OLD_STATUS_FILE", help="List the packages installed by a user that were added, removed or changed version between this older status file and the status file" )
+    mode.add_argument( "--diff-snapshot", action="store_true", help="List the packages installed by a user that were added, removed or changed version since the snapshot in the cache was taken, then take a new snapshot" )
+    argument_parser.add_argument( "--fleet-workers", type=int, default=0, help="Processes used to parse hosts in fleet mode, 0 uses every CPU" )
+    argument_parser.add_argument( "--socket", help="Path of the daemon's Unix socket, defaults to $XDG_RUNTIME_DIR or the cache directory" )
+    argument_parser.add_argument( "--poll-interval", type=float, default=2.0, help="Seconds between checks for changes when the daemon cannot use inotify" )
+    
+    return argument_parser
+
+def select_status_fields(mode: str, leaves: bool, diff: bool = False, section: bool = False) -> list[str]:
+    """Picks the fields of the status file the run needs so the parser skips every other field.
+    Every output format writes the package, version and installed size, the rest comes from the history logs.
+
+    Args:
+        mode (str): The mode of the run, commandline, replay or extended-states
+        leaves (bool): Whether the results are narrowed to the leaves of the dependency graph
+        diff (bool): Whether two versions of the status file are compared
+        section (bool): Whether the packages are narrowed to a section
+
+    Returns:
+        list[str]: The names of the fields to read from each section of the status file
+    """
+    # Packages are matched by name and architecture and only the installed packages are compared
+    if diff:
+        return ["Package", "Version", "Status", "Architecture"]
+    
+    fields = ["Package", "Version", "Installed-Size"]
+    
+    # Replaying the history and reading extended_states only keep the packages the status file says are installed
+    if mode != "commandline" or leaves:
+        fields.append( "Status" )
+    
+    if section:
+        fields.append( "Section" )
+    
+    if leaves:
+        fields.extend( DependencyGraph.DEPENDENCY_FIELDS )
+        fields.append( DependencyGraph.PROVIDES_FIELD )
+    
+    return fields
+
+def write_profile_report(profiler: StageProfiler, profile_output: Optional[str], stage_lines: bool):
+    """Writes the profile report to the file given or standard error so it does not mix with the package list
+
+    Args:
+        profiler (StageProfiler): The profiler that recorded the run
+        profile_output (Optional[str]): The file the report is written to
+        stage_lines (bool): Whether to write one JSON line per stage
+    """
+    if not profile_output:
+        profiler.write_report( sys.stderr, stage_lines )
+        return
+    
+    with open( profile_output, "w" ) as output:
+        profiler.write_report( output, stage_lines )
+
+RESULT_WRITERS = {
+    "text": TextResultWriter,
+    "jsonl": JsonLinesResultWriter,
+    "csv": CsvResultWriter,
+}
+
+def query_daemon(result_writer: ResultWriterInterface, socket_path: str, since: Optional[datetime], until: Optional[datetime], user: Optional[str]):
+    """Asks a running daemon for the package list and outputs it the same way parse_for_package_list does
+
+    Args:
+        result_writer (ResultWriterInterface): Writes the results in the format requested
+        socket_path (str): The path of the daemon's Unix socket
+        since (Optional[datetime]): The earliest start date included, no lower bound if None
+        until (Optional[datetime]): The latest start date included, no upper bound if None
+        user (Optional[str]): The requested by user, every user if None
+
+    Raises:
+        Exception: If the daemon could not answer the query
+    """
+    response = QueryClient( socket_path ).query( {
+        "query": "packages",
+        "since": since.isoformat() if since else None,
+        "until": until.isoformat() if until else None,
+        "user": user,
+        "format": "records",
+    } )
+    
+    if not response.get( "ok" ):
+        raise Exception( f"The daemon could not answer the query: {response.get( 'error' )}" )
+    
+    result_writer.write_results( UserInstalledPackage.from_dict( values ) for values in response["packages"] )
+
+def analyze_fleet(result_writer: ResultWriterInterface, fleet_analyzer: FleetAnalyzer, root: str, since: Optional[datetime], until: Optional[datetime], user: Optional[str]):
+    """Outputs the packages of every host in the fleet as each host finishes, including the host of each result
+
+    Args:
+        result_writer (ResultWriterInterface): Writes the results in the format requested, including the host
+        fleet_analyzer (FleetAnalyzer): Parses the hosts in a process pool
+        root (str): The directory with one subdirectory per host
+        since (Optional[datetime]): The earliest start date included, no lower bound if None
+        until (Optional[datetime]): The latest start date included, no upper bound if None
+        user (Optional[str]): The requested by user, every user if None
+    """
+    for host, packages, error in fleet_analyzer.iter_results( root, FleetAnalyzer.find_hosts( root ), since, until, user ):
+        if error:
+            print( f"{host}: {error}", file=sys.stderr )
+            continue
+        
+        # Flushed after each host so results stream out as hosts finish
+        result_writer.write_results( packages )
+
+def validate_arguments(argument_parser: argparse.ArgumentParser, arguments: argparse.Namespace):
+    """Rejects the combinations of options the run would otherwise silently ignore
+
+    Args:
+        argument_parser (argparse.ArgumentParser): The parser the arguments came from, used to report the error
+        arguments (argparse.Namespace): The parsed arguments
+
+    Raises:
+        SystemExit: Through argument_parser.error if two options cannot be used together
+    """
+    if arguments.daemon and arguments.profile:
+        argument_parser.error( "--profile cannot be used with --daemon" )
+    
+    diff = arguments.diff is not None or arguments.diff_snapshot
+    size_query = arguments.section is not None or arguments.min_size is not None or arguments.sort != StatusFileSectionCollection.SORT_STATUS or arguments.top is not None
+    
+    if diff and ( arguments.leaves or size_query ):
+        argument_parser.error( "--leaves, --section, --min-size, --sort and --top cannot be used with --diff or --diff-snapshot" )
+    
+    # The daemon answers queries with since, until and user only and each fleet host is listed in full
+    if ( arguments.daemon or arguments.client or arguments.fleet ) and size_query:
+        argument_parser.error( "--section, --min-size, --sort and --top cannot be used with --daemon, --client or --fleet" )
+    
+    # They also only list the packages named by install commands, in full
+    if ( arguments.daemon or arguments.client or arguments.fleet ) and ( arguments.leaves or arguments.mode != "commandline" or arguments.enrich ):
+        argument_parser.error( "--leaves, --mode and --enrich cannot be used with --daemon, --client or --fleet" )
+    
+    if arguments.diff_snapshot and arguments.no_cache:
+        argument_parser.error( "--diff-snapshot cannot be used with --no-cache, the baseline is kept in the cache directory" )
+    
+    if arguments.top is not None and arguments.top < 1:
+        argument_parser.error( "--top must be at least 1" )
 
 def main():
+    argument_parser = build_argument_parser()
+    arguments = argument_parser.parse_args()
+    
+    validate_arguments( argument_parser, arguments )
+    
+    diff = arguments.diff is not None or arguments.diff_snapshot
+    
+    socket_path = arguments.socket or QueryDaemon.get_default_socket_path( arguments.cache_dir )
+    
     try:
         logger = logging.getLogger( __name__ )
         logging.basicConfig( filename="SWECodeChallenge.log", encoding="utf-8", level=logging.INFO )
         
+        if arguments.client:
+            # The daemon already has the files parsed so nothing is parsed here
+            query_daemon( RESULT_WRITERS[arguments.format]( sys.stdout ), socket_path, arguments.since, arguments.until, arguments.user )
+            return
+        
+        if arguments.fleet:
+            # Each host is parsed in a worker process without the caches, they hold a single host's files
+            analyze_fleet( RESULT_WRITERS[arguments.format]( sys.stdout, include_host=True ), FleetAnalyzer( logger, arguments.fleet_workers, arguments.parser ), arguments.fleet, arguments.since, arguments.until, arguments.user )
+            return
+        
+        # Creates the profiler, when profiling was not requested it is disabled and costs nothing
+        profiler = StageProfiler( arguments.profile )
+        
+        # Counts the malformed records of every file so they are logged in a single summary at the end of the run
+        diagnostics = ParseDiagnostics()
+        
+        # Only the fields of the status file the run uses are read
+        status_fields = select_status_fields( arguments.mode, arguments.leaves, diff, arguments.section is not None )
+        
         # Creates instances of parsers
-        hf_parser = HistoryFileParser( logger )
-        sf_parser = StatusFileParser( logger )
+        if arguments.parser == "mmap":
+            hf_parser = MmapHistoryFileParser( logger, profiler, diagnostics )
+            sf_parser = MmapStatusFileParser( logger, arguments.workers, profiler, diagnostics, status_fields )
+        else:
+            hf_parser = HistoryFileParser( logger, profiler, diagnostics )
+            sf_parser = StatusFileParser( logger, arguments.workers, profiler, diagnostics, status_fields )
+        
+        # Creates the caches for the parsed status file and history logs unless they were disabled
+        sf_cache = None if arguments.no_cache else StatusFileCache( arguments.cache_dir, sf_parser, logger )
+        hf_cache = None if arguments.no_cache else HistoryFileCache( arguments.cache_dir, hf_parser, logger )
+        
+        status_file, history_log, extended_states = arguments.status_file, arguments.history_log, arguments.extended_states or SWECodeChallenge.EXTENDED_STATES
+        
+        if arguments.root:
+            # Reads the files from within the root the same way dpkg --root does
+            status_file = os.path.join( arguments.root, status_file.lstrip( os.sep ) )
+            history_log = os.path.join( arguments.root, history_log.lstrip( os.sep ) )
+            extended_states = os.path.join( arguments.root, extended_states.lstrip( os.sep ) )
         
         # Creates instance of SWECodeChallenge
-        # Injects the parsers
-        instance = SWECodeChallenge( hf_parser, sf_parser )
+        # Injects the parsers and caches
+        instance = SWECodeChallenge( hf_parser, sf_parser, sf_cache, hf_cache, profiler, status_file, history_log, extended_states=extended_states, logger=logger, diagnostics=diagnostics, extended_states_required=arguments.extended_states is not None )
+        
+        if arguments.daemon:
+            daemon = QueryDaemon( instance, socket_path, logger, arguments.poll_interval, diagnostics )
+            signal.signal( signal.SIGTERM, lambda signum, frame: daemon.stop() )
+            signal.signal( signal.SIGINT, lambda signum, frame: daemon.stop() )
+            daemon.serve_forever()
+            return
     
-        instance.parse_for_package_list()
+        if diff:
+            # Changes have their own columns rather than the columns of the package list
+            result_writer = CsvResultWriter( sys.stdout, columns=PackageChange.COLUMNS ) if arguments.format == "csv" else RESULT_WRITERS[arguments.format]( sys.stdout )
+            if not instance.parse_for_package_changes( arguments.diff, arguments.since, arguments.until, arguments.user, result_writer ):
+                # An empty diff would look like nothing changed
+                print( f"There was no baseline of {status_file} taken by the {arguments.parser} parser to compare with, one was taken now. Run with --diff-snapshot again to list the changes made since.", file=sys.stderr )
+                sys.exit( 1 )
+        elif arguments.mode == "extended-states":
+            instance.parse_for_manual_package_list( arguments.since, arguments.until, arguments.user, RESULT_WRITERS[arguments.format]( sys.stdout ), arguments.enrich, arguments.leaves, arguments.section, arguments.min_size, arguments.sort, arguments.top )
+        elif arguments.mode == "replay":
+            instance.parse_for_replayed_package_list( arguments.since, arguments.until, arguments.user, RESULT_WRITERS[arguments.format]( sys.stdout ), arguments.leaves, arguments.section, arguments.min_size, arguments.sort, arguments.top )
+        else:
+            instance.parse_for_package_list( arguments.since, arguments.until, arguments.user, RESULT_WRITERS[arguments.format]( sys.stdout ), arguments.leaves, arguments.section, arguments.min_size, arguments.sort, arguments.top )
+        
+        diagnostics.log_summary( logger )
+        
+        if profiler.is_enabled():
+            write_profile_report( profiler, arguments.profile_output, arguments.profile_format == "lines" )
     except FileNotFoundError as fe:
         # Normally I would just raise the exception again with the formatting
         # For the instance where this could be relevant immediately to the reviewer
@@ -1,4 +1,8 @@
-from .models import StatusFileSection, StatusFileSectionCollection, HistoryFileSection, HistoryFileSectionCollection
-from .parsers import StatusFileParser, StatusFileParserInterface, HistoryFileParser, HistoryFileParserInterface
+from .models import StatusFileSection, StatusFileSectionView, StatusFileSectionCollection, HistoryFileSection, HistoryFileSectionCollection, HistoryEvent, PackageEventReplay, UserInstalledPackage, PackageChange, ExtendedStatesCollection, DependencyGraph
+from .parsers import StatusFileParser, StatusFileParserInterface, HistoryFileParser, HistoryFileParserInterface, MmapHistoryFileParser, MmapStatusFileParser, HistoryEventParser, ExtendedStatesParser, ExtendedStatesParserInterface
+from .cache import StatusFileCache, HistoryFileCache
+from .daemon import FileWatcher, QueryClient, QueryDaemon
+from .fleet import FleetAnalyzer
+from .output import ResultWriterInterface, TextResultWriter, JsonLinesResultWriter, CsvResultWriter
 
-__all__ = ["StatusFileSection", "StatusFileSectionCollection", "HistoryFileSection", "HistoryFileSectionCollection", "HistoryFileParser", "HistoryFileParserInterface", "StatusFileParser", "StatusFileParserInterface"]
+__all__ = ["StatusFileSection", "StatusFileSectionView", "StatusFileSectionCollection", "HistoryFileSection", "HistoryFileSectionCollection", "HistoryEvent", "PackageEventReplay", "UserInstalledPackage", "PackageChange", "ExtendedStatesCollection", "DependencyGraph", "HistoryFileParser", "HistoryFileParserInterface", "StatusFileParser", "StatusFileParserInterface", "MmapHistoryFileParser", "MmapStatusFileParser", "HistoryEventParser", "ExtendedStatesParser", "ExtendedStatesParserInterface", "StatusFileCache", "HistoryFileCache", "FileWatcher", "QueryClient", "QueryDaemon", "FleetAnalyzer", "ResultWriterInterface", "TextResultWriter", "JsonLinesResultWriter", "CsvResultWriter"]
@@ -0,0 +1,321 @@
+import io
+import os
+import hashlib
+import logging
+import sqlite3
+from datetime import datetime
+from my_module.models.HistoryFile.HistoryFileSection import HistoryFileSection
+from my_module.models.HistoryFile.HistoryFileSectionCollection import HistoryFileSectionCollection
+from my_module.parsers.HistoryFileParser import HistoryFileParser
+from typing import Optional
+
+
+class HistoryFileCache():
+    # Bumped whenever the snapshot layout changes so older snapshots are rebuilt instead of misread
+    CACHE_VERSION = "1"
+    CACHE_FILE_NAME = "history.sqlite3"
+    # The number of bytes at the start of the history log used to recognize it after it was rotated or truncated
+    HEAD_FINGERPRINT_SIZE = 4096
+
+    def __init__(self, cache_directory: str, history_file_parser: HistoryFileParser, logger: logging):
+        self.__cache_directory = cache_directory
+        self.__history_file_parser = history_file_parser
+        self.__logger = logger
+
+    def load(self, history_log: str) -> HistoryFileSectionCollection:
+        """Loads the parsed history from the snapshot and parses only the sections appended to the
+        history log since the last run.  If the history log was rotated or truncated the history log
+        and its rotated logs are parsed again in full.
+
+        Args:
+            history_log (str): The path to the current history log
+
+        Returns:
+            HistoryFileSectionCollection: A collection of objects storing the data for packages installed
+        """
+        try:
+            os.makedirs( self.__cache_directory, exist_ok=True )
+            connection = sqlite3.connect( self.get_cache_file(), timeout=30 )
+        except ( sqlite3.Error, OSError ) as e:
+            self.get_logger().warning( f"History file cache could not be opened, parsing the history log in full:\n{e}" )
+            return self.get_history_file_parser().parse_history_logs( history_log )
+
+        try:
+            # Holds the write lock for the whole update so concurrent runs do not append the same sections twice
+            connection.execute( "BEGIN IMMEDIATE" )
+            self.__create_tables( connection )
+
+            metadata = dict( connection.execute( "SELECT key, value FROM metadata" ).fetchall() )
+            offset = self.__get_resume_offset( history_log, metadata )
+
+            if offset is None:
+                # The history log was rotated or truncated so everything is parsed again, starting with the rotated logs
+                if metadata:
+                    self.get_logger().info( f"{history_log} was rotated or truncated, rescanning the history logs" )
+                    
+                connection.execute( "DELETE FROM sections" )
+                connection.execute( "DELETE FROM packages" )
+                offset = 0
+
+                rotated_logs = [path for path in self.get_history_file_parser().find_history_logs( history_log ) if path != history_log]
+                self.__insert_sections( connection, self.get_history_file_parser().parse( self.__iter_rotated_log_tokens( rotated_logs ) ) )
+
+            offset = self.__parse_appended_sections( connection, history_log, offset )
+            self.__write_metadata( connection, history_log, offset )
+            connection.commit()
+
+            history_file_section_collection = self.__read_sections( connection )
+
+            # The section apt is still writing is not stored since it is parsed again once it is complete,
+            # it is returned without an end date the same way the parser returns it
+            for history_file_section in self.__parse_in_progress_sections( history_log, offset ).get_history_file_section_collection():
+                history_file_section_collection.append( history_file_section )
+
+            return history_file_section_collection
+        except sqlite3.Error as e:
+            connection.rollback()
+            self.get_logger().warning( f"History file cache could not be updated, parsing the history log in full:\n{e}" )
+            return self.get_history_file_parser().parse_history_logs( history_log )
+        finally:
+            connection.close()
+
+    def get_cache_file(self) -> str:
+        """Gets the path of the snapshot
+
+        Returns:
+            str: The path of the snapshot within the cache directory
+        """
+        return os.path.join( self.__cache_directory, self.CACHE_FILE_NAME )
+
+    def __get_resume_offset(self, history_log: str, metadata: dict) -> Optional[int]:
+        """Checks that the history log is the same file the snapshot was taken from and has only been appended to
+
+        Args:
+            history_log (str): The path to the current history log
+            metadata (dict): The metadata stored with the snapshot
+
+        Returns:
+            Optional[int]: The byte offset to resume parsing from or None if the history log must be parsed again in full
+        """
+        if metadata.get( "version" ) != self.CACHE_VERSION or metadata.get( "history_log" ) != os.path.abspath( history_log ):
+            return None
+
+        file_stat = os.stat( history_log )
+        offset = int( metadata.get( "offset", "0" ) )
+
+        # Logrotate moves the file away so a new inode means the log was rotated
+        if str( file_stat.st_ino ) != metadata.get( "inode" ):
+            return None
+
+        # The file shrinking means it was truncated
+        if file_stat.st_size < offset:
+            return None
+
+        # The start of the file changing means it was rewritten in place
+        if self.__fingerprint_head( history_log, int( metadata.get( "head_length", "0" ) ) ) != metadata.get( "head_fingerprint" ):
+            return None
+
+        return offset
+
+    def __parse_appended_sections(self, connection: sqlite3.Connection, history_log: str, offset: int) -> int:
+        """Parses the complete sections written to the history log after the offset and stores them
+
+        Args:
+            connection (sqlite3.Connection): The connection to the snapshot
+            history_log (str): The path to the current history log
+            offset (int): The byte offset the previous run stopped at
+
+        Returns:
+            int: The byte offset after the last complete section
+        """
+        with open( history_log, "rb" ) as history_file:
+            history_file.seek( offset )
+            appended_contents = history_file.read()
+
+        # A section apt is still writing is left for the next run
+        consumed_length = self.__find_complete_length( appended_contents )
+
+        if consumed_length:
+            appended_text = appended_contents[:consumed_length].decode( "utf-8", errors="replace" )
+            history_file_tokens = self.get_history_file_parser().iter_tokens( io.StringIO( appended_text ), include_in_progress=False )
+            self.__insert_sections( connection, self.get_history_file_parser().parse( history_file_tokens ) )
+
+        return offset + consumed_length
+
+    def __parse_in_progress_sections(self, history_log: str, offset: int) -> HistoryFileSectionCollection:
+        """Parses the section written to the history log after the last complete section without storing it
+
+        Args:
+            history_log (str): The path to the current history log
+            offset (int): The byte offset after the last complete section
+
+        Returns:
+            HistoryFileSectionCollection: The section apt is still writing, empty if every section is complete
+        """
+        with open( history_log, "rb" ) as history_file:
+            history_file.seek( offset )
+            remaining_text = history_file.read().decode( "utf-8", errors="replace" )
+
+        return self.get_history_file_parser().parse( self.get_history_file_parser().iter_tokens( io.StringIO( remaining_text ) ) )
+
+    def __find_complete_length(self, contents: bytes) -> int:
+        """Finds the length of the contents up to and including the last complete End-Date line
+
+        Args:
+            contents (bytes): The contents appended to the history log
+
+        Returns:
+            int: The number of bytes belonging to complete sections
+        """
+        search_end = len( contents )
+
+        while True:
+            index = contents.rfind( b"End-Date:", 0, search_end )
+
+            if index == -1:
+                return 0
+
+            # Only counts End-Date at the start of a line that has been completely written
+            if index == 0 or contents[index - 1:index] == b"\n":
+                line_end = contents.find( b"\n", index )
+
+                if line_end != -1:
+                    return line_end + 1
+
+            search_end = index
+
+    def __iter_rotated_log_tokens(self, rotated_logs: list[str]):
+        """Streams the sections of the rotated logs in chronological order
+
+        Args:
+            rotated_logs (list[str]): The paths of the rotated logs, oldest first
+
+        Yields:
+            Iterator[str]: The segment of text specific to each command ran
+        """
+        for path in rotated_logs:
+            with self.get_history_file_parser().open_history_log( path ) as history_file:
+                yield from self.get_history_file_parser().iter_tokens( history_file )
+
+    def __fingerprint_head(self, history_log: str, head_length: int) -> str:
+        """Hashes the start of the history log
+
+        Args:
+            history_log (str): The path to the current history log
+            head_length (int): The number of bytes to hash
+
+        Returns:
+            str: The hex digest of the start of the history log
+        """
+        with open( history_log, "rb" ) as history_file:
+            return hashlib.blake2b( history_file.read( head_length ), digest_size=20 ).hexdigest()
+
+    def __create_tables(self, connection: sqlite3.Connection):
+        """Creates the snapshot's tables if this is the first run
+
+        Args:
+            connection (sqlite3.Connection): The connection to the snapshot
+        """
+        connection.execute( "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT)" )
+        connection.execute( "CREATE TABLE IF NOT EXISTS sections (position INTEGER PRIMARY KEY, start_date TEXT, end_date TEXT, requested_by TEXT)" )
+        connection.execute( "CREATE TABLE IF NOT EXISTS packages (section_position INTEGER, package_position INTEGER, package TEXT, PRIMARY KEY (section_position, package_position))" )
+
+    def __write_metadata(self, connection: sqlite3.Connection, history_log: str, offset: int):
+        """Stores where parsing stopped along with the values used to recognize the history log next run
+
+        Args:
+            connection (sqlite3.Connection): The connection to the snapshot
+            history_log (str): The path to the current history log
+            offset (int): The byte offset after the last complete section
+        """
+        head_length = min( offset, self.HEAD_FINGERPRINT_SIZE )
+        metadata = {
+            "version": self.CACHE_VERSION,
+            "history_log": os.path.abspath( history_log ),
+            "inode": str( os.stat( history_log ).st_ino ),
+            "offset": str( offset ),
+            "head_length": str( head_length ),
+            "head_fingerprint": self.__fingerprint_head( history_log, head_length ),
+        }
+        connection.executemany( "INSERT OR REPLACE INTO metadata VALUES (?, ?)", metadata.items() )
+
+    def __insert_sections(self, connection: sqlite3.Connection, history_file_section_collection: HistoryFileSectionCollection):
+        """Appends the sections to the snapshot after the sections already stored
+
+        Args:
+            connection (sqlite3.Connection): The connection to the snapshot
+            history_file_section_collection (HistoryFileSectionCollection): The newly parsed sections
+        """
+        position = connection.execute( "SELECT COALESCE(MAX(position), -1) + 1 FROM sections" ).fetchone()[0]
+
+        for section in history_file_section_collection.get_history_file_section_collection():
+            connection.execute(
+                "INSERT INTO sections VALUES (?, ?, ?, ?)",
+                ( position, self.__format_datetime( section.start_date ), self.__format_datetime( section.end_date ), section.requested_by )
+            )
+            connection.executemany(
+                "INSERT INTO packages VALUES (?, ?, ?)",
+                ( ( position, package_position, package ) for package_position, package in enumerate( section.packages ) )
+            )
+            position += 1
+
+    def __read_sections(self, connection: sqlite3.Connection) -> HistoryFileSectionCollection:
+        """Rebuilds the collection from the snapshot
+
+        Args:
+            connection (sqlite3.Connection): The connection to the snapshot
+
+        Returns:
+            HistoryFileSectionCollection: A collection of objects storing the data for packages installed
+        """
+        packages_by_section: dict[int, list[str]] = {}
+
+        for section_position, package in connection.execute( "SELECT section_position, package FROM packages ORDER BY section_position, package_position" ):
+            packages_by_section.setdefault( section_position, [] ).append( package )
+
+        history_file_section_collection = HistoryFileSectionCollection()
+
+        for position, start_date, end_date, requested_by in connection.execute( "SELECT position, start_date, end_date, requested_by FROM sections ORDER BY position" ):
+            history_file_section = HistoryFileSection()
+
+            if start_date:
+                history_file_section.start_date = datetime.fromisoformat( start_date )
+
+            if end_date:
+                history_file_section.end_date = datetime.fromisoformat( end_date )
+
+            history_file_section.requested_by = requested_by
+            history_file_section.packages = packages_by_section[position]
+            history_file_section_collection.append( history_file_section )
+
+        return history_file_section_collection
+
+    def __format_datetime(self, value: Optional[datetime]) -> Optional[str]:
+        """Formats a datetime for storage
+
+        Args:
+            value (Optional[datetime]): The datetime to store
+
+        Returns:
+            Optional[str]: The datetime in ISO format or None
+        """
+        if value is None:
+            return None
+
+        return value.isoformat()
+
+    def get_history_file_parser(self) -> HistoryFileParser:
+        """Gets the history file parser used to parse new sections
+
+        Returns:
+            HistoryFileParser: A parser created for the history file
+        """
+        return self.__history_file_parser
+
+    def get_logger(self) -> logging:
+        """Gets the logger
+
+        Returns:
+            logging: Used to log
+        """
+        return self.__logger
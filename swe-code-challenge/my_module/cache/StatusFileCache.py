@@ -0,0 +1,348 @@
+import os
+import hashlib
+import logging
+import sqlite3
+import tempfile
+import time
+from my_module.models.StatusFile.StatusFileSection import StatusFileSection
+from my_module.models.StatusFile.StatusFileSectionCollection import StatusFileSectionCollection
+from my_module.parsers.StatusFileParserInterface import StatusFileParserInterface
+from typing import Optional
+
+
+class StatusFileCache():
+    # Bumped whenever the snapshot layout changes so older snapshots are rebuilt instead of misread
+    CACHE_VERSION = "6"
+    CACHE_FILE_NAME = "status.sqlite3"
+    # The snapshot status file diffs compare with, kept apart from the cache so listing packages never replaces it
+    BASELINE_FILE_NAME = "status-baseline.sqlite3"
+    HASH_BLOCK_SIZE = 1024 * 1024
+    # The coarsest modified time resolution of a supported filesystem, FAT's two seconds, a status file
+    # modified this close to its snapshot could have been changed again without its modified time changing
+    TIMESTAMP_GRANULARITY_NS = 2_000_000_000
+
+    def __init__(self, cache_directory: str, status_file_parser: StatusFileParserInterface, logger: logging):
+        self.__cache_directory = cache_directory
+        self.__status_file_parser = status_file_parser
+        self.__logger = logger
+
+    @staticmethod
+    def get_default_cache_directory() -> str:
+        """Gets the default cache directory following the XDG base directory specification
+
+        Returns:
+            str: The directory the snapshots are stored in
+        """
+        cache_home = os.environ.get( "XDG_CACHE_HOME" ) or os.path.join( os.path.expanduser( "~" ), ".cache" )
+
+        return os.path.join( cache_home, "swe-code-challenge" )
+
+    def load(self, status_file: str) -> StatusFileSectionCollection:
+        """Loads the parsed status file from the snapshot if the status file has not changed since
+        it was taken, otherwise the status file is parsed and a new snapshot is taken
+
+        Args:
+            status_file (str): The path to the status file
+
+        Returns:
+            StatusFileSectionCollection: A collection of objects storing the data for packages installed
+        """
+        file_identity = self.__get_file_identity( status_file )
+
+        try:
+            status_file_section_collection = self.__read_snapshot( self.get_cache_file(), status_file, file_identity, keep_raw=StatusFileSectionCollection.needs_raw( self.get_status_file_parser().get_fields() ) )
+
+            if status_file_section_collection is not None:
+                return status_file_section_collection
+        except sqlite3.Error as e:
+            self.get_logger().warning( f"Status file cache could not be read, rebuilding it:\n{e}" )
+
+        # Taken before the status file is read so a change made while it is parsed is within the racy window
+        snapshot_time = time.time_ns()
+        content_hash = self.__hash_file( status_file )
+
+        with open( status_file, "r" ) as status_file_contents:
+            status_file_section_collection = StatusFileSectionCollection.from_fields( self.get_status_file_parser().get_fields() )
+
+            for status_file_section in self.get_status_file_parser().iter_parse( status_file_contents ):
+                status_file_section_collection.append( status_file_section )
+
+        # Only takes a snapshot if dpkg did not change the file while it was being parsed
+        if self.__get_file_identity( status_file ) == file_identity and self.__hash_file( status_file ) == content_hash:
+            try:
+                self.__write_snapshot( self.get_cache_file(), file_identity, content_hash, snapshot_time, status_file_section_collection )
+            except ( sqlite3.Error, OSError ) as e:
+                self.get_logger().warning( f"Status file cache could not be written:\n{e}" )
+
+        return status_file_section_collection
+
+    def diff(self, status_file: str) -> Optional[tuple[list[StatusFileSection], list[StatusFileSection]]]:
+        """Compares the status file with the baseline, whatever version of the status file it was taken from, and
+        replaces the baseline with the status file.  Each section is matched with the baseline by its fingerprint
+        so only the sections that are not in the baseline are parsed, the rest are reused for the new baseline.
+
+        The baseline is a snapshot of its own, load never reads or replaces it, so only diffs move it forward.
+
+        Args:
+            status_file (str): The path to the status file
+
+        Returns:
+            Optional[tuple[list[StatusFileSection], list[StatusFileSection]]]: The sections of the baseline that are no
+            longer in the status file and the sections of the status file that are not in the baseline, None if there
+            was no baseline taken by the same parser with the same fields to compare with, one is taken instead
+        """
+        file_identity = self.__get_file_identity( status_file )
+        snapshot_time = time.time_ns()
+        content_hash = self.__hash_file( status_file )
+
+        try:
+            baseline = self.__read_snapshot( self.get_baseline_file(), status_file, file_identity, fresh_only=False )
+        except sqlite3.Error as e:
+            self.get_logger().warning( f"Status file baseline could not be read, taking a new one:\n{e}" )
+            baseline = None
+
+        status_file_parser = self.get_status_file_parser()
+        # The baseline keeps each section as the parser tokenized it so its fingerprint matches an unchanged section
+        old_sections = {} if baseline is None else { status_file_parser.fingerprint( section.raw ): section for section in baseline.get_status_file_section_collection() }
+        new_sections = []
+        status_file_section_collection = StatusFileSectionCollection()
+
+        with open( status_file, "r" ) as status_file_contents:
+            for fingerprint, section_contents in status_file_parser.iter_fingerprints( status_file_contents ):
+                status_file_section = old_sections.pop( fingerprint, None )
+
+                if status_file_section is None:
+                    # Only the sections that changed are parsed
+                    status_file_section = next( status_file_parser.iter_parse_tokens( ( section_contents, ) ), None )
+
+                    if status_file_section is None:
+                        continue
+
+                    new_sections.append( status_file_section )
+
+                status_file_section_collection.append( status_file_section )
+
+        # Only takes a baseline if dpkg did not change the file while it was being compared
+        if self.__get_file_identity( status_file ) == file_identity and self.__hash_file( status_file ) == content_hash:
+            try:
+                self.__write_snapshot( self.get_baseline_file(), file_identity, content_hash, snapshot_time, status_file_section_collection )
+            except ( sqlite3.Error, OSError ) as e:
+                self.get_logger().warning( f"Status file baseline could not be written:\n{e}" )
+
+        if baseline is None:
+            return None
+
+        return list( old_sections.values() ), new_sections
+
+    def get_cache_file(self) -> str:
+        """Gets the path of the snapshot
+
+        Returns:
+            str: The path of the snapshot within the cache directory
+        """
+        return os.path.join( self.__cache_directory, self.CACHE_FILE_NAME )
+
+    def get_baseline_file(self) -> str:
+        """Gets the path of the baseline diffs compare the status file with
+
+        Returns:
+            str: The path of the baseline within the cache directory
+        """
+        return os.path.join( self.__cache_directory, self.BASELINE_FILE_NAME )
+
+    def __read_snapshot(self, cache_file: str, status_file: str, file_identity: dict, fresh_only: bool = True, keep_raw: bool = True) -> Optional[StatusFileSectionCollection]:
+        """Reads the snapshot if it was taken from the same version of the status file, the snapshot is
+        read a column at a time rather than rebuilding a StatusFileSection per package
+
+        Args:
+            cache_file (str): The path of the snapshot, the cache or the baseline
+            status_file (str): The path to the status file
+            file_identity (dict): The inode, size and modified time of the status file
+            fresh_only (bool): Whether a snapshot of an older version of the status file is ignored
+            keep_raw (bool): Whether the raw sections are read, the baseline always needs them for their fingerprints
+
+        Returns:
+            Optional[StatusFileSectionCollection]: The collection stored in the snapshot or None if
+            there is no snapshot, it was taken by another parser or it is out of date
+        """
+        if not os.path.exists( cache_file ):
+            return None
+
+        connection = sqlite3.connect( f"file:{cache_file}?mode=ro", uri=True )
+
+        try:
+            metadata = dict( connection.execute( "SELECT key, value FROM metadata" ).fetchall() )
+
+            if metadata.get( "version" ) != self.CACHE_VERSION or metadata.get( "parser" ) != self.__get_parser_name():
+                return None
+
+            # A snapshot taken with more fields than are needed can still be used
+            if not self.__has_fields( metadata.get( "fields" ) ):
+                return None
+
+            if fresh_only:
+                for key, value in file_identity.items():
+                    if metadata.get( key ) != str( value ):
+                        return None
+
+                # A matching inode, size and modified time is trusted, the status file is only hashed when it was
+                # modified so close to the snapshot that a later change may not have moved its modified time
+                if self.__is_racy( file_identity, metadata.get( "snapshot_time" ) ) and metadata.get( "content_hash" ) != self.__hash_file( status_file ):
+                    return None
+
+            # The raw sections hold most of the snapshot's text so they are left in the snapshot when they are not needed
+            raw_column = "raw" if keep_raw else "''"
+            rows = connection.execute( f"SELECT package, section, version, installed_size, status, {raw_column} FROM sections ORDER BY position" ).fetchall()
+            status_file_section_collection = StatusFileSectionCollection( keep_raw )
+
+            if rows:
+                # The raw section is stored rather than the description so it is only decoded when it is accessed
+                packages, sections, versions, installed_sizes, statuses, raws = zip( *rows )
+                status_file_section_collection.extend_columns( packages, sections, versions, installed_sizes, raws, statuses )
+
+            return status_file_section_collection
+        finally:
+            connection.close()
+
+    def __write_snapshot(self, cache_file: str, file_identity: dict, content_hash: str, snapshot_time: int, status_file_section_collection: StatusFileSectionCollection):
+        """Writes the snapshot to a temporary file and moves it into place so concurrent
+        runs never read a partially written snapshot
+
+        Args:
+            cache_file (str): The path of the snapshot, the cache or the baseline
+            file_identity (dict): The inode, size and modified time of the status file
+            content_hash (str): The hash of the status file's contents
+            snapshot_time (int): When the status file was read in nanoseconds since the epoch
+            status_file_section_collection (StatusFileSectionCollection): The parsed status file
+        """
+        os.makedirs( self.__cache_directory, exist_ok=True )
+        file_descriptor, temporary_file = tempfile.mkstemp( dir=self.__cache_directory, suffix=".tmp" )
+        os.close( file_descriptor )
+
+        try:
+            connection = sqlite3.connect( temporary_file )
+
+            try:
+                connection.execute( "CREATE TABLE metadata (key TEXT PRIMARY KEY, value TEXT)" )
+                connection.execute( "CREATE TABLE sections (position INTEGER PRIMARY KEY, package TEXT, section TEXT, version TEXT, installed_size INTEGER, status TEXT, raw TEXT)" )
+
+                metadata = { "version": self.CACHE_VERSION, "parser": self.__get_parser_name(), "fields": self.__get_fields_value(), "content_hash": content_hash, "snapshot_time": str( snapshot_time ) }
+                metadata.update( { key: str( value ) for key, value in file_identity.items() } )
+                connection.executemany( "INSERT INTO metadata VALUES (?, ?)", metadata.items() )
+
+                connection.executemany(
+                    "INSERT INTO sections VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        ( position, section.package, section.section, section.version, section.installed_size_kib, section.status, section.raw )
+                        for position, section in enumerate( status_file_section_collection.get_status_file_section_collection() )
+                    )
+                )
+                connection.commit()
+            finally:
+                connection.close()
+
+            os.replace( temporary_file, cache_file )
+        except BaseException:
+            os.unlink( temporary_file )
+            raise
+
+    def __get_fields_value(self) -> str:
+        """Gets the fields the parser reads as they are stored in the snapshot's metadata
+
+        Returns:
+            str: The fields separated by commas or * when the parser reads every field
+        """
+        fields = self.get_status_file_parser().get_fields()
+
+        return "*" if fields is None else ",".join( fields )
+
+    def __has_fields(self, stored_fields: Optional[str]) -> bool:
+        """Checks whether the snapshot was taken with every field the parser reads
+
+        Args:
+            stored_fields (Optional[str]): The fields stored in the snapshot's metadata
+
+        Returns:
+            bool: True if the snapshot has every field the parser would read
+        """
+        if stored_fields is None:
+            return False
+
+        if stored_fields == "*":
+            return True
+
+        fields = self.get_status_file_parser().get_fields()
+
+        return fields is not None and set( fields ) <= set( stored_fields.split( "," ) )
+
+    def __get_parser_name(self) -> str:
+        """Gets the name of the parser's class since parsers may keep different data in the snapshot
+
+        Returns:
+            str: The qualified name of the status file parser's class
+        """
+        parser_class = type( self.get_status_file_parser() )
+
+        return f"{parser_class.__module__}.{parser_class.__qualname__}"
+
+    def __is_racy(self, file_identity: dict, snapshot_time: Optional[str]) -> bool:
+        """Checks whether the status file was modified within the filesystem's timestamp granularity
+        of the snapshot, when its modified time alone cannot tell whether it changed again
+
+        Args:
+            file_identity (dict): The inode, size and modified time of the status file
+            snapshot_time (Optional[str]): When the status file was read for the snapshot as stored in its metadata
+
+        Returns:
+            bool: True if the status file's contents have to be hashed to trust the snapshot
+        """
+        if snapshot_time is None or not snapshot_time.isdigit():
+            return True
+
+        return file_identity["mtime"] + self.TIMESTAMP_GRANULARITY_NS >= int( snapshot_time )
+
+    def __get_file_identity(self, status_file: str) -> dict:
+        """Gets the values identifying the current version of the status file without reading it
+
+        Args:
+            status_file (str): The path to the status file
+
+        Returns:
+            dict: The inode, size and modified time of the status file
+        """
+        file_stat = os.stat( status_file )
+
+        return { "inode": file_stat.st_ino, "size": file_stat.st_size, "mtime": file_stat.st_mtime_ns }
+
+    def __hash_file(self, status_file: str) -> str:
+        """Hashes the status file's contents a block at a time
+
+        Args:
+            status_file (str): The path to the status file
+
+        Returns:
+            str: The hex digest of the status file's contents
+        """
+        file_hash = hashlib.blake2b( digest_size=20 )
+
+        with open( status_file, "rb" ) as status_file_contents:
+            while block := status_file_contents.read( self.HASH_BLOCK_SIZE ):
+                file_hash.update( block )
+
+        return file_hash.hexdigest()
+
+    def get_status_file_parser(self) -> StatusFileParserInterface:
+        """Gets the status file parser used to rebuild the snapshot
+
+        Returns:
+            StatusFileParserInterface: A parser created for the status file
+        """
+        return self.__status_file_parser
+
+    def get_logger(self) -> logging:
+        """Gets the logger
+
+        Returns:
+            logging: Used to log
+        """
+        return self.__logger
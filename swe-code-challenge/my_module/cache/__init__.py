@@ -0,0 +1,4 @@
+from .StatusFileCache import StatusFileCache
+from .HistoryFileCache import HistoryFileCache
+
+__all__ = ["StatusFileCache", "HistoryFileCache"]
@@ -0,0 +1,184 @@
+import os
+import select
+import struct
+import ctypes
+import ctypes.util
+import logging
+import time
+from typing import Optional
+
+
+class FileWatcher():
+    """Watches files for changes using inotify, falling back to polling their mtime and size
+    when inotify is not available (Ex: not Linux or the watch limit was reached).
+
+    The directories containing the files are watched rather than the files themselves so a file
+    that is replaced (dpkg renames a new status file over the old one) or rotated (logrotate moves
+    history.log aside and creates a new one) is still seen.
+    """
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT_HEADER = struct.Struct( "iIII" )
+
+    def __init__(self, paths: list[str], logger: logging, poll_interval: float = 2.0, use_inotify: bool = True):
+        self.__paths = [os.path.abspath( path ) for path in paths]
+        self.__logger = logger
+        self.__poll_interval = poll_interval
+        self.__inotify_fd: Optional[int] = None
+        self.__watched_names: dict[int, set[str]] = {}
+        self.__signatures = self.__get_signatures()
+
+        if use_inotify:
+            self.__start_inotify()
+
+    def __start_inotify(self):
+        """Creates the inotify instance and watches the directory of each file, leaving the watcher polling if this fails"""
+        try:
+            libc = ctypes.CDLL( ctypes.util.find_library( "c" ), use_errno=True )
+            inotify_fd = libc.inotify_init1( os.O_NONBLOCK | os.O_CLOEXEC )
+        except ( OSError, AttributeError ) as e:
+            self.get_logger().info( f"inotify is not available, polling for changes instead: {e}" )
+            return
+
+        if inotify_fd < 0:
+            self.get_logger().info( f"inotify is not available, polling for changes instead: {os.strerror( ctypes.get_errno() )}" )
+            return
+
+        directories: dict[str, set[str]] = {}
+
+        for path in self.__paths:
+            directories.setdefault( os.path.dirname( path ), set() ).add( os.path.basename( path ) )
+
+        for directory, names in directories.items():
+            watch_descriptor = libc.inotify_add_watch( inotify_fd, os.fsencode( directory ), self.WATCH_MASK )
+
+            if watch_descriptor < 0:
+                self.get_logger().info( f"Could not watch {directory}, polling for changes instead: {os.strerror( ctypes.get_errno() )}" )
+                os.close( inotify_fd )
+                self.__watched_names = {}
+                return
+
+            self.__watched_names[watch_descriptor] = names
+
+        self.__inotify_fd = inotify_fd
+
+    def is_using_inotify(self) -> bool:
+        """Checks whether changes are being received from inotify rather than polled
+
+        Returns:
+            bool: True if inotify is being used
+        """
+        return self.__inotify_fd is not None
+
+    def wait_for_change(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until one of the files changes or the timeout passes
+
+        Args:
+            timeout (Optional[float]): The most seconds to wait, waits until a change if None
+
+        Returns:
+            bool: True if a file changed
+        """
+        if self.is_using_inotify():
+            return self.__wait_for_inotify( timeout )
+
+        return self.__wait_for_poll( timeout )
+
+    def __wait_for_inotify(self, timeout: Optional[float]) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            remaining = None if deadline is None else max( 0.0, deadline - time.monotonic() )
+            readable, _, _ = select.select( [self.__inotify_fd], [], [], remaining )
+
+            if not readable:
+                return False
+
+            if self.__read_events():
+                # Keeps the polling signatures current so a later fallback does not report the same change again
+                self.__signatures = self.__get_signatures()
+                return True
+
+    def __read_events(self) -> bool:
+        """Reads the pending inotify events
+
+        Returns:
+            bool: True if any event was for one of the watched files rather than another file in the same directory
+        """
+        try:
+            events = os.read( self.__inotify_fd, 64 * 1024 )
+        except BlockingIOError:
+            return False
+
+        changed = False
+        offset = 0
+
+        while offset < len( events ):
+            watch_descriptor, _, _, name_length = self.EVENT_HEADER.unpack_from( events, offset )
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode( events[offset:offset + name_length].rstrip( b"\0" ) )
+            offset += name_length
+
+            if name in self.__watched_names.get( watch_descriptor, () ):
+                changed = True
+
+        return changed
+
+    def __wait_for_poll(self, timeout: Optional[float]) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            signatures = self.__get_signatures()
+
+            if signatures != self.__signatures:
+                self.__signatures = signatures
+                return True
+
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+            sleep = self.__poll_interval if deadline is None else min( self.__poll_interval, max( 0.0, deadline - time.monotonic() ) )
+            time.sleep( sleep )
+
+    def __get_signatures(self) -> list[Optional[tuple]]:
+        """Gets what identifies the current version of each file
+
+        Returns:
+            list[Optional[tuple]]: The inode, size and mtime of each file or None if it does not exist
+        """
+        signatures = []
+
+        for path in self.__paths:
+            try:
+                stat = os.stat( path )
+                signatures.append( ( stat.st_ino, stat.st_size, stat.st_mtime_ns ) )
+            except FileNotFoundError:
+                signatures.append( None )
+
+        return signatures
+
+    def close(self):
+        """Closes the inotify instance"""
+        if self.__inotify_fd is not None:
+            os.close( self.__inotify_fd )
+            self.__inotify_fd = None
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def get_logger(self) -> logging:
+        """Gets the logger
+
+        Returns:
+            logging: The logger
+        """
+        return self.__logger
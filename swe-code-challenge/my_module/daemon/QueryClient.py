@@ -0,0 +1,46 @@
+import json
+import socket
+
+
+class QueryClient():
+    """Sends queries to a running QueryDaemon over its Unix socket"""
+
+    def __init__(self, socket_path: str, timeout: float = 30.0):
+        self.__socket_path = socket_path
+        self.__timeout = timeout
+
+    def query(self, request: dict) -> dict:
+        """Sends a single query and waits for its response
+
+        Args:
+            request (dict): The query (Ex: {"query": "packages", "user": "root"})
+
+        Raises:
+            ConnectionError: If no daemon is listening on the socket or it closed the connection without responding
+
+        Returns:
+            dict: The daemon's response
+        """
+        try:
+            with socket.socket( socket.AF_UNIX, socket.SOCK_STREAM ) as connection:
+                connection.settimeout( self.__timeout )
+                connection.connect( self.__socket_path )
+                connection.sendall( json.dumps( request ).encode( "utf-8" ) + b"\n" )
+
+                with connection.makefile( "rb" ) as responses:
+                    response = responses.readline()
+        except ( FileNotFoundError, ConnectionRefusedError ) as e:
+            raise ConnectionError( f"No daemon is listening on {self.__socket_path}" ) from e
+
+        if not response:
+            raise ConnectionError( f"The daemon on {self.__socket_path} closed the connection without responding" )
+
+        return json.loads( response )
+
+    def get_socket_path(self) -> str:
+        """Gets the path of the daemon's socket
+
+        Returns:
+            str: The path of the Unix socket
+        """
+        return self.__socket_path
@@ -0,0 +1,284 @@
+import os
+import json
+import time
+import logging
+import threading
+import socketserver
+from datetime import datetime
+from my_module.daemon.FileWatcher import FileWatcher
+from my_module.daemon.QueryClient import QueryClient
+from my_module.models.StatusFile.StatusFileSectionCollection import StatusFileSectionCollection
+from my_module.models.HistoryFile.HistoryFileSectionCollection import HistoryFileSectionCollection
+from my_module.profiling.ParseDiagnostics import ParseDiagnostics
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from my_module.SWECodeChallenge import SWECodeChallenge
+
+
+class _QueryRequestHandler(socketserver.StreamRequestHandler):
+    """Answers each line of JSON received on a connection with a line of JSON"""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+
+            try:
+                response = self.server.query_daemon.handle_query( json.loads( line ) )
+            except ( ValueError, TypeError ) as e:
+                response = { "ok": False, "error": str( e ) }
+
+            self.wfile.write( json.dumps( response ).encode( "utf-8" ) + b"\n" )
+            self.wfile.flush()
+
+
+class _QueryServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, query_daemon: "QueryDaemon"):
+        self.query_daemon = query_daemon
+        super().__init__( socket_path, _QueryRequestHandler )
+
+
+class QueryDaemon():
+    """Keeps the parsed status file and history logs in memory and answers queries about them over a Unix socket.
+
+    The files are watched and parsed again only when they change.  A reload builds new collections
+    before swapping them in so queries are always answered from a complete snapshot and never wait on a reload.
+    """
+    # Seconds without another change before a reload, so a file being written in several steps is only parsed once
+    SETTLE_SECONDS = 0.5
+    SOCKET_FILE_NAME = "swe-code-challenge.sock"
+
+    def __init__(self, application: "SWECodeChallenge", socket_path: str, logger: logging, poll_interval: float = 2.0, diagnostics: Optional[ParseDiagnostics] = None):
+        self.__application = application
+        self.__socket_path = socket_path
+        self.__logger = logger
+        self.__poll_interval = poll_interval
+        # The diagnostics shared by the application's parsers, summarized after each reload
+        self.__diagnostics = diagnostics
+        self.__status_file_section_collection: Optional[StatusFileSectionCollection] = None
+        self.__history_file_section_collection: Optional[HistoryFileSectionCollection] = None
+        self.__snapshot_lock = threading.Lock()
+        self.__loaded_at: Optional[datetime] = None
+        self.__reloads = 0
+        self.__stopping = threading.Event()
+
+    @staticmethod
+    def get_default_socket_path(cache_directory: str) -> str:
+        """Gets the default socket path, the user's runtime directory when there is one otherwise the cache directory
+
+        Args:
+            cache_directory (str): The directory the parsed files are cached in
+
+        Returns:
+            str: The path of the Unix socket
+        """
+        return os.path.join( os.environ.get( "XDG_RUNTIME_DIR" ) or cache_directory, QueryDaemon.SOCKET_FILE_NAME )
+
+    def reload(self) -> bool:
+        """Parses the status file and history logs and swaps them in for the collections being queried.
+        If either file cannot be read (Ex: in the middle of being rotated) or parsing or caching them fails
+        the error is logged and the current collections are kept, so the daemon keeps answering and reloads
+        again on the next change.
+
+        Returns:
+            bool: True if the collections were replaced
+        """
+        started = time.perf_counter()
+
+        try:
+            self.get_application().check_files_exist()
+            status_file_section_collection = self.get_application().load_status_file_section_collection()
+            history_file_section_collection = self.get_application().load_history_file_section_collection()
+        except OSError as e:
+            self.get_logger().warning( f"Reload failed, still answering from the previous snapshot:\n{e}" )
+            return False
+        except Exception:
+            # Any other error comes from a parser or a cache, it is logged with its traceback rather than ending the watcher
+            self.get_logger().exception( "Reload failed parsing the files, still answering from the previous snapshot" )
+            return False
+
+        with self.__snapshot_lock:
+            self.__status_file_section_collection = status_file_section_collection
+            self.__history_file_section_collection = history_file_section_collection
+            self.__loaded_at = datetime.now()
+            self.__reloads += 1
+
+        self.get_logger().info( f"Loaded {len( status_file_section_collection )} packages in {time.perf_counter() - started:.3f}s" )
+
+        if self.__diagnostics:
+            self.__diagnostics.log_summary( self.get_logger() )
+            self.__diagnostics.clear()
+
+        return True
+
+    def get_snapshot(self) -> tuple[StatusFileSectionCollection, HistoryFileSectionCollection]:
+        """Gets the collections being queried, both from the same reload
+
+        Returns:
+            tuple[StatusFileSectionCollection, HistoryFileSectionCollection]: The parsed status file and history logs
+        """
+        with self.__snapshot_lock:
+            return self.__status_file_section_collection, self.__history_file_section_collection
+
+    def handle_query(self, request: dict) -> dict:
+        """Answers a query from the collections in memory
+
+        Args:
+            request (dict): The query, one of
+                {"query": "packages", "since": "YYYY-MM-DD[ HH:MM:SS]", "until": ..., "user": ..., "format": "text" or "records"},
+                {"query": "users"} or {"query": "status"}
+
+        Raises:
+            ValueError: If the query is not known or its arguments are not valid
+            TypeError: If the request is not a JSON object
+
+        Returns:
+            dict: The response, "ok" is False along with an "error" if the query could not be answered
+        """
+        if not isinstance( request, dict ):
+            raise TypeError( "The request must be a JSON object" )
+
+        query = request.get( "query", "packages" )
+        status_file_section_collection, history_file_section_collection = self.get_snapshot()
+
+        if query == "status":
+            return {
+                "ok": True,
+                "loaded": status_file_section_collection is not None,
+                "loaded_at": self.__loaded_at.isoformat() if self.__loaded_at else None,
+                "reloads": self.__reloads,
+                "packages": len( status_file_section_collection ) if status_file_section_collection is not None else 0,
+                "transactions": len( history_file_section_collection.get_history_file_section_collection() ) if history_file_section_collection is not None else 0,
+            }
+
+        if status_file_section_collection is None:
+            return { "ok": False, "error": "The status file and history logs have not been loaded" }
+
+        if query == "packages":
+            packages = self.get_application().query_user_installed_packages(
+                status_file_section_collection.get_status_file_section_collection(),
+                history_file_section_collection,
+                self.__parse_date( request.get( "since" ) ),
+                self.__parse_date( request.get( "until" ), end_of_day=True ),
+                request.get( "user" )
+            )
+
+            if request.get( "format", "text" ) == "records":
+                return { "ok": True, "packages": [package.to_dict() for package in packages] }
+
+            return { "ok": True, "packages": [package.to_text() for package in packages] }
+
+        if query == "users":
+            return { "ok": True, "users": history_file_section_collection.get_users() }
+
+        raise ValueError( f"Unknown query '{query}'" )
+
+    def __parse_date(self, value: Optional[str], end_of_day: bool = False) -> Optional[datetime]:
+        """Converts a date given in a query to a datetime
+
+        Args:
+            value (Optional[str]): The date in ISO format
+            end_of_day (bool): Whether a date without a time is the last moment of the day rather than midnight (Ex: until)
+
+        Raises:
+            ValueError: If the value is not a valid date
+
+        Returns:
+            Optional[datetime]: The date or None if none was given
+        """
+        if value is None:
+            return None
+
+        parsed = datetime.fromisoformat( value )
+
+        # A date alone (YYYY-MM-DD or YYYYMMDD) has no time part
+        if end_of_day and len( value.strip() ) <= 10:
+            return datetime.combine( parsed.date(), datetime.max.time(), parsed.tzinfo )
+
+        return parsed
+
+    def serve_forever(self):
+        """Loads the files, then answers queries on the socket while reloading the files whenever they change until stop is called"""
+        self.reload()
+        server = self.__bind()
+        server_thread = threading.Thread( target=server.serve_forever, name="query-server", daemon=True )
+        server_thread.start()
+        self.get_logger().info( f"Answering queries on {self.__socket_path}" )
+
+        try:
+            with FileWatcher( [self.get_application().get_status_file(), self.get_application().get_history_log()], self.get_logger(), self.__poll_interval ) as watcher:
+                while not self.__stopping.is_set():
+                    if not watcher.wait_for_change( 1.0 ):
+                        continue
+
+                    # Waits for the writer to finish before parsing
+                    while watcher.wait_for_change( self.SETTLE_SECONDS ):
+                        pass
+
+                    self.reload()
+        finally:
+            server.shutdown()
+            server.server_close()
+            self.__unlink_socket()
+
+    def stop(self):
+        """Stops serving, safe to call from a signal handler or another thread"""
+        self.__stopping.set()
+
+    def __bind(self) -> _QueryServer:
+        """Binds the socket, removing a socket left behind by a daemon that did not shut down cleanly
+
+        Raises:
+            RuntimeError: If another daemon is already listening on the socket
+
+        Returns:
+            _QueryServer: The server listening on the socket
+        """
+        if os.path.exists( self.__socket_path ):
+            try:
+                QueryClient( self.__socket_path, timeout=1.0 ).query( { "query": "status" } )
+            except ( ConnectionError, OSError, ValueError ):
+                self.__unlink_socket()
+            else:
+                raise RuntimeError( f"A daemon is already listening on {self.__socket_path}" )
+
+        os.makedirs( os.path.dirname( os.path.abspath( self.__socket_path ) ), exist_ok=True )
+        server = _QueryServer( self.__socket_path, self )
+
+        # Only the user running the daemon can query it
+        os.chmod( self.__socket_path, 0o600 )
+
+        return server
+
+    def __unlink_socket(self):
+        try:
+            os.unlink( self.__socket_path )
+        except FileNotFoundError:
+            pass
+
+    def get_application(self) -> "SWECodeChallenge":
+        """Gets the application the files are loaded and queried through
+
+        Returns:
+            SWECodeChallenge: The application
+        """
+        return self.__application
+
+    def get_socket_path(self) -> str:
+        """Gets the path of the socket queries are answered on
+
+        Returns:
+            str: The path of the Unix socket
+        """
+        return self.__socket_path
+
+    def get_logger(self) -> logging:
+        """Gets the logger
+
+        Returns:
+            logging: The logger
+        """
+        return self.__logger
@@ -0,0 +1,5 @@
+from .FileWatcher import FileWatcher
+from .QueryClient import QueryClient
+from .QueryDaemon import QueryDaemon
+
+__all__ = ["FileWatcher", "QueryClient", "QueryDaemon"]
@@ -0,0 +1,167 @@
+import os
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+
+def _analyze_host(host: str, status_file: str, history_log: str, parser_name: str, since: Optional[datetime], until: Optional[datetime], user: Optional[str]) -> tuple:
+    """Lists the packages installed by a user on one host, run in a worker process.
+    Errors are returned rather than raised so one unreadable host does not stop the fleet.
+
+    Args:
+        host (str): The name of the host
+        status_file (str): The path of the host's status file
+        history_log (str): The path of the host's history log
+        parser_name (str): The parsers to use, text or mmap
+        since (Optional[datetime]): The earliest start date included, no lower bound if None
+        until (Optional[datetime]): The latest start date included, no upper bound if None
+        user (Optional[str]): The requested by user, every user if None
+
+    Returns:
+        tuple: The host, its results and the error message or None
+    """
+    # Imported here as SWECodeChallenge imports this module
+    from my_module.SWECodeChallenge import SWECodeChallenge, select_status_fields
+    from my_module.parsers.HistoryFileParser import HistoryFileParser
+    from my_module.parsers.StatusFileParser import StatusFileParser
+    from my_module.parsers.MmapHistoryFileParser import MmapHistoryFileParser
+    from my_module.parsers.MmapStatusFileParser import MmapStatusFileParser
+    from my_module.profiling.ParseDiagnostics import ParseDiagnostics
+
+    logger = logging.getLogger( __name__ )
+    diagnostics = ParseDiagnostics()
+    # Only the fields stored in the columns are read so no host keeps its raw sections
+    status_fields = select_status_fields( "commandline", leaves=False )
+
+    if parser_name == "mmap":
+        history_file_parser, status_file_parser = MmapHistoryFileParser( logger, diagnostics=diagnostics ), MmapStatusFileParser( logger, diagnostics=diagnostics, fields=status_fields )
+    else:
+        history_file_parser, status_file_parser = HistoryFileParser( logger, diagnostics=diagnostics ), StatusFileParser( logger, diagnostics=diagnostics, fields=status_fields )
+
+    try:
+        instance = SWECodeChallenge( history_file_parser, status_file_parser, status_file=status_file, history_log=history_log, logger=logger, diagnostics=diagnostics )
+        instance.check_files_exist()
+        history_file_section_collection = instance.load_history_file_section_collection()
+        status_file_section_collection = instance.load_status_file_section_collection()
+        packages = list( instance.query_user_installed_packages( status_file_section_collection.get_status_file_section_collection(), history_file_section_collection, since, until, user ) )
+    except Exception as e:
+        return host, [], f"{type( e ).__name__}: {e}"
+
+    # A single summary for the host rather than a line for each malformed record
+    diagnostics.log_summary( logger, host )
+
+    for package in packages:
+        package.host = host
+
+    return host, packages, None
+
+
+class FleetAnalyzer():
+    """Lists the packages installed by a user on every host of a fleet from snapshots of their files.
+
+    Each host is a subdirectory of the fleet's root holding either a copy of the host's root filesystem
+    (var/lib/dpkg/status and var/log/apt/history.log*) or the files side by side (status and history.log*).
+    Hosts are parsed in a process pool with a bounded number of hosts in flight so the memory used does not
+    grow with the size of the fleet, and each host's results are yielded as soon as it finishes.
+    """
+    # Hosts queued per worker so a worker never waits on the parent for its next host
+    HOSTS_IN_FLIGHT_PER_WORKER = 2
+
+    def __init__(self, logger: logging, workers: int = 0, parser_name: str = "text"):
+        self.__logger = logger
+        self.__workers = workers or os.cpu_count() or 1
+        self.__parser_name = parser_name
+
+    @staticmethod
+    def get_host_files(host_directory: str) -> tuple:
+        """Finds a host's status file and history log within its directory
+
+        Args:
+            host_directory (str): The directory of the host's snapshot
+
+        Returns:
+            tuple: The paths of the host's status file and history log
+        """
+        # Imported here as SWECodeChallenge imports this module
+        from my_module.SWECodeChallenge import SWECodeChallenge
+
+        # A copy of the host's root filesystem
+        status_file = os.path.join( host_directory, SWECodeChallenge.STATUS_FILE.lstrip( os.sep ) )
+
+        if os.path.exists( status_file ):
+            return status_file, os.path.join( host_directory, SWECodeChallenge.HISTORY_LOG.lstrip( os.sep ) )
+
+        # The files side by side
+        return os.path.join( host_directory, os.path.basename( SWECodeChallenge.STATUS_FILE ) ), os.path.join( host_directory, os.path.basename( SWECodeChallenge.HISTORY_LOG ) )
+
+    @staticmethod
+    def find_hosts(root: str) -> Iterator[str]:
+        """Finds the host directories within the fleet's root in name order
+
+        Args:
+            root (str): The directory with one subdirectory per host
+
+        Yields:
+            Iterator[str]: The name of each host
+        """
+        with os.scandir( root ) as entries:
+            hosts = sorted( entry.name for entry in entries if entry.is_dir() )
+
+        yield from hosts
+
+    def iter_results(self, root: str, hosts: Iterable[str], since: Optional[datetime] = None, until: Optional[datetime] = None, user: Optional[str] = None) -> Iterator[tuple]:
+        """Parses every host in the process pool and yields each host's results as it finishes
+
+        Args:
+            root (str): The directory with one subdirectory per host
+            hosts (Iterable[str]): The names of the hosts to parse, consumed as hosts finish
+            since (Optional[datetime]): The earliest start date included, no lower bound if None
+            until (Optional[datetime]): The latest start date included, no upper bound if None
+            user (Optional[str]): The requested by user, every user if None
+
+        Yields:
+            Iterator[tuple]: The host, its results and the error message or None, in the order hosts finish
+        """
+        hosts = iter( hosts )
+        in_flight: set[Future] = set()
+        maximum_in_flight = self.get_workers() * self.HOSTS_IN_FLIGHT_PER_WORKER
+
+        with ProcessPoolExecutor( max_workers=self.get_workers() ) as executor:
+            while True:
+                # Tops up the queue from the hosts not yet submitted
+                for host in hosts:
+                    status_file, history_log = self.get_host_files( os.path.join( root, host ) )
+                    in_flight.add( executor.submit( _analyze_host, host, status_file, history_log, self.__parser_name, since, until, user ) )
+
+                    if len( in_flight ) >= maximum_in_flight:
+                        break
+
+                if not in_flight:
+                    return
+
+                done, in_flight = wait( in_flight, return_when=FIRST_COMPLETED )
+
+                for future in done:
+                    host, packages, error = future.result()
+
+                    if error:
+                        self.get_logger().warning( f"Host {host} skipped:\n{error}" )
+
+                    yield host, packages, error
+
+    def get_workers(self) -> int:
+        """Gets the number of hosts parsed at the same time
+
+        Returns:
+            int: The number of worker processes
+        """
+        return self.__workers
+
+    def get_logger(self) -> logging:
+        """Gets the logger
+
+        Returns:
+            logging: The logger
+        """
+        return self.__logger
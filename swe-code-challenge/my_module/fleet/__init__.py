@@ -0,0 +1,3 @@
+from .FleetAnalyzer import FleetAnalyzer
+
+__all__ = ["FleetAnalyzer"]
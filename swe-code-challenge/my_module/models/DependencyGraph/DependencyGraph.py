@@ -0,0 +1,365 @@
+import re
+import sys
+from array import array
+from collections import deque
+from my_module.models.StatusFile.StatusFileSection import StatusFileSection
+from typing import Iterable, Optional
+
+
+class DependencyGraph():
+    """The dependencies between the installed packages of a status file.
+
+    Package names are interned to integer IDs and the edges are stored in compressed sparse row form:
+    the dependencies of package i are targets[offsets[i]:offsets[i + 1]].  The reverse edges are stored
+    the same way so reverse-dependency and reachability queries walk flat integer arrays.
+    """
+    DEPENDENCY_FIELDS = ( "Pre-Depends", "Depends", "Recommends" )
+    PROVIDES_FIELD = "Provides"
+    # Removes the version constraint, architecture restriction and build profile of a dependency
+    # (Ex: "libc6 (>= 2.34)", "python3:any", "foo [amd64]", "bar <!nocheck>")
+    DEPENDENCY_QUALIFIER_REGEX = re.compile( r"\s*(\(.*?\)|\[.*?\]|<.*?>)" )
+
+    def __init__(self, names: list[str], dependencies: list[list[int]]):
+        self.__names = names
+        self.__ids = { name: package_id for package_id, name in enumerate( names ) }
+        self.__offsets, self.__targets = self.__to_arrays( dependencies )
+
+        reverse_dependencies: list[list[int]] = [[] for _ in names]
+
+        for package_id, package_dependencies in enumerate( dependencies ):
+            for dependency_id in package_dependencies:
+                reverse_dependencies[dependency_id].append( package_id )
+
+        self.__reverse_offsets, self.__reverse_targets = self.__to_arrays( reverse_dependencies )
+
+    @staticmethod
+    def __to_arrays(adjacency: list[list[int]]) -> tuple[array, array]:
+        """Flattens the adjacency lists into an array of offsets and an array of targets
+
+        Args:
+            adjacency (list[list[int]]): The IDs each package has an edge to
+
+        Returns:
+            tuple[array, array]: The offsets, one more than there are packages, and the targets
+        """
+        offsets = array( "i", [0] )
+        targets = array( "i" )
+
+        for package_targets in adjacency:
+            targets.extend( package_targets )
+            offsets.append( len( targets ) )
+
+        return offsets, targets
+
+    @staticmethod
+    def from_status_file_sections(status_file_sections: Iterable[StatusFileSection], fields: tuple = DEPENDENCY_FIELDS) -> "DependencyGraph":
+        """Builds the graph from the installed packages of the status file.
+        Each dependency is an edge to the first of its alternatives that is installed, either by name or
+        through a package that provides it, the way apt satisfies it.
+
+        Args:
+            status_file_sections (Iterable[StatusFileSection]): The sections of the status file, their raw sections are read
+            fields (tuple): The dependency fields that make edges, Recommends can be left out to only follow hard dependencies
+
+        Returns:
+            DependencyGraph: The graph of the installed packages
+        """
+        names: list[str] = []
+        ids: dict[str, int] = {}
+        providers: dict[str, list[int]] = {}
+        package_dependency_values: list[list[str]] = []
+        wanted_fields = set( fields ) | { DependencyGraph.PROVIDES_FIELD }
+
+        for section in status_file_sections:
+            if not section.is_installed or section.package in ids:
+                continue
+
+            package_id = len( names )
+            names.append( section.package )
+            ids[section.package] = package_id
+            dependency_values = []
+
+            # A single pass over the raw section pulls every wanted field
+            for line in section.raw.split( "\n" ):
+                field, separator, value = line.partition( ":" )
+
+                if not separator or field not in wanted_fields:
+                    continue
+
+                if field == DependencyGraph.PROVIDES_FIELD:
+                    for provided in value.split( "," ):
+                        provided = DependencyGraph.parse_dependency_name( provided )
+
+                        if provided:
+                            providers.setdefault( provided, [] ).append( package_id )
+                else:
+                    dependency_values.append( value )
+
+            package_dependency_values.append( dependency_values )
+
+        dependencies: list[list[int]] = []
+
+        for package_id, dependency_values in enumerate( package_dependency_values ):
+            package_dependencies = set()
+
+            for value in dependency_values:
+                for dependency in value.split( "," ):
+                    dependency_id = DependencyGraph.__resolve_alternatives( dependency, ids, providers )
+
+                    if dependency_id is not None and dependency_id != package_id:
+                        package_dependencies.add( dependency_id )
+
+            dependencies.append( sorted( package_dependencies ) )
+
+        return DependencyGraph( names, dependencies )
+
+    @staticmethod
+    def __resolve_alternatives(dependency: str, ids: dict[str, int], providers: dict[str, list[int]]) -> Optional[int]:
+        """Finds the installed package satisfying a dependency (Ex: "mawk | gawk")
+
+        Args:
+            dependency (str): The dependency with its alternatives
+            ids (dict[str, int]): The ID of each installed package
+            providers (dict[str, list[int]]): The installed packages providing each virtual package
+
+        Returns:
+            Optional[int]: The ID of the first installed alternative or None if none is installed
+        """
+        for alternative in dependency.split( "|" ):
+            name = DependencyGraph.parse_dependency_name( alternative )
+
+            if name in ids:
+                return ids[name]
+
+            if name in providers:
+                return providers[name][0]
+
+        return None
+
+    @staticmethod
+    def parse_dependency_name(dependency: str) -> str:
+        """Pulls the package name out of a single dependency
+
+        Args:
+            dependency (str): The dependency (Ex: "libc6:any (>= 2.34)")
+
+        Returns:
+            str: The package name (Ex: libc6)
+        """
+        # Most dependencies have no qualifier so the regex is only run when one is found
+        if "(" in dependency or "[" in dependency or "<" in dependency:
+            dependency = DependencyGraph.DEPENDENCY_QUALIFIER_REGEX.sub( "", dependency )
+
+        return sys.intern( dependency.strip().split( ":", 1 )[0] )
+
+    def __len__(self) -> int:
+        return len( self.__names )
+
+    def get_id(self, package: str) -> Optional[int]:
+        """Gets the integer ID of an installed package
+
+        Args:
+            package (str): The package's name
+
+        Returns:
+            Optional[int]: The ID or None if the package is not installed
+        """
+        return self.__ids.get( package )
+
+    def get_name(self, package_id: int) -> str:
+        """Gets the name of the package with the ID
+
+        Args:
+            package_id (int): The package's ID
+
+        Returns:
+            str: The package's name
+        """
+        return self.__names[package_id]
+
+    def get_dependencies(self, package: str) -> list[str]:
+        """Pulls the installed packages the package depends on directly
+
+        Args:
+            package (str): The package's name
+
+        Returns:
+            list[str]: The names of the dependencies, empty if the package is not installed
+        """
+        package_id = self.get_id( package )
+
+        if package_id is None:
+            return []
+
+        return [self.__names[dependency_id] for dependency_id in self.__targets[self.__offsets[package_id]:self.__offsets[package_id + 1]]]
+
+    def get_reverse_dependencies(self, package: str) -> list[str]:
+        """Pulls the installed packages that depend on the package directly
+
+        Args:
+            package (str): The package's name
+
+        Returns:
+            list[str]: The names of the reverse dependencies, empty if the package is not installed
+        """
+        package_id = self.get_id( package )
+
+        if package_id is None:
+            return []
+
+        return [self.__names[dependent_id] for dependent_id in self.__reverse_targets[self.__reverse_offsets[package_id]:self.__reverse_offsets[package_id + 1]]]
+
+    def get_reachable(self, packages: Iterable[str], reverse: bool = False) -> set[str]:
+        """Pulls every installed package the packages depend on directly or indirectly
+
+        Args:
+            packages (Iterable[str]): The names of the packages to start from
+            reverse (bool): Whether to follow reverse dependencies instead, finding everything that depends on the packages
+
+        Returns:
+            set[str]: The names of the packages reached, not including the packages started from unless they are in a cycle
+        """
+        offsets, targets = ( self.__reverse_offsets, self.__reverse_targets ) if reverse else ( self.__offsets, self.__targets )
+        visited = bytearray( len( self.__names ) )
+        queue = deque()
+
+        for package in packages:
+            package_id = self.get_id( package )
+
+            if package_id is not None:
+                queue.extend( targets[offsets[package_id]:offsets[package_id + 1]] )
+
+        reached = []
+
+        while queue:
+            package_id = queue.popleft()
+
+            if visited[package_id]:
+                continue
+
+            visited[package_id] = 1
+            reached.append( package_id )
+            queue.extend( targets[offsets[package_id]:offsets[package_id + 1]] )
+
+        return { self.__names[package_id] for package_id in reached }
+
+    def get_leaves(self, packages: Iterable[str]) -> list[str]:
+        """Pulls the packages that are not a dependency, directly or indirectly, of any other of the packages.
+        These are the true roots of a set of manually installed packages, the rest would be installed anyway.
+
+        Packages that depend on each other (Ex: perl and perl-modules) are collapsed into their strongly connected
+        component first, a component reached from the component of another package is pulled in and the first
+        package given of every other component is its leaf.  Finding the components and the breadth first search
+        from every component at once each visit an installed package at most once.
+
+        Args:
+            packages (Iterable[str]): The names of the packages (Ex: the manually installed packages)
+
+        Returns:
+            list[str]: The leaves in the order they were given, packages that are not installed are always leaves
+        """
+        packages = list( packages )
+        root_ids = [self.get_id( package ) for package in packages]
+        components = self.__find_components( [root_id for root_id in root_ids if root_id is not None] )
+        # The first package given of each component, the only one of the component that can be a leaf
+        representatives: dict[int, int] = {}
+
+        for root_id in root_ids:
+            if root_id is not None:
+                representatives.setdefault( components[root_id], root_id )
+
+        # Starts from every edge leaving a component holding one of the packages, the components form a
+        # directed acyclic graph so a component is only reached from another component
+        queue = deque()
+
+        for package_id, component in enumerate( components ):
+            if component in representatives:
+                queue.extend( dependency_id for dependency_id in self.__targets[self.__offsets[package_id]:self.__offsets[package_id + 1]] if components[dependency_id] != component )
+
+        visited = bytearray( len( self.__names ) )
+        pulled_in = set()
+
+        while queue:
+            package_id = queue.popleft()
+
+            if visited[package_id]:
+                continue
+
+            visited[package_id] = 1
+            pulled_in.add( components[package_id] )
+            queue.extend( self.__targets[self.__offsets[package_id]:self.__offsets[package_id + 1]] )
+
+        return [
+            package for package, root_id in zip( packages, root_ids )
+            if root_id is None or ( components[root_id] not in pulled_in and representatives[components[root_id]] == root_id )
+        ]
+
+    def __find_components(self, start_ids: list[int]) -> array:
+        """Finds the strongly connected components of the packages reachable from the start packages with an
+        iterative Tarjan's algorithm over the dependency arrays, so deep dependency chains do not recurse
+
+        Args:
+            start_ids (list[int]): The IDs of the packages to start from
+
+        Returns:
+            array: The component of each package, -1 for packages that are not reachable from the start packages
+        """
+        offsets, targets = self.__offsets, self.__targets
+        unvisited = -1
+        order = array( "i", [unvisited] ) * len( self.__names )
+        low_link = array( "i", [0] ) * len( self.__names )
+        components = array( "i", [unvisited] ) * len( self.__names )
+        on_stack = bytearray( len( self.__names ) )
+        stack = []
+        visit_count = 0
+        component_count = 0
+
+        for start_id in start_ids:
+            if order[start_id] != unvisited:
+                continue
+
+            order[start_id] = low_link[start_id] = visit_count
+            visit_count += 1
+            stack.append( start_id )
+            on_stack[start_id] = 1
+            # Each frame is a package and the position of the next dependency to follow
+            frames = [[start_id, offsets[start_id]]]
+
+            while frames:
+                frame = frames[-1]
+                package_id, position = frame
+
+                if position < offsets[package_id + 1]:
+                    frame[1] = position + 1
+                    dependency_id = targets[position]
+
+                    if order[dependency_id] == unvisited:
+                        order[dependency_id] = low_link[dependency_id] = visit_count
+                        visit_count += 1
+                        stack.append( dependency_id )
+                        on_stack[dependency_id] = 1
+                        frames.append( [dependency_id, offsets[dependency_id]] )
+                    elif on_stack[dependency_id]:
+                        low_link[package_id] = min( low_link[package_id], order[dependency_id] )
+
+                    continue
+
+                frames.pop()
+
+                if frames:
+                    parent_id = frames[-1][0]
+                    low_link[parent_id] = min( low_link[parent_id], low_link[package_id] )
+
+                # The package is the first of its component that was visited, the rest are above it on the stack
+                if low_link[package_id] == order[package_id]:
+                    while True:
+                        member_id = stack.pop()
+                        on_stack[member_id] = 0
+                        components[member_id] = component_count
+
+                        if member_id == package_id:
+                            break
+
+                    component_count += 1
+
+        return components
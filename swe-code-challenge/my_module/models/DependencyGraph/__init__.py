@@ -0,0 +1,3 @@
+from .DependencyGraph import DependencyGraph
+
+__all__ = ["DependencyGraph"]
@@ -0,0 +1,65 @@
+import sys
+
+
+class ExtendedStatesCollection():
+    """The packages apt recorded in extended_states and whether each was installed automatically as a dependency.
+    Packages apt has no record of were installed manually.
+    """
+
+    def __init__(self):
+        # Maps each package to the architectures apt installed automatically
+        self.__auto_installed: dict[str, set[str]] = {}
+        
+        # Maps each package to the architectures apt recorded, automatically installed or not
+        self.__recorded: dict[str, set[str]] = {}
+        
+    def __len__(self) -> int:
+        return len( self.__recorded )
+        
+    def append(self, package: str, architecture: str, auto_installed: bool):
+        """Records a package's entry in extended_states
+
+        Args:
+            package (str): The package's name
+            architecture (str): The package's architecture (Ex: amd64), empty if not recorded
+            auto_installed (bool): Whether apt installed the package automatically as a dependency
+        """
+        architecture = sys.intern( architecture )
+        self.__recorded.setdefault( package, set() ).add( architecture )
+        
+        if auto_installed:
+            self.__auto_installed.setdefault( package, set() ).add( architecture )
+        else:
+            # A later entry for the same package and architecture replaces the earlier one
+            self.__auto_installed.get( package, set() ).discard( architecture )
+            
+    def is_auto_installed(self, package: str) -> bool:
+        """Checks whether apt installed the package automatically as a dependency.
+        The status file is read without architectures so a package is automatic if any of its architectures is.
+
+        Args:
+            package (str): The package's name
+
+        Returns:
+            bool: True if the package was installed automatically
+        """
+        return bool( self.__auto_installed.get( package ) )
+    
+    def is_manually_installed(self, package: str) -> bool:
+        """Checks whether the package was installed manually, apt does not record most manually installed packages
+
+        Args:
+            package (str): The package's name
+
+        Returns:
+            bool: True if the package was not installed automatically
+        """
+        return not self.is_auto_installed( package )
+    
+    def get_auto_installed_packages(self) -> list[str]:
+        """Pulls every package apt installed automatically
+
+        Returns:
+            list[str]: The packages in the order they were recorded
+        """
+        return [package for package, architectures in self.__auto_installed.items() if architectures]
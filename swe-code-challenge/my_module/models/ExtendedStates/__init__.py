@@ -0,0 +1,3 @@
+from .ExtendedStatesCollection import ExtendedStatesCollection
+
+__all__ = ["ExtendedStatesCollection"]
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Optional
+
+
+class HistoryEvent():
+    """A single change to a single package recorded in the history log (Ex: one package of an Install line)"""
+    INSTALL = "Install"
+    REINSTALL = "Reinstall"
+    UPGRADE = "Upgrade"
+    DOWNGRADE = "Downgrade"
+    REMOVE = "Remove"
+    PURGE = "Purge"
+    # A package named by an install command, recorded even when apt had nothing to install
+    # since naming an installed package marks it as manually installed
+    REQUESTED = "Requested"
+
+    ACTIONS = ( INSTALL, REINSTALL, UPGRADE, DOWNGRADE, REMOVE, PURGE )
+
+    # Slots drop the per instance dictionary since a history log holds an event for every package changed
+    __slots__ = ( "action", "package", "architecture", "version", "automatic", "date", "requested_by" )
+
+    def __init__(self, action: str, package: str, architecture: Optional[str] = None, version: Optional[str] = None, automatic: bool = False, date: Optional[datetime] = None, requested_by: str = "undetermined"):
+        self.action = action
+        self.package = package
+        self.architecture = architecture
+        self.version = version
+        self.automatic = automatic
+        self.date = date
+        self.requested_by = requested_by
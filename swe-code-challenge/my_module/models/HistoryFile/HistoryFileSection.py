@@ -1,8 +1,12 @@
+import sys
 from datetime import datetime
 from typing import Optional
 
 
 class HistoryFileSection():
+    # Slots drop the per instance dictionary since years of history can hold tens of thousands of sections
+    __slots__ = ( "_start_date", "_requested_by", "_end_date", "_packages", "_reinstall" )
+    
     def __init__(self):
         self._start_date = None
         self._requested_by = "undetermined"
@@ -58,6 +62,16 @@ class HistoryFileSection():
         
         self._end_date = value
     
+    @property
+    def is_complete(self) -> bool:
+        """Checks whether the section's End-Date was read.  Sections of commands that were interrupted
+        and the last section of a log apt is still writing have none.
+
+        Returns:
+            bool: True if the section has an end date
+        """
+        return self._end_date is not None
+    
     @property
     def packages(self) -> list:
         """Gets the list of packages 
@@ -103,5 +117,6 @@ class HistoryFileSection():
             value: The requested by user
         """
         if value:
-            self._requested_by = value
+            # Only a handful of users request installs so a single copy of each name is kept
+            self._requested_by = sys.intern( value )
             
\ No newline at end of file
@@ -1,3 +1,5 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime
 from my_module.models.HistoryFile.HistoryFileSection import HistoryFileSection
 from typing import Optional
 
@@ -6,13 +8,55 @@ class HistoryFileSectionCollection():
     def __init__(self):
         self.__history_file_section_collection: list[HistoryFileSection] = []
         
+        # Maps each package to the sections that installed it in the order they were appended
+        # This is maintained on append so lookups by package do not need to scan the collection
+        self.__package_index: dict[str, list[HistoryFileSection]] = {}
+        
+        # Maps each user to the sections they requested in the order they were appended
+        # Each section holds the packages it installed so "who installed what" does not need the status file
+        self.__user_index: dict[str, list[HistoryFileSection]] = {}
+        
+        # The sections with a start date kept sorted by start date, alongside a parallel list of the start dates
+        # so date range queries can bisect rather than scan every section
+        # History is appended in chronological order so keeping these sorted is normally an append to the end
+        self.__start_dates: list[datetime] = []
+        self.__sections_by_start_date: list[HistoryFileSection] = []
+        
     def append(self, history_file_section: HistoryFileSection):
-        """Appends a HistoryFileSection to the collection
+        """Appends a HistoryFileSection to the collection and indexes its packages
 
         Args:
             history_file_section (HistoryFileSection): An object containing data from the history file section
         """
         self.__history_file_section_collection.append( history_file_section )
+        self.__index_section( history_file_section )
+        
+        if history_file_section.start_date:
+            # Inserts after any sections with the same start date so their order is kept
+            position = bisect_right( self.__start_dates, history_file_section.start_date )
+            self.__start_dates.insert( position, history_file_section.start_date )
+            self.__sections_by_start_date.insert( position, history_file_section )
+        
+    def reindex(self):
+        """Rebuilds the package and user indexes from the collection.
+        This only needs to be called if a section's packages or requested by user were changed after it was appended.
+        """
+        self.__package_index = {}
+        self.__user_index = {}
+        
+        for section in self.__history_file_section_collection:
+            self.__index_section( section )
+            
+    def __index_section(self, history_file_section: HistoryFileSection):
+        """Adds the section to the package index under each of its packages and to the user index under its requested by user
+
+        Args:
+            history_file_section (HistoryFileSection): An object containing data from the history file section
+        """
+        for package in history_file_section.packages:
+            self.__package_index.setdefault( package, [] ).append( history_file_section )
+            
+        self.__user_index.setdefault( history_file_section.requested_by, [] ).append( history_file_section )
         
     def get_history_file_section_collection(self) -> list[HistoryFileSection]:
         """Returns the collection of history file sections
@@ -37,8 +81,19 @@ class HistoryFileSectionCollection():
                 
         return sections_packages
     
+    def has_package(self, package: str) -> bool:
+        """Checks the package index to see if any section installed the package
+
+        Args:
+            package (str): A string that defines a package
+
+        Returns:
+            bool: True if at least one section installed the package
+        """
+        return package in self.__package_index
+    
     def get_history_file_section_by_package(self, package: str) -> Optional[HistoryFileSection]:
-        """Pulls the history file section if the package exists within that section
+        """Pulls the first history file section the package exists within
 
         Args:
             package (str): A string that defines a package
@@ -46,8 +101,104 @@ class HistoryFileSectionCollection():
         Returns:
             Optional[HistoryFileSection]: Returns the matching package or None
         """
-        for section in self.__history_file_section_collection:
-            if package in section.packages:
-                return section
+        sections = self.__package_index.get( package )
+        
+        if sections:
+            return sections[0]
+            
+        return None
+    
+    def get_history_file_sections_by_package(self, package: str) -> list[HistoryFileSection]:
+        """Pulls every history file section the package exists within
+
+        Args:
+            package (str): A string that defines a package
+
+        Returns:
+            list[HistoryFileSection]: The matching sections in the order they were appended
+        """
+        return list( self.__package_index.get( package, [] ) )
+    
+    def get_history_file_sections_between(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> list[HistoryFileSection]:
+        """Pulls the history file sections that started within the range using binary search on the start dates
+
+        Args:
+            since (Optional[datetime]): The earliest start date included, no lower bound if None
+            until (Optional[datetime]): The latest start date included, no upper bound if None
+
+        Returns:
+            list[HistoryFileSection]: The matching sections ordered by start date
+        """
+        start = 0 if since is None else bisect_left( self.__start_dates, since )
+        end = len( self.__start_dates ) if until is None else bisect_right( self.__start_dates, until )
+        
+        return self.__sections_by_start_date[start:end]
+    
+    def get_history_file_section_collection_between(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> "HistoryFileSectionCollection":
+        """Creates a new collection of only the history file sections that started within the range
+
+        Args:
+            since (Optional[datetime]): The earliest start date included, no lower bound if None
+            until (Optional[datetime]): The latest start date included, no upper bound if None
+
+        Returns:
+            HistoryFileSectionCollection: A collection of the matching sections
+        """
+        history_file_section_collection = HistoryFileSectionCollection()
+        
+        for section in self.get_history_file_sections_between( since, until ):
+            history_file_section_collection.append( section )
+            
+        return history_file_section_collection
+    
+    def get_users(self) -> list[str]:
+        """Pulls every user that requested at least one section
+
+        Returns:
+            list[str]: The users in the order their first section was appended
+        """
+        return list( self.__user_index )
+    
+    def get_history_file_sections_by_user(self, user: str) -> list[HistoryFileSection]:
+        """Pulls every history file section the user requested
+
+        Args:
+            user (str): The requested by user
+
+        Returns:
+            list[HistoryFileSection]: The matching sections in the order they were appended
+        """
+        return list( self.__user_index.get( user, [] ) )
+    
+    def get_packages_by_user(self, user: str) -> dict[str, list[HistoryFileSection]]:
+        """Pulls every package the user installed along with the sections that installed it
+
+        Args:
+            user (str): The requested by user
+
+        Returns:
+            dict[str, list[HistoryFileSection]]: The packages in the order they were first installed mapped to the user's sections that installed them
+        """
+        packages: dict[str, list[HistoryFileSection]] = {}
+        
+        for section in self.__user_index.get( user, [] ):
+            for package in section.packages:
+                packages.setdefault( package, [] ).append( section )
+                
+        return packages
+    
+    def get_history_file_section_collection_by_user(self, user: str) -> "HistoryFileSectionCollection":
+        """Creates a new collection of only the history file sections the user requested
+
+        Args:
+            user (str): The requested by user
+
+        Returns:
+            HistoryFileSectionCollection: A collection of the matching sections
+        """
+        history_file_section_collection = HistoryFileSectionCollection()
+        
+        for section in self.__user_index.get( user, [] ):
+            history_file_section_collection.append( section )
             
-        return None
\ No newline at end of file
+        return history_file_section_collection
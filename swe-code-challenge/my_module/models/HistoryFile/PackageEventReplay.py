@@ -0,0 +1,103 @@
+from datetime import datetime
+from my_module.models.HistoryFile.HistoryEvent import HistoryEvent
+from typing import Iterable, Optional
+
+
+class PackageEventReplay():
+    """Replays the events of the history logs in order to work out which packages are installed
+    and which of them were explicitly installed rather than pulled in as a dependency.
+
+    Each event is applied with a constant number of dictionary operations so replaying the whole
+    history costs a single pass over its events.
+    """
+
+    def __init__(self):
+        # The event that last installed each package still installed
+        self.__installed: dict[str, HistoryEvent] = {}
+
+        # The event that explicitly installed each package still installed
+        self.__explicit: dict[str, HistoryEvent] = {}
+
+    def replay(self, events: Iterable[HistoryEvent]) -> "PackageEventReplay":
+        """Applies every event in order
+
+        Args:
+            events (Iterable[HistoryEvent]): The events in the order they happened, a generator is consumed as it is read
+
+        Returns:
+            PackageEventReplay: The replay so calls can be chained
+        """
+        for event in events:
+            self.apply( event )
+
+        return self
+
+    def apply(self, event: HistoryEvent):
+        """Applies a single event to the installed and explicitly installed packages
+
+        Args:
+            event (HistoryEvent): The event to apply
+        """
+        action = event.action
+        package = event.package
+
+        if action == HistoryEvent.INSTALL:
+            self.__installed[package] = event
+
+            if event.automatic:
+                self.__explicit.pop( package, None )
+            else:
+                self.__explicit[package] = event
+        elif action == HistoryEvent.REQUESTED:
+            # Naming a package in an install command marks it as manually installed even if it already was installed
+            self.__installed.setdefault( package, event )
+            self.__explicit.setdefault( package, event )
+        elif action in ( HistoryEvent.UPGRADE, HistoryEvent.DOWNGRADE, HistoryEvent.REINSTALL ):
+            # The package may have been installed before the oldest history log, it is known to be installed but not how
+            self.__installed.setdefault( package, event )
+        elif action in ( HistoryEvent.REMOVE, HistoryEvent.PURGE ):
+            self.__installed.pop( package, None )
+            self.__explicit.pop( package, None )
+
+    def is_installed(self, package: str) -> bool:
+        """Checks whether the package is installed according to the history
+
+        Args:
+            package (str): A string that defines a package
+
+        Returns:
+            bool: True if the package was installed and has not been removed since
+        """
+        return package in self.__installed
+
+    def get_explicit_install(self, package: str) -> Optional[HistoryEvent]:
+        """Pulls the event that explicitly installed the package
+
+        Args:
+            package (str): A string that defines a package
+
+        Returns:
+            Optional[HistoryEvent]: The event or None if the package is not installed or was installed as a dependency
+        """
+        return self.__explicit.get( package )
+
+    def get_explicitly_installed(self, since: Optional[datetime] = None, until: Optional[datetime] = None, user: Optional[str] = None) -> dict[str, HistoryEvent]:
+        """Pulls the packages that are still installed and were explicitly installed
+
+        Args:
+            since (Optional[datetime]): The earliest install date included, no lower bound if None
+            until (Optional[datetime]): The latest install date included, no upper bound if None
+            user (Optional[str]): The requested by user, every user if None
+
+        Returns:
+            dict[str, HistoryEvent]: The packages mapped to the event that explicitly installed them
+        """
+        if since is None and until is None and user is None:
+            return dict( self.__explicit )
+
+        return {
+            package: event for package, event in self.__explicit.items()
+            if ( user is None or event.requested_by == user )
+            and ( since is None or ( event.date is not None and event.date >= since ) )
+            and ( until is None or ( event.date is not None and event.date <= until ) )
+        }
@@ -1,5 +1,7 @@
 from .HistoryFileSection import HistoryFileSection
 from .HistoryFileSectionCollection import HistoryFileSectionCollection
+from .HistoryEvent import HistoryEvent
+from .PackageEventReplay import PackageEventReplay
 
-__all__  = ["HistoryFileSection", "HistoryFileSectionCollection"]
+__all__  = ["HistoryFileSection", "HistoryFileSectionCollection", "HistoryEvent", "PackageEventReplay"]
 
@@ -0,0 +1,48 @@
+from typing import Optional
+
+
+class PackageChange():
+    """A manually installed package that was added, removed or changed version between two versions of the status file"""
+    ADDED = "added"
+    REMOVED = "removed"
+    CHANGED = "changed"
+    # The columns written for each change by the CSV writer
+    COLUMNS = ( "change", "package", "architecture", "old_version", "new_version" )
+    # Slots drop the per instance dictionary the same way UserInstalledPackage does
+    __slots__ = ( "change", "package", "architecture", "old_version", "new_version", "host" )
+
+    def __init__(self, change: str, package: str, architecture: Optional[str], old_version: Optional[str], new_version: Optional[str], host: Optional[str] = None):
+        self.change = change
+        self.package = package
+        self.architecture = architecture
+        self.old_version = old_version
+        self.new_version = new_version
+        self.host = host
+
+    def to_text(self) -> str:
+        """Formats the change as a line of a diff
+
+        Returns:
+            str: + for an added package, - for a removed package and ~ for a package whose version changed
+        """
+        if self.change == self.ADDED:
+            return f"+ {self.package} ({self.new_version})"
+
+        if self.change == self.REMOVED:
+            return f"- {self.package} ({self.old_version})"
+
+        return f"~ {self.package} ({self.old_version} -> {self.new_version})"
+
+    def to_dict(self) -> dict:
+        """Converts the change to a dictionary that can be serialized as JSON
+
+        Returns:
+            dict: The change's fields, the version missing from one side is None
+        """
+        return {
+            "change": self.change,
+            "package": self.package,
+            "architecture": self.architecture,
+            "old_version": self.old_version,
+            "new_version": self.new_version,
+        }
@@ -0,0 +1,62 @@
+from datetime import datetime
+from typing import Optional
+
+
+class UserInstalledPackage():
+    """A package in the status file joined with the history file section that installed it"""
+    # Slots drop the per instance dictionary since a result is created for every package installed by a user
+    __slots__ = ( "package", "version", "requested_by", "installed_size", "install_date", "host" )
+
+    def __init__(self, package: str, version: str, requested_by: str, installed_size: Optional[int], install_date: Optional[datetime], host: Optional[str] = None):
+        self.package = package
+        self.version = version
+        self.requested_by = requested_by
+        self.installed_size = installed_size
+        self.install_date = install_date
+        self.host = host
+
+    def to_text(self) -> str:
+        """Formats the result the way the package list has always been output
+
+        Returns:
+            str: The formatted output for the package
+        """
+        installed_size = "" if self.installed_size is None else self.installed_size
+
+        return f"{self.package} ({self.version})::{self.requested_by} {installed_size} KiB"
+
+    def to_dict(self) -> dict:
+        """Converts the result to a dictionary that can be serialized as JSON
+
+        Returns:
+            dict: The result's fields, the install date in ISO format
+        """
+        return {
+            "package": self.package,
+            "version": self.version,
+            "requested_by": self.requested_by,
+            "installed_size": self.installed_size,
+            "install_date": self.install_date.isoformat() if self.install_date else None,
+        }
+
+    @staticmethod
+    def from_dict(values: dict, host: Optional[str] = None) -> "UserInstalledPackage":
+        """Creates a result from a dictionary created by to_dict
+
+        Args:
+            values (dict): The result's fields
+            host (Optional[str]): The host the result came from
+
+        Returns:
+            UserInstalledPackage: The result
+        """
+        install_date = values.get( "install_date" )
+
+        return UserInstalledPackage(
+            values["package"],
+            values["version"],
+            values["requested_by"],
+            values.get( "installed_size" ),
+            datetime.fromisoformat( install_date ) if install_date else None,
+            host
+        )
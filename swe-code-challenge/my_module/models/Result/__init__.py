@@ -0,0 +1,4 @@
+from .UserInstalledPackage import UserInstalledPackage
+from .PackageChange import PackageChange
+
+__all__ = ["UserInstalledPackage", "PackageChange"]
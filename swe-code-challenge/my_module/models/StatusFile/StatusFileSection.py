@@ -1,10 +1,27 @@
+import re
+import sys
+from typing import Optional
+
+
 class StatusFileSection():
+    DESCRIPTION_REGEX = r"^Description: (.+)(?:\n(?!\S).*.+)*"
+    # The last word of the Status field once dpkg has fully installed the package (Ex: install ok installed)
+    INSTALLED_STATE = "installed"
+    
+    # Slots drop the per instance dictionary since a status file can hold tens of thousands of sections
+    __slots__ = ( "_package", "_section", "_version", "_description", "_installed_size", "_status", "_raw", "_fields" )
+    
     def __init__(self):
         self._package = ""
         self._section = ""
         self._version = ""
-        self._description = ""
+        # The description and any other rarely used fields are decoded from the raw section on first access
+        self._description = None
         self._installed_size = ""
+        self._status = ""
+        self._raw = ""
+        # Created on the first decoded field since most sections never have one
+        self._fields = None
         
     @property
     def package(self) -> str:
@@ -42,7 +59,8 @@ class StatusFileSection():
             value: The package's section
         """
         if value:
-            self._section = value
+            # Sections repeat across most packages so a single copy of each is kept
+            self._section = sys.intern( value )
             
     @property
     def version(self) -> str:
@@ -61,15 +79,51 @@ class StatusFileSection():
             value: The package's version
         """
         if value:
-            self._version = value
+            # Versions are shared by packages built from the same source so a single copy of each is kept
+            self._version = sys.intern( value )
+            
+    @property
+    def status(self) -> str:
+        """Gets the status specified for the package in the section of the status file
+
+        Returns:
+            str: The package's wanted action, error flag and state (Ex: install ok installed)
+        """
+        return self._status
+    
+    @status.setter
+    def status(self, value):
+        """Sets the status value specified for the package in the section of the status file
+
+        Args:
+            value: The package's status
+        """
+        if value:
+            # Nearly every package has the same status so a single copy of each is kept
+            self._status = sys.intern( value )
+            
+    @property
+    def is_installed(self) -> bool:
+        """Checks the state of the status field to see if the package is installed.
+        Packages that were removed but left their configuration files (config-files) or
+        failed part way through (half-installed, ...) are not installed.
+
+        Returns:
+            bool: True if the package is installed
+        """
+        return self.status.rsplit( " ", 1 )[-1] == self.INSTALLED_STATE
             
     @property
     def description(self) -> str:
-        """Gets the description for the package in the section of the status file
+        """Gets the description for the package in the section of the status file.
+        The description is decoded from the raw section the first time it is accessed.
 
         Returns:
             str: The package's description
         """
+        if self._description is None:
+            self._description = self.parse_description_text( self._raw )
+            
         return self._description
     
     @description.setter
@@ -99,4 +153,125 @@ class StatusFileSection():
             value: The package's installed size
         """
         if value:
-            self._installed_size = value
\ No newline at end of file
+            self._installed_size = value
+            
+    @property
+    def installed_size_kib(self) -> Optional[int]:
+        """Gets the installed size for the package as a number
+
+        Returns:
+            Optional[int]: The package's installed size in KiB or None if it was not provided
+        """
+        if self._installed_size.isdigit():
+            return int( self._installed_size )
+        
+        return None
+            
+    @property
+    def raw(self) -> str:
+        """Gets the raw text of the section in the status file
+
+        Returns:
+            str: The package's section as it appears in the status file
+        """
+        return self._raw
+    
+    @raw.setter
+    def raw(self, value):
+        """Sets the raw text of the section so rarely used fields can be decoded when they are needed
+
+        Args:
+            value: The package's section as it appears in the status file
+        """
+        if value:
+            self._raw = value
+            self._fields = None
+            
+    def get_field(self, field: str) -> Optional[str]:
+        """Gets the value of any field in the raw section, decoding it on first access
+
+        Args:
+            field (str): The name of the field (Ex: Architecture)
+
+        Returns:
+            Optional[str]: The field's value with continuation lines joined by new lines or None if the section does not have the field
+        """
+        if self._fields is None:
+            self._fields = {}
+            
+        if field not in self._fields:
+            self._fields[field] = self.parse_field_value( self._raw, field )
+            
+        return self._fields[field]
+    
+    def set_field(self, field: str, value: Optional[str]):
+        """Sets the decoded value of a field so it is not decoded from the raw section (Ex: a field a parser already read)
+
+        Args:
+            field (str): The name of the field (Ex: Architecture)
+            value (Optional[str]): The field's value or None if the section does not have the field
+        """
+        if self._fields is None:
+            self._fields = {}
+            
+        self._fields[field] = value
+    
+    @staticmethod
+    def parse_field_value(section_contents: str, field: str) -> Optional[str]:
+        """Pulls a field's value out of the raw section
+
+        Args:
+            section_contents (str): The section contents for a package
+            field (str): The name of the field
+
+        Returns:
+            Optional[str]: The field's value or None if the section does not have the field
+        """
+        value_lines = None
+        
+        for line in section_contents.split( "\n" ):
+            if value_lines is not None:
+                # Continuation lines start with whitespace, anything else is the next field
+                if line[:1] in ( " ", "\t" ):
+                    value_lines.append( line[1:] )
+                    continue
+                
+                break
+            
+            if line.startswith( f"{field}:" ):
+                value_lines = [line[len( field ) + 1:].strip()]
+                
+        if value_lines is None:
+            return None
+        
+        return "\n".join( value_lines )
+    
+    @staticmethod
+    def parse_description_text(section_contents: str) -> str:
+        """Pulls the description section out of the contents and formats it
+
+        Args:
+            section_contents (str): The section contents for a package
+
+        Returns:
+            str: the description text formatted
+        """
+        description_text_raw = re.search( StatusFileSection.DESCRIPTION_REGEX, section_contents, re.MULTILINE )
+        
+        if not description_text_raw:
+            return ""
+        
+        description_lines = []
+        
+        for line in description_text_raw[0].split( "\n" ):
+            if line.startswith(" ."):
+                description_lines.append( "\n" )
+            elif line.startswith("Description: "):
+                description_lines.append( line.replace("Description: ", "") )
+                description_lines.append( "\n" )
+            elif line.startswith("  *"):
+                description_lines.append( f"{line}\n" )
+            else:
+                description_lines.append( f"{line} " )
+        
+        return "".join( description_lines )
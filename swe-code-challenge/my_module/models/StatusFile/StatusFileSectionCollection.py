@@ -1,26 +1,245 @@
+import sys
+import heapq
+import itertools
+from array import array
 from my_module.models.StatusFile.StatusFileSection import StatusFileSection
+from my_module.models.StatusFile.StatusFileSectionView import StatusFileSectionView
+from my_module.models.HistoryFile.HistoryFileSection import HistoryFileSection
 from my_module.models.HistoryFile.HistoryFileSectionCollection import HistoryFileSectionCollection
+from my_module.models.HistoryFile.HistoryEvent import HistoryEvent
+from my_module.models.ExtendedStates.ExtendedStatesCollection import ExtendedStatesCollection
+from my_module.models.Result.UserInstalledPackage import UserInstalledPackage
+from my_module.models.Result.PackageChange import PackageChange
+from typing import Iterable, Iterator, Optional
 
 
 class StatusFileSectionCollection():
-    def __init__(self):
-        self.__status_file_section_collection: list[StatusFileSection] = []
+    # Columns holding values that repeat across many packages, a single copy of each value is kept
+    INTERNED_COLUMNS = ( "section", "version", "status" )
+    # The fields of the status file stored in the columns, any other field is decoded from the raw section
+    COLUMN_FIELDS = ( "Package", "Section", "Version", "Installed-Size", "Status" )
+    # Installed sizes are stored as integers, this marks a package that did not provide one
+    MISSING_INSTALLED_SIZE = -1
+    # The orders results can be output in, the order of the status file or the largest installed size first
+    SORT_STATUS = "status"
+    SORT_SIZE = "size"
+    
+    def __init__(self, keep_raw: bool = True):
+        # The sections are stored as columns rather than objects so each package only costs a few references
+        # StatusFileSectionView objects are handed out to read and write a row through the StatusFileSection API
+        self.__columns = {
+            "package": [],
+            "section": [],
+            "version": [],
+            "installed_size": array( "q" ),
+            "status": [],
+            "raw": [],
+        }
+        
+        # The raw sections are only needed to decode descriptions and other rarely used fields
+        # Dropping them keeps only the columns above, from_fields drops them when no other field was read
+        self.__keep_raw = keep_raw
+        
+        # Descriptions and fields decoded from the raw sections keyed by row, only rows that were accessed are stored
+        self.__descriptions: dict[int, str] = {}
+        self.__fields: dict[int, dict[str, Optional[str]]] = {}
+        
+    def __len__(self) -> int:
+        return len( self.__columns["package"] )
+    
+    @staticmethod
+    def from_fields(fields: Optional[Iterable[str]]) -> "StatusFileSectionCollection":
+        """Creates a collection for sections read with the given fields, the raw sections are only kept when a field
+        outside the columns was read (Ex: Depends for the dependency graph or Architecture for diffs)
+
+        Args:
+            fields (Optional[Iterable[str]]): The fields read from each section, None if every field is read
+
+        Returns:
+            StatusFileSectionCollection: An empty collection
+        """
+        return StatusFileSectionCollection( StatusFileSectionCollection.needs_raw( fields ) )
+    
+    @staticmethod
+    def needs_raw(fields: Optional[Iterable[str]]) -> bool:
+        """Checks whether a field outside the columns is read, only then is anything decoded from the raw sections
+
+        Args:
+            fields (Optional[Iterable[str]]): The fields read from each section, None if every field is read
+
+        Returns:
+            bool: True if the raw sections have to be kept
+        """
+        return fields is None or not set( fields ) <= set( StatusFileSectionCollection.COLUMN_FIELDS )
         
     def append(self, status_file_section: StatusFileSection):
-        """Appends a StatusFileSection to the collection
+        """Appends a StatusFileSection to the collection by copying its values into the columns
 
         Args:
             status_file_section (StatusFileSection): An object containing data from the status file section
         """
-        self.__status_file_section_collection.append( status_file_section )
+        index = len( self )
+        
+        self.append_values( status_file_section.package, status_file_section.section, status_file_section.version, status_file_section.installed_size, status_file_section.raw, status_file_section.status )
+        
+        # A description set directly rather than decoded from the raw section is kept as is
+        if not status_file_section.raw and status_file_section.description:
+            self.__descriptions[index] = status_file_section.description
+            
+    def append_values(self, package: str, section: str, version: str, installed_size, raw: str, status: str = ""):
+        """Appends a package's values straight into the columns without creating a StatusFileSection
+
+        Args:
+            package (str): The package's package
+            section (str): The package's section
+            version (str): The package's version
+            installed_size: The package's installed size as a string or integer
+            raw (str): The package's section as it appears in the status file
+            status (str): The package's status
+        """
+        self.__columns["package"].append( package )
+        self.__columns["section"].append( sys.intern( section ) )
+        self.__columns["version"].append( sys.intern( version ) )
+        self.__columns["installed_size"].append( self.__to_installed_size( installed_size ) )
+        self.__columns["status"].append( sys.intern( status ) )
+        self.__columns["raw"].append( raw if self.__keep_raw else "" )
+        
+    def extend_columns(self, packages: Iterable[str], sections: Iterable[str], versions: Iterable[str], installed_sizes: Iterable[int], raws: Iterable[str], statuses: Iterable[str]):
+        """Appends many packages a column at a time, used to load a snapshot without a call per package
+
+        Args:
+            packages (Iterable[str]): The packages' packages
+            sections (Iterable[str]): The packages' sections
+            versions (Iterable[str]): The packages' versions
+            installed_sizes (Iterable): The packages' installed sizes as strings or integers
+            raws (Iterable[str]): The packages' sections as they appear in the status file
+            statuses (Iterable[str]): The packages' statuses
+        """
+        self.__columns["package"].extend( packages )
+        self.__columns["section"].extend( map( sys.intern, sections ) )
+        self.__columns["version"].extend( map( sys.intern, versions ) )
+        self.__columns["installed_size"].extend( map( self.__to_installed_size, installed_sizes ) )
+        self.__columns["status"].extend( map( sys.intern, statuses ) )
+        self.__columns["raw"].extend( raws if self.__keep_raw else itertools.repeat( "", len( self ) - len( self.__columns["raw"] ) ) )
         
     def get_status_file_section_collection(self) -> list[StatusFileSection]:
         """Returns the collection of status file sections
 
         Returns:
-            list[StatusFileSection]: A list of objects containing status file section data
+            list[StatusFileSection]: A list of views over the status file section data
+        """
+        return [StatusFileSectionView( self, index ) for index in range( len( self ) )]
+    
+    def get_column_value(self, column: str, index: int):
+        """Gets a single value out of a column
+
+        Args:
+            column (str): The name of the column (package, section, version, installed_size, status or raw)
+            index (int): The row of the section
+
+        Returns:
+            The value stored for the section, installed sizes are returned as integers or None if missing
+        """
+        value = self.__columns[column][index]
+        
+        if column == "installed_size" and value == self.MISSING_INSTALLED_SIZE:
+            return None
+        
+        return value
+    
+    def set_column_value(self, column: str, index: int, value):
+        """Sets a single value in a column
+
+        Args:
+            column (str): The name of the column (package, section, version, installed_size, status or raw)
+            index (int): The row of the section
+            value: The value to store
+        """
+        if column == "installed_size":
+            value = self.__to_installed_size( value )
+        elif column in self.INTERNED_COLUMNS:
+            value = sys.intern( value )
+        elif column == "raw":
+            # Previously decoded values came from the old raw section
+            self.__descriptions.pop( index, None )
+            self.__fields.pop( index, None )
+            
+        self.__columns[column][index] = value
+        
+    def get_installed_sizes(self) -> array:
+        """Gets the installed size column
+
+        Returns:
+            array: The installed size of each package in KiB, packages without one are stored as MISSING_INSTALLED_SIZE
+        """
+        return self.__columns["installed_size"]
+    
+    def get_description(self, index: int) -> str:
+        """Gets a package's description, decoding it from the raw section on first access
+
+        Args:
+            index (int): The row of the section
+
+        Returns:
+            str: The package's description
+        """
+        if index not in self.__descriptions:
+            self.__descriptions[index] = StatusFileSection.parse_description_text( self.__columns["raw"][index] )
+            
+        return self.__descriptions[index]
+    
+    def set_description(self, index: int, value: str):
+        """Sets a package's description
+
+        Args:
+            index (int): The row of the section
+            value (str): The package's description
+        """
+        self.__descriptions[index] = value
+        
+    def get_field(self, index: int, field: str) -> Optional[str]:
+        """Gets the value of any field in a package's raw section, decoding it on first access
+
+        Args:
+            index (int): The row of the section
+            field (str): The name of the field (Ex: Architecture)
+
+        Returns:
+            Optional[str]: The field's value or None if the section does not have the field
+        """
+        fields = self.__fields.setdefault( index, {} )
+        
+        if field not in fields:
+            fields[field] = StatusFileSection.parse_field_value( self.__columns["raw"][index], field )
+            
+        return fields[field]
+    
+    def set_field(self, index: int, field: str, value: Optional[str]):
+        """Sets the decoded value of a field in a package's raw section so it is not decoded again
+
+        Args:
+            index (int): The row of the section
+            field (str): The name of the field (Ex: Architecture)
+            value (Optional[str]): The field's value or None if the section does not have the field
         """
-        return self.__status_file_section_collection
+        self.__fields.setdefault( index, {} )[field] = value
+    
+    def __to_installed_size(self, value) -> int:
+        """Converts an installed size to the integer stored in the column
+
+        Args:
+            value: The installed size as a string or integer
+
+        Returns:
+            int: The installed size in KiB or MISSING_INSTALLED_SIZE if it is not a number
+        """
+        if isinstance( value, int ):
+            return value
+        
+        if value and value.isdigit():
+            return int( value )
+        
+        return self.MISSING_INSTALLED_SIZE
     
     def get_status_file_packages(self) -> list:
         """Creates a list of the package names from the status file and returns them as a list
@@ -28,32 +247,224 @@ class StatusFileSectionCollection():
         Returns:
             list: Returns a list of package names
         """
-        package_list = []
-        
-        for section in self.__status_file_section_collection:
-            if section.package:
-                package_list.append( section.package )
-                
-        return package_list
+        return [package for package in self.__columns["package"] if package]
     
     def get_user_installed_packages(self, history_file_section_collection: HistoryFileSectionCollection) -> list:
         """Creates and returns a list of packages that overlap with packages from the history file
 
         Args:
-            packages_list (list): List of packages pulled as installed
+            history_file_section_collection (HistoryFileSectionCollection): The collection of sections from the history file
 
         Returns:
             list: List of packages that overlap between status file and the installed package list
         """
         overlapping_packages = []
         
-        for section in self.__status_file_section_collection:
-            reinstalled = ""
-            # Checks to see if the package exists in the history file
-            if section.package in history_file_section_collection.get_sections_packages():
-                # Pulls the data for the history file that matches the package
-                history_file_section = history_file_section_collection.get_history_file_section_by_package( section.package )
-                # Creates output using both status file data and history file data for the user
-                overlapping_packages.append(f"{section.package} ({section.version})::{history_file_section.requested_by} {section.installed_size} KiB")
+        # Single pass over the package column, a view is only created for the packages that matched
+        for index, package in enumerate( self.__columns["package"] ):
+            history_file_section = history_file_section_collection.get_history_file_section_by_package( package )
+            
+            if history_file_section:
+                overlapping_packages.append( self.format_user_installed_package( StatusFileSectionView( self, index ), history_file_section ) )
+                
+        return overlapping_packages
+    
+    @staticmethod
+    def join_user_installed_packages(status_file_sections: Iterable[StatusFileSection], history_file_section_collection: HistoryFileSectionCollection) -> Iterator[UserInstalledPackage]:
+        """Joins status file sections with the history file as they are iterated so the sections 
+        can come straight from a streaming parser without being collected first
+
+        Args:
+            status_file_sections (Iterable[StatusFileSection]): The status file sections to join
+            history_file_section_collection (HistoryFileSectionCollection): The collection of sections from the history file
+
+        Yields:
+            Iterator[UserInstalledPackage]: A result for each package that overlaps between the status file and the history file
+        """
+        # Single pass over the status file sections, each lookup is served by the history collection's package index
+        for section in status_file_sections:
+            # Pulls the data for the history file that matches the package if the package exists in the history file
+            history_file_section = history_file_section_collection.get_history_file_section_by_package( section.package )
+            
+            if history_file_section:
+                yield StatusFileSectionCollection.create_user_installed_package( section, history_file_section )
+                
+    @staticmethod
+    def join_replayed_packages(status_file_sections: Iterable[StatusFileSection], explicitly_installed: dict[str, HistoryEvent]) -> Iterator[UserInstalledPackage]:
+        """Joins status file sections with the packages a replay of the history found explicitly installed,
+        keeping only the packages the status file says are installed
+
+        Args:
+            status_file_sections (Iterable[StatusFileSection]): The status file sections to join
+            explicitly_installed (dict[str, HistoryEvent]): The packages mapped to the event that explicitly installed them
+
+        Yields:
+            Iterator[UserInstalledPackage]: A result for each explicitly installed package that is installed
+        """
+        for section in status_file_sections:
+            event = explicitly_installed.get( section.package )
+            
+            # The history can be missing removals (Ex: dpkg -r or logs that were deleted) so the status file has the final say
+            if event and section.is_installed:
+                yield UserInstalledPackage( section.package, section.version, event.requested_by, section.installed_size_kib, event.date )
+                
+    @staticmethod
+    def join_manually_installed_packages(status_file_sections: Iterable[StatusFileSection], extended_states_collection: ExtendedStatesCollection, history_file_section_collection: Optional[HistoryFileSectionCollection] = None, require_history: bool = False) -> Iterator[UserInstalledPackage]:
+        """Finds the installed packages apt did not install automatically, optionally enriching each with the
+        history file section that installed it
+
+        Args:
+            status_file_sections (Iterable[StatusFileSection]): The status file sections to join
+            extended_states_collection (ExtendedStatesCollection): The packages apt installed automatically
+            history_file_section_collection (Optional[HistoryFileSectionCollection]): The history used for the requested by user and install date, not read if None
+            require_history (bool): Whether packages without a history file section are left out (Ex: the history was narrowed to a user)
+
+        Yields:
+            Iterator[UserInstalledPackage]: A result for each manually installed package
+        """
+        for section in status_file_sections:
+            if not section.is_installed or extended_states_collection.is_auto_installed( section.package ):
+                continue
+            
+            history_file_section = history_file_section_collection.get_history_file_section_by_package( section.package ) if history_file_section_collection else None
+            
+            if history_file_section:
+                yield StatusFileSectionCollection.create_user_installed_package( section, history_file_section )
+            elif not require_history:
+                yield UserInstalledPackage( section.package, section.version, HistoryFileSection().requested_by, section.installed_size_kib, None )
+                
+    @staticmethod
+    def join_package_changes(old_sections: Iterable[StatusFileSection], new_sections: Iterable[StatusFileSection], history_file_section_collection: Optional[HistoryFileSectionCollection] = None) -> Iterator[PackageChange]:
+        """Matches the sections that differ between two versions of the status file by package and architecture,
+        the sections both versions share are left out by the caller so they are never parsed
+
+        Args:
+            old_sections (Iterable[StatusFileSection]): The sections only in the older version of the status file
+            new_sections (Iterable[StatusFileSection]): The sections only in the newer version of the status file
+            history_file_section_collection (Optional[HistoryFileSectionCollection]): The history the packages must have been installed by, every package if None
+
+        Yields:
+            Iterator[PackageChange]: The packages added, the packages whose version changed and then the packages removed
+        """
+        # Packages that are not installed (Ex: only their configuration files are left) count as removed
+        old_packages = {
+            ( section.package, section.get_field( "Architecture" ) ): section
+            for section in old_sections if section.is_installed
+        }
+        
+        for section in new_sections:
+            if not section.is_installed:
+                continue
+            
+            architecture = section.get_field( "Architecture" )
+            old_section = old_packages.pop( ( section.package, architecture ), None )
+            
+            if history_file_section_collection is not None and not history_file_section_collection.has_package( section.package ):
+                continue
+            
+            if old_section is None:
+                yield PackageChange( PackageChange.ADDED, section.package, architecture, None, section.version )
+            elif old_section.version != section.version:
+                yield PackageChange( PackageChange.CHANGED, section.package, architecture, old_section.version, section.version )
                 
-        return overlapping_packages
\ No newline at end of file
+        for ( package, architecture ), old_section in old_packages.items():
+            if history_file_section_collection is not None and not history_file_section_collection.has_package( package ):
+                continue
+            
+            yield PackageChange( PackageChange.REMOVED, package, architecture, old_section.version, None )
+                
+    @staticmethod
+    def filter_status_file_sections(status_file_sections: Iterable[StatusFileSection], section: Optional[str] = None, min_size: Optional[int] = None) -> Iterator[StatusFileSection]:
+        """Drops the sections outside the section or smaller than the size before they are joined, so no result is created for them
+
+        Args:
+            status_file_sections (Iterable[StatusFileSection]): The status file sections to filter
+            section (Optional[str]): The package's section, with or without its archive area (Ex: net matches contrib/net), every section if None
+            min_size (Optional[int]): The smallest installed size in KiB kept, packages without an installed size are dropped, every size if None
+
+        Yields:
+            Iterator[StatusFileSection]: The sections that match
+        """
+        for status_file_section in status_file_sections:
+            if section is not None and section not in ( status_file_section.section, status_file_section.section.rpartition( "/" )[2] ):
+                continue
+            
+            if min_size is not None:
+                # Compared as an integer, the collection already stores the installed sizes as integers
+                installed_size = status_file_section.installed_size_kib
+                
+                if installed_size is None or installed_size < min_size:
+                    continue
+                
+            yield status_file_section
+            
+    @staticmethod
+    def select_user_installed_packages(user_installed_packages: Iterable[UserInstalledPackage], sort: Optional[str] = None, top: Optional[int] = None) -> Iterable[UserInstalledPackage]:
+        """Orders the results and keeps the first of them without formatting any, the N largest are picked with a heap
+        of N results rather than by sorting every result
+
+        Args:
+            user_installed_packages (Iterable[UserInstalledPackage]): The results to order
+            sort (Optional[str]): SORT_SIZE for the largest installed size first, the order they were given in otherwise
+            top (Optional[int]): The number of results kept, every result if None
+
+        Returns:
+            Iterable[UserInstalledPackage]: The results, packages with the same installed size stay in the order they were given in
+        """
+        if sort == StatusFileSectionCollection.SORT_SIZE:
+            if top is not None:
+                return heapq.nlargest( top, user_installed_packages, key=StatusFileSectionCollection.get_result_installed_size )
+            
+            return sorted( user_installed_packages, key=StatusFileSectionCollection.get_result_installed_size, reverse=True )
+        
+        if top is not None:
+            # Stops the join once enough results were found
+            return itertools.islice( user_installed_packages, top )
+        
+        return user_installed_packages
+    
+    @staticmethod
+    def get_result_installed_size(user_installed_package: UserInstalledPackage) -> int:
+        """Gets the installed size results are sorted by
+
+        Args:
+            user_installed_package (UserInstalledPackage): The result
+
+        Returns:
+            int: The installed size in KiB, MISSING_INSTALLED_SIZE if the package did not provide one so it sorts last
+        """
+        installed_size = user_installed_package.installed_size
+        
+        return StatusFileSectionCollection.MISSING_INSTALLED_SIZE if installed_size is None else installed_size
+                
+    @staticmethod
+    def create_user_installed_package(status_file_section: StatusFileSection, history_file_section: HistoryFileSection) -> UserInstalledPackage:
+        """Creates a result using both status file data and history file data for the user
+
+        Args:
+            status_file_section (StatusFileSection): The package's section of the status file
+            history_file_section (HistoryFileSection): The history file section that installed the package
+
+        Returns:
+            UserInstalledPackage: The result for the package
+        """
+        return UserInstalledPackage(
+            status_file_section.package,
+            status_file_section.version,
+            history_file_section.requested_by,
+            status_file_section.installed_size_kib,
+            history_file_section.start_date
+        )
+                
+    @staticmethod
+    def format_user_installed_package(status_file_section: StatusFileSection, history_file_section: HistoryFileSection) -> str:
+        """Creates output using both status file data and history file data for the user
+
+        Args:
+            status_file_section (StatusFileSection): The package's section of the status file
+            history_file_section (HistoryFileSection): The history file section that installed the package
+
+        Returns:
+            str: The formatted output for the package
+        """
+        return StatusFileSectionCollection.create_user_installed_package( status_file_section, history_file_section ).to_text()
@@ -0,0 +1,181 @@
+from my_module.models.StatusFile.StatusFileSection import StatusFileSection
+from typing import Optional
+
+
+class StatusFileSectionView(StatusFileSection):
+    """A StatusFileSection backed by a row of a StatusFileSectionCollection's columns.
+    Reads and writes go straight to the collection so no data is copied into the view.
+    """
+    __slots__ = ( "_collection", "_index" )
+
+    def __init__(self, collection, index: int):
+        # The parent's fields are left unset since every property is served from the collection
+        self._collection = collection
+        self._index = index
+
+    @property
+    def package(self) -> str:
+        """Gets the package specified in the section of the status file
+
+        Returns:
+            str: The package's package
+        """
+        return self._collection.get_column_value( "package", self._index )
+
+    @package.setter
+    def package(self, value):
+        """Sets the value extracted from the package line of the section in the status file
+
+        Args:
+            value: The package's package
+        """
+        if value:
+            self._collection.set_column_value( "package", self._index, value )
+
+    @property
+    def section(self) -> str:
+        """Gets the section specified for the package in the section of the status file
+
+        Returns:
+            str: The package's section
+        """
+        return self._collection.get_column_value( "section", self._index )
+
+    @section.setter
+    def section(self, value):
+        """Sets the value extracted from the section line of the section in the status file
+
+        Args:
+            value: The package's section
+        """
+        if value:
+            self._collection.set_column_value( "section", self._index, value )
+
+    @property
+    def version(self) -> str:
+        """Gets the version specified for the package in the section of the status file
+
+        Returns:
+            str: The package's version
+        """
+        return self._collection.get_column_value( "version", self._index )
+
+    @version.setter
+    def version(self, value):
+        """Sets the version value specified for the package in the section of the status file
+
+        Args:
+            value: The package's version
+        """
+        if value:
+            self._collection.set_column_value( "version", self._index, value )
+
+    @property
+    def status(self) -> str:
+        """Gets the status specified for the package in the section of the status file
+
+        Returns:
+            str: The package's wanted action, error flag and state (Ex: install ok installed)
+        """
+        return self._collection.get_column_value( "status", self._index )
+
+    @status.setter
+    def status(self, value):
+        """Sets the status value specified for the package in the section of the status file
+
+        Args:
+            value: The package's status
+        """
+        if value:
+            self._collection.set_column_value( "status", self._index, value )
+
+    @property
+    def description(self) -> str:
+        """Gets the description for the package, decoding it from the raw section on first access
+
+        Returns:
+            str: The package's description
+        """
+        return self._collection.get_description( self._index )
+
+    @description.setter
+    def description(self, value):
+        """Sets the description for the package in the section of the status file
+
+        Args:
+            value: The package's description
+        """
+        if value:
+            self._collection.set_description( self._index, value )
+
+    @property
+    def installed_size(self) -> str:
+        """Gets the installed size for the package in the section of the status file
+
+        Returns:
+            str: The package's installed size
+        """
+        installed_size = self.installed_size_kib
+
+        if installed_size is None:
+            return ""
+
+        return str( installed_size )
+
+    @installed_size.setter
+    def installed_size(self, value):
+        """Sets the installed size for the package in the section of the status file
+
+        Args:
+            value: The package's installed size
+        """
+        if value:
+            self._collection.set_column_value( "installed_size", self._index, value )
+
+    @property
+    def installed_size_kib(self) -> Optional[int]:
+        """Gets the installed size for the package as a number
+
+        Returns:
+            Optional[int]: The package's installed size in KiB or None if it was not provided
+        """
+        return self._collection.get_column_value( "installed_size", self._index )
+
+    @property
+    def raw(self) -> str:
+        """Gets the raw text of the section in the status file
+
+        Returns:
+            str: The package's section as it appears in the status file
+        """
+        return self._collection.get_column_value( "raw", self._index )
+
+    @raw.setter
+    def raw(self, value):
+        """Sets the raw text of the section so rarely used fields can be decoded when they are needed
+
+        Args:
+            value: The package's section as it appears in the status file
+        """
+        if value:
+            self._collection.set_column_value( "raw", self._index, value )
+
+    def get_field(self, field: str) -> Optional[str]:
+        """Gets the value of any field in the raw section, decoding it on first access
+
+        Args:
+            field (str): The name of the field (Ex: Architecture)
+
+        Returns:
+            Optional[str]: The field's value or None if the section does not have the field
+        """
+        return self._collection.get_field( self._index, field )
+
+    def set_field(self, field: str, value: Optional[str]):
+        """Sets the decoded value of a field so it is not decoded from the raw section
+
+        Args:
+            field (str): The name of the field (Ex: Architecture)
+            value (Optional[str]): The field's value or None if the section does not have the field
+        """
+        self._collection.set_field( self._index, field, value )
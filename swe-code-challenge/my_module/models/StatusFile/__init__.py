@@ -1,4 +1,5 @@
 from .StatusFileSection import StatusFileSection
+from .StatusFileSectionView import StatusFileSectionView
 from .StatusFileSectionCollection import StatusFileSectionCollection
 
-__all__ = ["StatusFileSection", "StatusFileSectionCollection"]
\ No newline at end of file
+__all__ = ["StatusFileSection", "StatusFileSectionView", "StatusFileSectionCollection"]
\ No newline at end of file
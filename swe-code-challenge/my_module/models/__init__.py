@@ -1,4 +1,7 @@
-from .StatusFile import StatusFileSection, StatusFileSectionCollection
-from .HistoryFile import HistoryFileSection, HistoryFileSectionCollection
+from .StatusFile import StatusFileSection, StatusFileSectionView, StatusFileSectionCollection
+from .HistoryFile import HistoryFileSection, HistoryFileSectionCollection, HistoryEvent, PackageEventReplay
+from .Result import UserInstalledPackage, PackageChange
+from .ExtendedStates import ExtendedStatesCollection
+from .DependencyGraph import DependencyGraph
 
-__all__ = ["StatusFileSection", "StatusFileSectionCollection", "HistoryFileSection", "HistoryFileSectionCollection"]
\ No newline at end of file
+__all__ = ["StatusFileSection", "StatusFileSectionView", "StatusFileSectionCollection", "HistoryFileSection", "HistoryFileSectionCollection", "HistoryEvent", "PackageEventReplay", "UserInstalledPackage", "PackageChange", "ExtendedStatesCollection", "DependencyGraph"]
\ No newline at end of file
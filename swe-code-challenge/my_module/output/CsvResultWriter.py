@@ -0,0 +1,60 @@
+import io
+import csv
+from .ResultWriterInterface import ResultWriterInterface
+from my_module.models.Result.UserInstalledPackage import UserInstalledPackage
+from typing import Optional, TextIO
+
+
+class CsvResultWriter(ResultWriterInterface):
+    """Writes the results as CSV with a header row"""
+    # The columns written for each package, other results (Ex: PackageChange) pass their own
+    COLUMNS = ( "package", "version", "requested_by", "installed_size", "install_date" )
+
+    def __init__(self, output: TextIO, include_host: bool = False, columns: tuple = COLUMNS):
+        super().__init__( output, include_host )
+        self.__columns = columns
+        # Rows are formatted into a reused buffer so they can be batched with the other formats
+        self.__row_buffer = io.StringIO()
+        self.__csv_writer = csv.writer( self.__row_buffer, lineterminator="\n" )
+
+    def format_header(self) -> Optional[str]:
+        """Formats the header row
+
+        Returns:
+            Optional[str]: The names of the columns
+        """
+        columns = ( "host", ) + self.get_columns() if self.is_including_host() else self.get_columns()
+
+        return self.__format_row( columns )
+
+    def format_result(self, result: UserInstalledPackage) -> str:
+        """Formats a single result as a CSV row
+
+        Args:
+            result (UserInstalledPackage): The result to format
+
+        Returns:
+            str: The formatted row
+        """
+        values = result.to_dict()
+        row = [values[column] for column in self.get_columns()]
+
+        if self.is_including_host():
+            row.insert( 0, result.host )
+
+        return self.__format_row( row )
+
+    def get_columns(self) -> tuple:
+        """Gets the columns written for each result
+
+        Returns:
+            tuple: The names of the columns, each a key of the result's to_dict
+        """
+        return self.__columns
+
+    def __format_row(self, row) -> str:
+        self.__row_buffer.seek( 0 )
+        self.__row_buffer.truncate()
+        self.__csv_writer.writerow( row )
+
+        return self.__row_buffer.getvalue()
@@ -0,0 +1,32 @@
+import json
+from .ResultWriterInterface import ResultWriterInterface
+from my_module.models.Result.UserInstalledPackage import UserInstalledPackage
+from typing import Optional
+
+
+class JsonLinesResultWriter(ResultWriterInterface):
+    """Writes each result as a JSON object on its own line"""
+
+    def format_header(self) -> Optional[str]:
+        """JSON Lines has no header
+
+        Returns:
+            Optional[str]: None
+        """
+        return None
+
+    def format_result(self, result: UserInstalledPackage) -> str:
+        """Formats a single result as a line of JSON
+
+        Args:
+            result (UserInstalledPackage): The result to format
+
+        Returns:
+            str: The formatted line
+        """
+        values = result.to_dict()
+
+        if self.is_including_host():
+            values = { "host": result.host, **values }
+
+        return json.dumps( values ) + "\n"
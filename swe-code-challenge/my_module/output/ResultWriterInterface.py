@@ -0,0 +1,84 @@
+from abc import ABC, abstractmethod
+from my_module.models.Result.UserInstalledPackage import UserInstalledPackage
+from typing import Iterable, Optional, TextIO
+
+
+class ResultWriterInterface(ABC):
+    """Writes results to a stream in batches so large outputs to pipes do not pay for a write and flush per line"""
+    # The number of formatted results held before they are written to the stream
+    BUFFERED_RESULTS = 1024
+
+    def __init__(self, output: TextIO, include_host: bool = False):
+        self.__output = output
+        self.__include_host = include_host
+        self.__buffer: list[str] = []
+        self.__header_written = False
+
+    @abstractmethod
+    def format_header(self) -> Optional[str]:
+        """
+        Formats the lines written before the first result, None if the format has no header
+        """
+        pass
+
+    @abstractmethod
+    def format_result(self, result: UserInstalledPackage) -> str:
+        """
+        Formats a single result including its line ending
+        """
+        pass
+
+    def write(self, result: UserInstalledPackage):
+        """Buffers a result, writing the buffer to the stream once it is full
+
+        Args:
+            result (UserInstalledPackage): The result to write
+        """
+        if not self.__header_written:
+            self.__header_written = True
+            header = self.format_header()
+
+            if header:
+                self.__buffer.append( header )
+
+        self.__buffer.append( self.format_result( result ) )
+
+        if len( self.__buffer ) >= self.BUFFERED_RESULTS:
+            self.__write_buffer()
+
+    def write_results(self, results: Iterable[UserInstalledPackage]) -> int:
+        """Writes every result and flushes the stream
+
+        Args:
+            results (Iterable[UserInstalledPackage]): The results to write, a generator is written as it is consumed
+
+        Returns:
+            int: The number of results written
+        """
+        count = 0
+
+        for result in results:
+            self.write( result )
+            count += 1
+
+        self.flush()
+
+        return count
+
+    def flush(self):
+        """Writes any buffered results and flushes the stream"""
+        self.__write_buffer()
+        self.__output.flush()
+
+    def __write_buffer(self):
+        if self.__buffer:
+            self.__output.write( "".join( self.__buffer ) )
+            self.__buffer.clear()
+
+    def is_including_host(self) -> bool:
+        """Checks whether the host of each result is written, used when results of many hosts are combined
+
+        Returns:
+            bool: True if the host is written
+        """
+        return self.__include_host
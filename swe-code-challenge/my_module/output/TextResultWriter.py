@@ -0,0 +1,31 @@
+from .ResultWriterInterface import ResultWriterInterface
+from my_module.models.Result.UserInstalledPackage import UserInstalledPackage
+from typing import Optional
+
+
+class TextResultWriter(ResultWriterInterface):
+    """Writes each result on its own line the way the package list has always been output,
+    prefixed with the host and a tab when the host is included
+    """
+
+    def format_header(self) -> Optional[str]:
+        """Text output has no header
+
+        Returns:
+            Optional[str]: None
+        """
+        return None
+
+    def format_result(self, result: UserInstalledPackage) -> str:
+        """Formats a single result as a line of text
+
+        Args:
+            result (UserInstalledPackage): The result to format
+
+        Returns:
+            str: The formatted line
+        """
+        if self.is_including_host():
+            return f"{result.host}\t{result.to_text()}\n"
+
+        return f"{result.to_text()}\n"
@@ -0,0 +1,6 @@
+from .ResultWriterInterface import ResultWriterInterface
+from .TextResultWriter import TextResultWriter
+from .JsonLinesResultWriter import JsonLinesResultWriter
+from .CsvResultWriter import CsvResultWriter
+
+__all__ = ["ResultWriterInterface", "TextResultWriter", "JsonLinesResultWriter", "CsvResultWriter"]
@@ -0,0 +1,114 @@
+from typing import Iterable, Iterator
+
+
+class Deb822StanzaReader():
+    """Reads the fields of deb822 stanzas (the format of the dpkg status file, apt's extended_states and the history log)
+    keeping only the fields of its projection.
+
+    Each line's field name is looked up in the projection and the lines of the other fields, along with their
+    continuation lines, are stepped over without being split out or copied.  A stanza stops being read as soon
+    as every field of the projection has been found.
+    """
+
+    def __init__(self, fields: Iterable[str]):
+        # Keeps the order the fields were given in while removing duplicates
+        self.__fields = tuple( dict.fromkeys( fields ) )
+        self.__field_set = frozenset( self.__fields )
+
+    def iter_stanzas(self, lines: Iterable[str]) -> Iterator[str]:
+        """Groups the lines into stanzas separated by blank lines, only the current stanza is held in memory
+
+        Args:
+            lines (Iterable[str]): An open file or any other iterable of its lines
+
+        Yields:
+            Iterator[str]: The text of each stanza
+        """
+        stanza_lines = []
+
+        for line in lines:
+            if line.strip():
+                stanza_lines.append( line )
+            elif stanza_lines:
+                # A blank line ends the current stanza
+                yield "".join( stanza_lines )
+                stanza_lines = []
+
+        # The last stanza does not need to be followed by a blank line
+        if stanza_lines:
+            yield "".join( stanza_lines )
+
+    def read_fields(self, stanza: str) -> dict[str, str]:
+        """Pulls the values of the projected fields out of the stanza
+
+        Args:
+            stanza (str): The text of a single stanza
+
+        Returns:
+            dict[str, str]: The value of each projected field the stanza has, stripped, with any continuation lines
+            joined by new lines the same way StatusFileSection.parse_field_value joins them
+        """
+        fields = {}
+        field_set = self.__field_set
+        field_count = len( self.__fields )
+        length = len( stanza )
+        position = 0
+
+        while position < length:
+            line_end = stanza.find( "\n", position )
+
+            if line_end == -1:
+                line_end = length
+
+            # Continuation lines start with whitespace and belong to the field before them
+            if stanza[position] not in " \t":
+                colon = stanza.find( ":", position, line_end )
+
+                if colon != -1 and stanza[position:colon] in field_set:
+                    field = stanza[position:colon]
+                    value = stanza[colon + 1:line_end].strip()
+                    line_end = self.__read_continuation( stanza, line_end, value, fields, field )
+
+                    if len( fields ) == field_count:
+                        break
+
+            position = line_end + 1
+
+        return fields
+
+    def __read_continuation(self, stanza: str, line_end: int, value: str, fields: dict[str, str], field: str) -> int:
+        """Stores the field's value along with its continuation lines, which are only read for projected fields
+
+        Args:
+            stanza (str): The text of a single stanza
+            line_end (int): The position of the end of the field's first line
+            value (str): The value on the field's first line
+            fields (dict[str, str]): The values read so far, the field's value is added to it
+            field (str): The name of the field
+
+        Returns:
+            int: The position of the end of the field's last continuation line
+        """
+        if stanza[line_end + 1:line_end + 2] not in ( " ", "\t" ):
+            fields[field] = value
+            return line_end
+
+        value_lines = [value]
+
+        while stanza[line_end + 1:line_end + 2] in ( " ", "\t" ):
+            next_line_end = stanza.find( "\n", line_end + 1 )
+            next_line_end = len( stanza ) if next_line_end == -1 else next_line_end
+            value_lines.append( stanza[line_end + 2:next_line_end] )
+            line_end = next_line_end
+
+        fields[field] = "\n".join( value_lines )
+
+        return line_end
+
+    def get_fields(self) -> tuple[str, ...]:
+        """Gets the fields of the projection
+
+        Returns:
+            tuple[str, ...]: The names of the fields read from each stanza
+        """
+        return self.__fields
@@ -0,0 +1,85 @@
+import logging
+from .ExtendedStatesParserInterface import ExtendedStatesParserInterface
+from .Deb822StanzaReader import Deb822StanzaReader
+from my_module.models.ExtendedStates.ExtendedStatesCollection import ExtendedStatesCollection
+from my_module.profiling.StageProfiler import StageProfiler
+from my_module.profiling.ParseDiagnostics import ParseDiagnostics
+from typing import Iterable, Optional
+
+
+class ExtendedStatesParser(ExtendedStatesParserInterface):
+    # The category of malformed records counted by the diagnostics
+    MISSING_PACKAGE = "extended_states_missing_package"
+    # The fields read from each section
+    FIELDS = ( "Package", "Architecture", "Auto-Installed" )
+    
+    def __init__(self, logger: logging, profiler: Optional[StageProfiler] = None, diagnostics: Optional[ParseDiagnostics] = None):
+        self.__logger = logger
+        
+        # Records the time spent parsing, a disabled profiler is used when none is provided
+        self.__profiler = profiler or StageProfiler()
+        
+        # Counts the malformed sections so they are reported once rather than logged one by one
+        self.__diagnostics = diagnostics or ParseDiagnostics()
+        
+        self.__stanza_reader = Deb822StanzaReader( self.FIELDS )
+        
+    def tokenize(self, file_contents: str) -> list:
+        """Breaks out sections of the extended_states file for each package
+
+        Args:
+            file_contents (str): The contents of the extended_states file
+
+        Returns:
+            list: A list of segments of text specific to each package
+        """
+        return list( self.__stanza_reader.iter_stanzas( file_contents.splitlines( keepends=True ) ) )
+    
+    def parse(self, package_data: Iterable[str]) -> ExtendedStatesCollection:
+        """Parses the extended_states file
+
+        Args:
+            package_data (Iterable[str]): A list of sections, one for each package
+
+        Returns:
+            ExtendedStatesCollection: The packages and whether each was installed automatically
+        """
+        extended_states_collection = ExtendedStatesCollection()
+        
+        with self.get_profiler().stage( "extended_states_parse" ) as stage:
+            for section in package_data:
+                fields = self.__stanza_reader.read_fields( section )
+                package = fields.get( "Package", "" )
+                
+                if not package:
+                    self.get_diagnostics().record( self.MISSING_PACKAGE, section )
+                    continue
+                
+                extended_states_collection.append( package, fields.get( "Architecture", "" ), fields.get( "Auto-Installed" ) == "1" )
+                stage.count += 1
+                
+        return extended_states_collection
+    
+    def get_profiler(self) -> StageProfiler:
+        """Gets the profiler recording the parser's stages
+
+        Returns:
+            StageProfiler: The profiler, disabled unless profiling was requested
+        """
+        return self.__profiler
+    
+    def get_diagnostics(self) -> ParseDiagnostics:
+        """Gets the diagnostics counting the malformed sections
+
+        Returns:
+            ParseDiagnostics: The diagnostics
+        """
+        return self.__diagnostics
+    
+    def get_logger(self) -> logging:
+        """Gets the logger
+
+        Returns:
+            logging: Used to log
+        """
+        return self.__logger
@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from my_module.models.ExtendedStates.ExtendedStatesCollection import ExtendedStatesCollection
+
+
+class ExtendedStatesParserInterface(ABC):
+    @abstractmethod
+    def tokenize(self, file_contents: str) -> list:
+        """
+        Splits the file into sections only relevant to their package
+        """
+        pass
+    
+    @abstractmethod
+    def parse(self, package_data: list) -> ExtendedStatesCollection:
+        """
+        Parses the sections for whether each package was installed automatically
+        """
+        pass
+    
+    def parse_extended_states(self, extended_states: str) -> ExtendedStatesCollection:
+        """
+        Reads and parses the extended_states file at the path given.
+        A missing file means apt has not installed anything automatically so an empty collection is returned.
+        """
+        try:
+            with open( extended_states, "r" ) as extended_states_file:
+                return self.parse( self.tokenize( extended_states_file.read() ) )
+        except FileNotFoundError:
+            return ExtendedStatesCollection()
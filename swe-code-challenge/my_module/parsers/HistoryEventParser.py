@@ -0,0 +1,114 @@
+import re
+import sys
+from .HistoryFileParser import HistoryFileParser
+from my_module.models.HistoryFile.HistoryEvent import HistoryEvent
+from typing import Iterable, Iterator
+
+
+class HistoryEventParser(HistoryFileParser):
+    """Parses the history logs into the events of each transaction (Install, Remove, Purge, Upgrade, ...)
+    rather than only the packages named by install commands, so the history can be replayed.
+    """
+    # Matches each package of an action line (Ex: libc6:amd64 (2.36-9, automatic) or vim:amd64 (2:9.0.1378-2, 2:9.0.1378-3))
+    PACKAGE_EVENT_REGEX = re.compile( r"([^\s,:()]+)(?::([^\s,()]+))? \(([^)]*)\)" )
+    # Characters that can follow a package name on the command line (Ex: vim:amd64, vim=2:9.0, vim/bookworm)
+    COMMAND_LINE_PACKAGE_SUFFIX_REGEX = re.compile( r"[:=/].*$" )
+
+    def iter_events(self, history_log: str) -> Iterator[HistoryEvent]:
+        """Streams the events of the history log and all of its rotated logs in the order they happened
+
+        Args:
+            history_log (str): The path to the current history log
+
+        Yields:
+            Iterator[HistoryEvent]: An event for each package changed by each transaction
+        """
+        history_file_tokens = self.get_profiler().iterate( "history_tokenize", self.iter_history_log_tokens( history_log ) )
+
+        yield from self.get_profiler().iterate( "history_events", self.iter_token_events( history_file_tokens ) )
+
+    def iter_token_events(self, command_data: Iterable[str]) -> Iterator[HistoryEvent]:
+        """Parses the events out of each section of the history file
+
+        Args:
+            command_data (Iterable[str]): The sections of the history file
+
+        Yields:
+            Iterator[HistoryEvent]: An event for each package changed by each transaction
+        """
+        for section in command_data:
+            yield from self.parse_section_events( section )
+
+    def parse_section_events(self, section_contents: str) -> list[HistoryEvent]:
+        """Parses the events of a single transaction.  The packages named by an install command are
+        added as Requested events after the transaction's other events.
+
+        Args:
+            section_contents (str): A string of the current section as a whole
+
+        Returns:
+            list[HistoryEvent]: The transaction's events in the order they were logged
+        """
+        date = None
+        requested_by = "undetermined"
+        requested_packages = []
+        action_lines = []
+
+        for line in section_contents.split( "\n" ):
+            field, _, value = line.partition( ": " )
+
+            if field == "Start-Date":
+                date = self.parse_line_for_datetime( line )
+            elif field == "Requested-By":
+                # Takes the user's name, the id follows it in brackets
+                requested_by = sys.intern( value.split( " ", 1 )[0] ) or requested_by
+            elif field == "Commandline":
+                requested_packages = self.parse_command_line_packages( value )
+            elif field in HistoryEvent.ACTIONS:
+                action_lines.append( ( field, value ) )
+
+        events = []
+
+        for action, value in action_lines:
+            for match in self.PACKAGE_EVENT_REGEX.finditer( value ):
+                details = match.group( 3 ).split( ", " )
+                events.append( HistoryEvent(
+                    action,
+                    match.group( 1 ),
+                    match.group( 2 ),
+                    # Upgrades and downgrades list the old version then the new one
+                    details[1] if action in ( HistoryEvent.UPGRADE, HistoryEvent.DOWNGRADE ) and len( details ) > 1 and details[1] != "automatic" else details[0],
+                    "automatic" in details,
+                    date,
+                    requested_by
+                ) )
+
+        for package in requested_packages:
+            events.append( HistoryEvent( HistoryEvent.REQUESTED, package, date=date, requested_by=requested_by ) )
+
+        return events
+
+    def parse_command_line_packages(self, command_line: str) -> list[str]:
+        """Pulls the packages named by an install command, an empty list if the command does not install
+
+        Args:
+            command_line (str): The value of the Commandline line (Ex: apt-get install -y vim curl)
+
+        Returns:
+            list[str]: The names of the packages without any architecture, version or release
+        """
+        command_items = command_line.split()
+
+        if "install" not in command_items:
+            return []
+
+        packages = []
+
+        for command in command_items[command_items.index( "install" ) + 1:]:
+            # Skips options (Ex: -y, --reinstall) and packages being removed in the same command (Ex: vim-)
+            if command.startswith( "-" ) or command.endswith( "-" ):
+                continue
+
+            packages.append( self.COMMAND_LINE_PACKAGE_SUFFIX_REGEX.sub( "", command ) )
+
+        return packages
@@ -1,21 +1,49 @@
+import os
 import re
+import gzip
 import logging
 from .HistoryFileParserInterface import HistoryFileParserInterface
+from .Deb822StanzaReader import Deb822StanzaReader
 from my_module.models.HistoryFile.HistoryFileSection import HistoryFileSection
 from my_module.models.HistoryFile.HistoryFileSectionCollection import HistoryFileSectionCollection
+from my_module.profiling.StageProfiler import StageProfiler
+from my_module.profiling.ParseDiagnostics import ParseDiagnostics
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Iterator, Optional, TextIO
 
 
 class HistoryFileParser(HistoryFileParserInterface):
-    FILE_SECTION_REGEX = r"Start-Date: .*?End-Date: .*?(?=\nStart-Date:|\Z)"
+    # The states of a command's stanza in the history log
+    # A stanza is complete once its End-Date line has been written in full
+    STANZA_COMPLETE = "complete"
+    # A stanza followed by another command's Start-Date before its End-Date, apt was stopped part way through
+    STANZA_INTERRUPTED = "interrupted"
+    # The last stanza of the log without an End-Date, apt may still be running and writing it
+    STANZA_IN_PROGRESS = "in-progress"
+    # The categories of malformed or incomplete records counted by the diagnostics
+    INTERRUPTED_STANZA = "history_interrupted_stanza"
+    IN_PROGRESS_STANZA = "history_in_progress_stanza"
+    INVALID_DATE = "history_invalid_date"
+    MISSING_REQUESTED_BY = "history_missing_requested_by"
+    UNPARSABLE_LINE = "history_unparsable_line"
+    # The fields read from each section, the long Install, Upgrade and Remove lines are stepped over
+    FIELDS = ( "Start-Date", "Commandline", "Requested-By", "End-Date" )
     DATE_REGEX = r"\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}"
     
-    def __init__(self, logger: logging):
+    def __init__(self, logger: logging, profiler: Optional[StageProfiler] = None, diagnostics: Optional[ParseDiagnostics] = None):
         self.__logger = logger
         
+        # Records the time spent tokenizing and parsing, a disabled profiler is used when none is provided
+        self.__profiler = profiler or StageProfiler()
+        
+        # Counts the malformed lines and incomplete sections so they are reported once rather than logged one by one
+        self.__diagnostics = diagnostics or ParseDiagnostics()
+        
+        # Reads only the fields of each section that are used
+        self.__stanza_reader = Deb822StanzaReader( self.FIELDS )
+        
     def tokenize(self, file_contents: str) -> list:
-        """Uses a regex to break out sections of the history.log file for each command
+        """Breaks out sections of the history.log file for each command in a single pass over its lines
 
         Args:
             file_contents (str): The contents of the history.log file
@@ -23,14 +51,144 @@ class HistoryFileParser(HistoryFileParserInterface):
         Returns:
             list: A list of segments of text specific to each command ran 
         """
-        regex_pattern = re.compile( self.FILE_SECTION_REGEX, re.DOTALL )
-        return re.findall( regex_pattern, file_contents )
+        return list( self.iter_tokens( file_contents.splitlines( keepends=True ) ) )
+    
+    def iter_stanzas(self, history_file: Iterable[str]) -> Iterator[tuple[str, str]]:
+        """Splits the history file into each command's stanza looking at each line once.
+        Only the current stanza is held in memory and nothing is ever read back, so a log apt is
+        appending to can be read while it is written.
+
+        Args:
+            history_file (Iterable[str]): An open history file or any other iterable of its lines, each ending with its newline
+
+        Yields:
+            Iterator[tuple[str, str]]: The text of each stanza along with its state, STANZA_COMPLETE, STANZA_INTERRUPTED or STANZA_IN_PROGRESS
+        """
+        section_lines = None
+        
+        for line in history_file:
+            if line.startswith( "Start-Date:" ):
+                if section_lines is not None:
+                    # A new command started before the previous one wrote its End-Date so nothing more will be written to it
+                    yield "".join( section_lines ), self.STANZA_INTERRUPTED
+                    
+                section_lines = [line]
+            elif section_lines is not None:
+                section_lines.append( line )
+                
+                # An End-Date line without its newline may still be being written
+                if line.startswith( "End-Date:" ) and line.endswith( "\n" ):
+                    yield "".join( section_lines ), self.STANZA_COMPLETE
+                    section_lines = None
+                    
+        if section_lines is not None:
+            yield "".join( section_lines ), self.STANZA_IN_PROGRESS
+    
+    def iter_tokens(self, history_file: Iterable[str], include_in_progress: bool = True) -> Iterator[str]:
+        """Reads the history file line by line and yields each command's section as soon as 
+        its End-Date line has been read.  Only the current section is held in memory.
+        Sections of commands that were interrupted and the last section apt may still be writing
+        are yielded too, their sections are parsed without an end date (HistoryFileSection.is_complete)
+        and both are counted by the diagnostics.
+
+        Args:
+            history_file (Iterable[str]): An open history file or any other iterable of its lines
+            include_in_progress (bool): Whether a last section without an End-Date is yielded, callers that
+            will read the section again once it is complete (Ex: the history cache) leave it out
+
+        Yields:
+            Iterator[str]: The segment of text specific to each command ran
+        """
+        for section, state in self.iter_stanzas( history_file ):
+            if state == self.STANZA_INTERRUPTED:
+                self.get_diagnostics().record( self.INTERRUPTED_STANZA, section.split( "\n", 1 )[0] )
+            elif state == self.STANZA_IN_PROGRESS:
+                # The command is still running or the log was truncated
+                self.get_diagnostics().record( self.IN_PROGRESS_STANZA, section.split( "\n", 1 )[0] )
+                
+                if not include_in_progress:
+                    continue
+                
+            yield section
+    
+    def find_history_logs(self, history_log: str) -> list[str]:
+        """Finds the history log and the logs rotated from it (history.log.1, history.log.2.gz, ...)
+
+        Args:
+            history_log (str): The path to the current history log
+
+        Returns:
+            list[str]: The paths of the logs in chronological order, the oldest rotated log first 
+            and the current log last
+        """
+        directory = os.path.dirname( history_log ) or "."
+        rotated_log_regex = re.compile( re.escape( os.path.basename( history_log ) ) + r"\.(\d+)(?:\.gz)?$" )
+        rotated_logs = []
+        
+        for file_name in os.listdir( directory ):
+            match = rotated_log_regex.match( file_name )
+            
+            if match:
+                rotated_logs.append( ( int( match.group( 1 ) ), os.path.join( directory, file_name ) ) )
+        
+        # Logrotate gives older logs higher numbers so they are read from the highest number down
+        history_logs = [path for _, path in sorted( rotated_logs, reverse=True )]
+        
+        if os.path.exists( history_log ):
+            history_logs.append( history_log )
+            
+        return history_logs
     
-    def parse(self, command_data: list) -> HistoryFileSectionCollection:
+    def open_history_log(self, path: str) -> TextIO:
+        """Opens a history log for reading, decompressing it as it is read if it was gzipped by logrotate
+
+        Args:
+            path (str): The path to the history log
+
+        Returns:
+            TextIO: The opened history log
+        """
+        if path.endswith( ".gz" ):
+            return gzip.open( path, "rt" )
+        
+        return open( path, "r" )
+    
+    def iter_history_log_tokens(self, history_log: str) -> Iterator[str]:
+        """Streams the sections of the history log and all of its rotated logs in chronological order
+
+        Args:
+            history_log (str): The path to the current history log
+
+        Yields:
+            Iterator[str]: The segment of text specific to each command ran
+        """
+        for path in self.find_history_logs( history_log ):
+            with self.open_history_log( path ) as history_file:
+                yield from self.iter_tokens( history_file )
+    
+    def parse_history_logs(self, history_log: str) -> HistoryFileSectionCollection:
+        """Parses the history log and all of its rotated logs into a single collection.
+        Compressed logs are decompressed incrementally so only one section is held in memory at a time.
+
+        Args:
+            history_log (str): The path to the current history log
+
+        Returns:
+            HistoryFileSectionCollection: A collection of objects storing the data for packages installed
+        """
+        history_file_tokens = self.get_profiler().iterate( "history_tokenize", self.iter_history_log_tokens( history_log ) )
+        
+        with self.get_profiler().stage( "history_parse" ) as stage:
+            history_file_section_collection = self.parse( history_file_tokens )
+            stage.count += len( history_file_section_collection.get_history_file_section_collection() )
+            
+        return history_file_section_collection
+    
+    def parse(self, command_data: Iterable[str]) -> HistoryFileSectionCollection:
         """Parses the history file
 
         Args:
-            command_data (list): A list of sections based on installs start times and end times
+            command_data (Iterable[str]): A list of sections based on installs start times and end times
 
         Returns:
             HistoryFileSectionCollection: A collection of objects storing the data for packages installed
@@ -62,38 +220,46 @@ class HistoryFileParser(HistoryFileParserInterface):
         # Creates a new instance of HistoryFileSection to store the relevant data for that section
         history_file_data = HistoryFileSection()
         
-        # Iterates through the lines in the section to pull specific data and stores it in HistoryFileSection
-        for line in section_contents.split( "\n" ):
+        # Iterates through the relevant fields of the section to pull specific data and stores it in HistoryFileSection
+        for field, value in self.__stanza_reader.read_fields( section_contents ).items():
+            line = f"{field}: {value}"
+            
             try:
-                if line.startswith( "Start-Date:" ):
+                if field == "Start-Date":
                     # Pulls the start date and converts it to a datetime
-                    start_date_value = self.__parse_line_for_datetime( line )
+                    start_date_value = self.parse_line_for_datetime( line )
                     
                     # If the data present could not convert to a datetime returns null and doesn't store a start date
                     if start_date_value:
                         history_file_data.start_date = start_date_value 
-                
-                if line.startswith( "Commandline:" ):
-                    # Pulls the list of commands
-                    history_file_data.packages = self.__parse_for_command_line_arguments( line ) 
-                
-                if line.startswith( "Requested-By:" ):
+                    else:
+                        self.get_diagnostics().record( self.INVALID_DATE, line )
+                elif field == "Commandline":
+                    # Pulls the list of commands, commands that do not install leave the packages empty
+                    packages = self.__parse_for_command_line_arguments( line )
+                    
+                    if packages:
+                        history_file_data.packages = packages
+                elif field == "Requested-By":
                     # Pulls the requested by user
                     requested_by = self.__parser_for_requested_by( line )
                     
                     if requested_by:
                         history_file_data.requested_by = requested_by
-                
-                if line.startswith( "End-Date:" ):
+                    else:
+                        self.get_diagnostics().record( self.MISSING_REQUESTED_BY, line )
+                elif field == "End-Date":
                     # Pulls the end date and converts it to a datetime
-                    end_date_value =  self.__parse_line_for_datetime( line )
+                    end_date_value =  self.parse_line_for_datetime( line )
                     
                     # If the data present could not convert to a datetime returns null and doesn't store a end date
                     if end_date_value:
                         history_file_data.end_date = end_date_value
+                    else:
+                        self.get_diagnostics().record( self.INVALID_DATE, line )
             except Exception as e:
-                self.get_logger().warning(f"line skipped:\n{line}\nAn error occurred:\n{e.with_traceback(e.__traceback__)}")
-                # If the line does not have functional data to store it continues to the next line
+                # Only unexpected lines get here, they are counted and the line is skipped
+                self.get_diagnostics().record( self.UNPARSABLE_LINE, f"{line} ({type( e ).__name__}: {e})" )
                 continue
             
         # If there were packages installed in this section then return it
@@ -103,16 +269,26 @@ class HistoryFileParser(HistoryFileParserInterface):
         # If no packages were installed in this section return None
         return None
                 
-    def __parse_line_for_datetime(self, line) -> Optional[datetime]:
+    def parse_line_for_datetime(self, line) -> Optional[datetime]:
         """Parses the line for the date in string form and converts it to a datetime
 
         Args:
             line (str): The line for either the start date or end date of the section
 
         Returns:
-            Optional[datetime]: Either the datetime of the string pulled from the regex or None since
+            Optional[datetime]: Either the datetime of the string pulled from the line or None since
             a datetime could not be created
         """
+        # Fast path for the layout apt writes (Ex: Start-Date: 2024-01-31  09:15:00) which avoids the regex and strptime
+        date_parts = line.partition( ":" )[2].split()
+        
+        if len( date_parts ) == 2:
+            try:
+                return datetime.fromisoformat( f"{date_parts[0]} {date_parts[1]}" )
+            except ValueError:
+                # Falls back to searching the line for the date
+                pass
+        
         datetime_string = re.search( self.DATE_REGEX, line )
         
         if datetime_string:
@@ -137,6 +313,11 @@ class HistoryFileParser(HistoryFileParserInterface):
             list: A list of packages installed.  If not packages were installed it returns an empty list.
         """
         packages = []
+        
+        # Commands that do not install (Ex: apt-get upgrade, apt-get remove) have no packages
+        if " install " not in line:
+            return packages
+        
         # Pulls only values after the install command
         command_items = line.split( " install ", 1 )[1].strip().split( " " )
         
@@ -155,13 +336,32 @@ class HistoryFileParser(HistoryFileParserInterface):
             line (str): The line starting with Requested-By
 
         Returns:
-            str: The user who requested the install of the package
+            str: The user who requested the install of the package, empty if the line does not name one
         """
         requested_by_items = line.strip().split( " " )
         
+        if len( requested_by_items ) < 2:
+            return ""
+        
         # Takes the second value in the list since thats where the user's name is located
         return requested_by_items[1]
     
+    def get_profiler(self) -> StageProfiler:
+        """Gets the profiler recording the parser's stages
+
+        Returns:
+            StageProfiler: The profiler, disabled unless profiling was requested
+        """
+        return self.__profiler
+    
+    def get_diagnostics(self) -> ParseDiagnostics:
+        """Gets the diagnostics counting the malformed lines and incomplete sections
+
+        Returns:
+            ParseDiagnostics: The diagnostics
+        """
+        return self.__diagnostics
+    
     def get_logger(self) -> logging:
         """Gets the logger
 
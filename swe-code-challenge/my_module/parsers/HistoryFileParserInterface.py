@@ -16,4 +16,11 @@ class HistoryFileParserInterface(ABC):
         Parses the lines in the section to see if it includes any installed packages
         """
         pass
-    
\ No newline at end of file
+    
+    def parse_history_logs(self, history_log: str) -> HistoryFileSectionCollection:
+        """
+        Reads and parses the history log at the path given.
+        Parsers that can read rotated logs or stream the file should override this.
+        """
+        with open( history_log, "r" ) as history_file:
+            return self.parse( self.tokenize( history_file.read() ) )
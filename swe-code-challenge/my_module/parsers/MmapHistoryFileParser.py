@@ -0,0 +1,91 @@
+import re
+import mmap
+import logging
+from .HistoryFileParser import HistoryFileParser
+from my_module.profiling.StageProfiler import StageProfiler
+from my_module.profiling.ParseDiagnostics import ParseDiagnostics
+from typing import Iterator, Optional, Union
+
+
+class MmapHistoryFileParser(HistoryFileParser):
+    """A history file parser that memory maps uncompressed logs and scans them as bytes.
+    Only the lines of the fields that are kept are decoded, the long Install, Upgrade and Remove
+    lines are never copied.  Rotated logs that were gzipped are streamed the same way as HistoryFileParser.
+    """
+    FIELDS = ( "Start-Date", "Commandline", "Requested-By", "End-Date" )
+
+    def __init__(self, logger: logging, profiler: Optional[StageProfiler] = None, diagnostics: Optional[ParseDiagnostics] = None):
+        super().__init__( logger, profiler, diagnostics )
+        self.__field_line_regex = re.compile(
+            rb"^(" + b"|".join( re.escape( field.encode() ) for field in self.FIELDS ) + rb"):[ \t]*(.*?)[ \t\r]*$",
+            re.MULTILINE
+        )
+
+    def tokenize(self, file_contents: Union[str, bytes]) -> list:
+        """Breaks out sections of the history.log file for each command keeping only the lines of the kept fields
+
+        Args:
+            file_contents (Union[str, bytes]): The contents of the history.log file
+
+        Returns:
+            list: A list of segments of text specific to each command ran
+        """
+        if isinstance( file_contents, str ):
+            file_contents = file_contents.encode( "utf-8" )
+
+        return list( self.iter_buffer_tokens( file_contents ) )
+
+    def iter_history_log_tokens(self, history_log: str) -> Iterator[str]:
+        """Streams the sections of the history log and all of its rotated logs in chronological order,
+        memory mapping the logs that are not compressed
+
+        Args:
+            history_log (str): The path to the current history log
+
+        Yields:
+            Iterator[str]: The segment of text specific to each command ran
+        """
+        for path in self.find_history_logs( history_log ):
+            if path.endswith( ".gz" ):
+                with self.open_history_log( path ) as history_file:
+                    yield from self.iter_tokens( history_file )
+
+                continue
+
+            with open( path, "rb" ) as history_file:
+                # An empty file cannot be memory mapped and has no sections
+                if not history_file.seek( 0, 2 ):
+                    continue
+
+                with mmap.mmap( history_file.fileno(), 0, access=mmap.ACCESS_READ ) as buffer:
+                    yield from self.iter_buffer_tokens( buffer )
+
+    def iter_buffer_tokens(self, buffer: Union[bytes, mmap.mmap]) -> Iterator[str]:
+        """Scans the buffer for the kept fields and groups them by command the same way iter_tokens does
+
+        Args:
+            buffer (Union[bytes, mmap.mmap]): The contents of the history.log file
+
+        Yields:
+            Iterator[str]: The kept lines of each command's section
+        """
+        yield from self.iter_tokens( self.iter_buffer_lines( buffer ) )
+
+    def iter_buffer_lines(self, buffer: Union[bytes, mmap.mmap]) -> Iterator[str]:
+        """Scans the buffer for the lines of the kept fields, decoding only those lines
+
+        Args:
+            buffer (Union[bytes, mmap.mmap]): The contents of the history.log file
+
+        Yields:
+            Iterator[str]: Each kept line, ending with a newline unless it is the unfinished last line of the buffer
+        """
+        buffer_length = len( buffer )
+
+        with memoryview( buffer ) as view:
+            for match in self.__field_line_regex.finditer( buffer ):
+                field = str( view[match.start( 1 ):match.end( 1 )], "utf-8" )
+                # The last line may still be being written when there is no newline after it
+                newline = "\n" if match.end() < buffer_length else ""
+
+                yield f"{field}: {str( view[match.start( 2 ):match.end( 2 )], 'utf-8', 'replace' )}{newline}"
@@ -0,0 +1,111 @@
+import re
+import mmap
+import logging
+from .StatusFileParser import StatusFileParser
+from my_module.models.StatusFile.StatusFileSection import StatusFileSection
+from my_module.profiling.StageProfiler import StageProfiler
+from my_module.profiling.ParseDiagnostics import ParseDiagnostics
+from typing import Iterable, Iterator, Optional, TextIO, Union
+
+
+class MmapStatusFileParser(StatusFileParser):
+    """A status file parser that memory maps the file and scans it as bytes.
+    Stanza boundaries are found without decoding the file and only the lines of the fields
+    that are kept are decoded, the rest of each stanza (descriptions, conffiles, ...) is never copied.
+    """
+    # The dependency fields are kept in the raw section for the dependency graph when no projection is given
+    FIELDS = ( "Package", "Status", "Section", "Version", "Installed-Size", "Pre-Depends", "Depends", "Recommends", "Provides" )
+
+    def __init__(self, logger: logging, workers: int = 1, profiler: Optional[StageProfiler] = None, diagnostics: Optional[ParseDiagnostics] = None, fields: Optional[Iterable[str]] = None):
+        super().__init__( logger, workers, profiler, diagnostics, fields )
+        # Only the lines of the projected fields are decoded and kept in the raw section
+        self.__field_line_regex = re.compile(
+            rb"^(" + b"|".join( re.escape( field.encode() ) for field in self.get_fields() ) + rb"):[ \t]*(.*?)[ \t\r]*$",
+            re.MULTILINE
+        )
+
+    def tokenize(self, file_contents: Union[str, bytes]) -> list:
+        """Breaks out sections of the status file for each package keeping only the lines of the kept fields
+
+        Args:
+            file_contents (Union[str, bytes]): The contents of the status file
+
+        Returns:
+            list: A list of segments of text specific to each package
+        """
+        if isinstance( file_contents, str ):
+            file_contents = file_contents.encode( "utf-8" )
+
+        return list( self.iter_buffer_tokens( file_contents ) )
+
+    def iter_parse(self, status_file: TextIO) -> Iterator[StatusFileSection]:
+        """Memory maps the open status file and yields each package's data as its section is scanned
+
+        Args:
+            status_file (TextIO): An open status file
+
+        Yields:
+            Iterator[StatusFileSection]: An object for each package in the status file
+        """
+        # Large status files are split across worker processes as text when more than one worker was requested
+        if self.should_parse_in_parallel( status_file ):
+            yield from super().iter_parse( status_file )
+            return
+        
+        # An empty file cannot be memory mapped and has no sections
+        if not status_file.seek( 0, 2 ):
+            return
+
+        with mmap.mmap( status_file.fileno(), 0, access=mmap.ACCESS_READ ) as buffer:
+            status_file_tokens = self.get_profiler().iterate( "status_tokenize", self.iter_buffer_tokens( buffer ) )
+            yield from self.get_profiler().iterate( "status_parse", self.iter_parse_tokens( status_file_tokens ) )
+
+    def iter_fingerprints(self, status_file: TextIO) -> Iterator[tuple[bytes, str]]:
+        """Memory maps the open status file and yields the fingerprint of the kept lines of each section,
+        the same text the sections of a snapshot taken by this parser hold
+
+        Args:
+            status_file (TextIO): An open status file
+
+        Yields:
+            Iterator[tuple[bytes, str]]: The fingerprint and the kept lines of each package's section
+        """
+        # An empty file cannot be memory mapped and has no sections
+        if not status_file.seek( 0, 2 ):
+            return
+
+        with mmap.mmap( status_file.fileno(), 0, access=mmap.ACCESS_READ ) as buffer:
+            for section in self.get_profiler().iterate( "status_fingerprint", self.iter_buffer_tokens( buffer ) ):
+                yield self.fingerprint( section ), section
+
+    def iter_buffer_tokens(self, buffer: Union[bytes, mmap.mmap]) -> Iterator[str]:
+        """Scans the buffer for the blank lines between sections and decodes only the kept fields of each section
+
+        Args:
+            buffer (Union[bytes, mmap.mmap]): The contents of the status file
+
+        Yields:
+            Iterator[str]: The kept lines of each package's section
+        """
+        length = len( buffer )
+        position = 0
+
+        with memoryview( buffer ) as view:
+            while position < length:
+                # Skips the blank lines between sections
+                if buffer[position] == 0x0A:
+                    position += 1
+                    continue
+
+                section_end = buffer.find( b"\n\n", position )
+                section_end = length if section_end == -1 else section_end + 1
+
+                section_lines = [
+                    f"{str( view[match.start( 1 ):match.end( 1 )], 'utf-8' )}: {str( view[match.start( 2 ):match.end( 2 )], 'utf-8', 'replace' )}\n"
+                    for match in self.__field_line_regex.finditer( buffer, position, section_end )
+                ]
+
+                if section_lines:
+                    yield "".join( section_lines )
+
+                position = section_end
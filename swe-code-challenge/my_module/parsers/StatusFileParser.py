@@ -1,20 +1,47 @@
-import re
+import io
+import os
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from .StatusFileParserInterface import StatusFileParserInterface
+from .Deb822StanzaReader import Deb822StanzaReader
 from my_module.models.StatusFile.StatusFileSection import StatusFileSection
 from my_module.models.StatusFile.StatusFileSectionCollection import StatusFileSectionCollection
-from typing import Optional
+from my_module.profiling.StageProfiler import StageProfiler
+from my_module.profiling.ParseDiagnostics import ParseDiagnostics
+from typing import Iterable, Iterator, Optional, TextIO
 
 
 class StatusFileParser(StatusFileParserInterface):
-    FILE_SECTION_REGEX = r"^Package: .*(?:\n(?!Package: ).*)*"
-    DESCRIPTION_REGEX = r"^Description: (.+)(?:\n(?!\S).*.+)*"
+    # Status files smaller than this are parsed serially since starting the worker processes would cost more than it saves
+    PARALLEL_MINIMUM_SIZE = 8 * 1024 * 1024
+    # The number of chunks given to each worker so a slow chunk does not leave the other workers idle
+    CHUNKS_PER_WORKER = 4
+    # The fields read from each section when no projection is given
+    FIELDS = ( "Package", "Status", "Section", "Version", "Installed-Size" )
+    # The fields stored in the section's own attributes, any other field of the projection is kept as a decoded field
+    FIELD_ATTRIBUTES = { "Package": "package", "Status": "status", "Section": "section", "Version": "version", "Installed-Size": "installed_size" }
+    # The categories of malformed records counted by the diagnostics
+    MISSING_PACKAGE = "status_missing_package"
+    UNPARSABLE_LINE = "status_unparsable_line"
     
-    def __init__(self, logger: logging):
+    def __init__(self, logger: logging, workers: int = 1, profiler: Optional[StageProfiler] = None, diagnostics: Optional[ParseDiagnostics] = None, fields: Optional[Iterable[str]] = None):
         self.__logger = logger
+        
+        # Reads only the fields asked for (Ex: Package, Version and Installed-Size), the package is always read
+        self.__stanza_reader = Deb822StanzaReader( ( "Package", *( fields or self.FIELDS ) ) )
+        
+        # Records the time spent tokenizing and parsing, a disabled profiler is used when none is provided
+        self.__profiler = profiler or StageProfiler()
+        
+        # Counts the malformed sections so they are reported once rather than logged one by one
+        self.__diagnostics = diagnostics or ParseDiagnostics()
+        
+        # The number of processes used to parse large status files, 1 parses serially and 0 uses every CPU
+        self.__workers = workers if workers > 0 else ( os.cpu_count() or 1 )
     
     def tokenize(self, file_contents: str) -> list:
-        """Uses a regex to break out sections of the status file for each package
+        """Breaks out sections of the status file for each package
 
         Args:
             file_contents (str): The contents of the status file
@@ -22,26 +49,148 @@ class StatusFileParser(StatusFileParserInterface):
         Returns:
             list: A list of segments of text specific to each package
         """
-        return re.findall( self.FILE_SECTION_REGEX, file_contents, flags=re.MULTILINE )
+        return list( self.iter_tokens( io.StringIO( file_contents ) ) )
+    
+    def iter_tokens(self, status_file: Iterable[str]) -> Iterator[str]:
+        """Reads the status file line by line and yields each package's section as soon as 
+        the blank line ending it has been read.  Only the current section is held in memory.
+
+        Args:
+            status_file (Iterable[str]): An open status file or any other iterable of its lines
+
+        Yields:
+            Iterator[str]: The segment of text specific to each package
+        """
+        yield from self.get_stanza_reader().iter_stanzas( status_file )
+    
+    def iter_fingerprints(self, status_file: TextIO) -> Iterator[tuple[bytes, str]]:
+        """Yields each section along with its fingerprint without parsing it, so two versions of the status file
+        can be compared and only the sections that differ parsed
+
+        Args:
+            status_file (TextIO): An open status file
+
+        Yields:
+            Iterator[tuple[bytes, str]]: The fingerprint and the segment of text of each package
+        """
+        for section in self.get_profiler().iterate( "status_fingerprint", self.iter_tokens( status_file ) ):
+            yield self.fingerprint( section ), section
     
-    def parse(self, package_data: list) -> StatusFileSectionCollection:
+    def parse(self, package_data: Iterable[str]) -> StatusFileSectionCollection:
         """Parses the status file
 
         Args:
-            package_data (list): A list of sections based on the installed packages
+            package_data (Iterable[str]): A list of sections based on the installed packages
 
         Returns:
             StatusFileParserInterface: A collection of objects storing the data for packages installed
         """
-        status_file_section_collection = StatusFileSectionCollection()
+        status_file_section_collection = StatusFileSectionCollection.from_fields( self.get_fields() )
         
+        for status_file_section in self.iter_parse_tokens( package_data ):
+            status_file_section_collection.append( status_file_section )
+                
+        return status_file_section_collection
+    
+    def iter_parse(self, status_file: TextIO) -> Iterator[StatusFileSection]:
+        """Streams the status file and yields each package's data as soon as its section is complete.
+        Large status files are instead parsed in parallel when more than one worker was requested.
+
+        Args:
+            status_file (TextIO): An open status file
+
+        Yields:
+            Iterator[StatusFileSection]: An object for each package in the status file
+        """
+        if self.should_parse_in_parallel( status_file ):
+            with self.get_profiler().stage( "status_parse_parallel" ) as stage:
+                status_file_section_collection = self.parse_parallel( status_file.read() )
+                stage.count = len( status_file_section_collection )
+                
+            return iter( status_file_section_collection.get_status_file_section_collection() )
+        
+        status_file_tokens = self.get_profiler().iterate( "status_tokenize", self.iter_tokens( status_file ) )
+        
+        return self.get_profiler().iterate( "status_parse", self.iter_parse_tokens( status_file_tokens ) )
+    
+    def should_parse_in_parallel(self, status_file: TextIO) -> bool:
+        """Checks whether the status file is large enough for parallel parsing to pay off
+
+        Args:
+            status_file (TextIO): An open status file
+
+        Returns:
+            bool: True if more than one worker was requested and the file is at least PARALLEL_MINIMUM_SIZE
+        """
+        if self.get_workers() <= 1:
+            return False
+        
+        return os.fstat( status_file.fileno() ).st_size >= self.PARALLEL_MINIMUM_SIZE
+    
+    def parse_parallel(self, file_contents: str) -> StatusFileSectionCollection:
+        """Splits the status file into chunks on the blank lines between sections, parses the chunks 
+        in a process pool and merges them into a single collection in their original order
+
+        Args:
+            file_contents (str): The contents of the status file
+
+        Returns:
+            StatusFileSectionCollection: A collection of objects storing the data for packages installed
+        """
+        if self.get_workers() <= 1 or len( file_contents ) < self.PARALLEL_MINIMUM_SIZE:
+            return self.parse( self.tokenize( file_contents ) )
+        
+        chunks = self.split_into_chunks( file_contents, self.get_workers() * self.CHUNKS_PER_WORKER )
+        status_file_section_collection = StatusFileSectionCollection.from_fields( self.get_fields() )
+        
+        with ProcessPoolExecutor( max_workers=self.get_workers() ) as executor:
+            # Map keeps the results in the order of the chunks
+            for rows, diagnostics in executor.map( _parse_status_file_chunk, repeat( type( self ) ), repeat( self.get_fields() ), chunks ):
+                for row in rows:
+                    status_file_section_collection.append_values( *row )
+                    
+                self.get_diagnostics().merge( diagnostics )
+                    
+        return status_file_section_collection
+    
+    def split_into_chunks(self, file_contents: str, chunk_count: int) -> list[str]:
+        """Splits the status file into roughly equal chunks that each end on a blank line between sections
+
+        Args:
+            file_contents (str): The contents of the status file
+            chunk_count (int): The number of chunks wanted
+
+        Returns:
+            list[str]: The chunks in the order they appear in the status file
+        """
+        chunk_size = max( 1, len( file_contents ) // chunk_count )
+        chunks = []
+        chunk_start = 0
+        
+        while chunk_start < len( file_contents ):
+            # Moves the end of the chunk forward to the next blank line so no section is split
+            chunk_end = file_contents.find( "\n\n", chunk_start + chunk_size )
+            chunk_end = len( file_contents ) if chunk_end == -1 else chunk_end + 2
+            
+            chunks.append( file_contents[chunk_start:chunk_end] )
+            chunk_start = chunk_end
+            
+        return chunks
+    
+    def iter_parse_tokens(self, package_data: Iterable[str]) -> Iterator[StatusFileSection]:
+        """Parses each section as it is pulled from the iterable
+
+        Args:
+            package_data (Iterable[str]): Sections based on the installed packages
+
+        Yields:
+            Iterator[StatusFileSection]: An object for each section that provided a package name
+        """
         for section in package_data:
             status_file_section = self.__parse_section_lines( section )
             
             if status_file_section:
-                status_file_section_collection.append( status_file_section )
-                
-        return status_file_section_collection
+                yield status_file_section
                 
     def __parse_section_lines(self, section_contents: str) -> Optional[StatusFileSection]:
         """Iterates through each section line by line looking for relevant data and 
@@ -57,69 +206,68 @@ class StatusFileParser(StatusFileParserInterface):
         # Creates a new instance of StatusFileSection to store the relevant data for that section
         status_file_data = StatusFileSection()
         
-        # Pulls the section data first by regex since it will be ignored when iterating line by line
-        status_file_data.description = self.__parse_description_text( section_contents )
+        # Keeps the raw section so the description and other rarely used fields are only decoded if they are accessed
+        status_file_data.raw = section_contents
         
-        for line in section_contents.split( "\n" ):
+        # Only the fields of the projection are pulled out, the other lines are stepped over
+        for field, value in self.get_stanza_reader().read_fields( section_contents ).items():
             try:
-                if line.startswith("Package:"):
-                    status_file_data.package = self.__parse_line_for_parameter_value( line, "Package: " )
-                
-                if line.startswith("Section:"):
-                    status_file_data.section = self.__parse_line_for_parameter_value( line, "Section: " )
-                    
-                if line.startswith("Version:"):
-                    status_file_data.version = self.__parse_line_for_parameter_value( line, "Version: " )
-                    
-                if line.startswith("Installed-Size:"):
-                    status_file_data.installed_size = self.__parse_line_for_parameter_value( line, "Installed-Size: " )
+                if field in self.FIELD_ATTRIBUTES:
+                    setattr( status_file_data, self.FIELD_ATTRIBUTES[field], value )
+                else:
+                    # Extra fields asked for are stored as already decoded so get_field does not scan the section again
+                    status_file_data.set_field( field, value )
             except Exception as e:
-                self.get_logger().warning(f"line skipped:\n{line}\nAn error occurred:\n{e.with_traceback()}")
-                # If the line does not have functional data to store it continues to the next line
+                # Only unexpected values get here, they are counted and the field is skipped
+                self.get_diagnostics().record( self.UNPARSABLE_LINE, f"{field}: {value} ({type( e ).__name__}: {e})" )
                 continue
         
         if status_file_data.package:
             return status_file_data
         
+        self.get_diagnostics().record( self.MISSING_PACKAGE, section_contents )
+        
         return None
     
-    def __parse_description_text(self, section_contents: str) -> str:
-        """Pulls the description section out of the contents and formats it
+    def get_stanza_reader(self) -> Deb822StanzaReader:
+        """Gets the reader pulling the projected fields out of each section
 
-        Args:
-            section_contents (str): The section contents for a package
+        Returns:
+            Deb822StanzaReader: The stanza reader
+        """
+        return self.__stanza_reader
+    
+    def get_fields(self) -> tuple[str, ...]:
+        """Gets the fields read from each section
 
         Returns:
-            str: the description text formatted
+            tuple[str, ...]: The names of the fields of the projection, starting with Package
         """
-        description_text = ""
-        
-        description_text_raw = re.search( self.DESCRIPTION_REGEX, section_contents, re.MULTILINE )
-        
-        for line in description_text_raw[0].split( "\n" ):
-            if line.startswith(" ."):
-                description_text += "\n"
-            elif line.startswith("Description: "):
-                description_text += line.replace("Description: ", "")
-                description_text += "\n"
-            elif line.startswith("  *"):
-                description_text += f"{line}\n"
-            else:
-                description_text += f"{line} "
-        
-        return description_text
+        return self.get_stanza_reader().get_fields()
     
-    def __parse_line_for_parameter_value(self, line: str, parameter: str) -> str:
-        """Pulls the parameter specified's value out of the section
+    def get_profiler(self) -> StageProfiler:
+        """Gets the profiler recording the parser's stages
 
-        Args:
-            line (str): The line beginning with the parameter
-            parameter (str): The value the user wants from the line
+        Returns:
+            StageProfiler: The profiler, disabled unless profiling was requested
+        """
+        return self.__profiler
+    
+    def get_diagnostics(self) -> ParseDiagnostics:
+        """Gets the diagnostics counting the malformed sections
 
         Returns:
-            str: The parameter's value
+            ParseDiagnostics: The diagnostics
         """
-        return line.replace( parameter, "" )
+        return self.__diagnostics
+    
+    def get_workers(self) -> int:
+        """Gets the number of processes used to parse large status files
+
+        Returns:
+            int: The number of worker processes
+        """
+        return self.__workers
     
     def get_logger(self) -> logging:
         """Gets the logger
@@ -128,4 +276,25 @@ class StatusFileParser(StatusFileParserInterface):
             logging: Used to log
         """
         return self.__logger
-    
\ No newline at end of file
+
+
+def _parse_status_file_chunk(parser_class: type, fields: tuple, chunk: str) -> tuple[list[tuple], dict]:
+    """Parses a chunk of the status file in a worker process
+
+    Args:
+        parser_class (type): The class of the parser that split the status file
+        fields (tuple): The fields read from each section
+        chunk (str): A chunk of the status file made up of whole sections
+
+    Returns:
+        tuple[list[tuple], dict]: The package, section, version, installed size, raw section and status of each package,
+        plain tuples are sent back since they are much cheaper to pickle than objects, along with the chunk's diagnostics
+    """
+    parser = parser_class( logging.getLogger( __name__ ), fields=fields )
+    
+    rows = [
+        ( section.package, section.section, section.version, section.installed_size, section.raw, section.status )
+        for section in parser.iter_parse_tokens( parser.tokenize( chunk ) )
+    ]
+    
+    return rows, parser.get_diagnostics().to_dict()
@@ -1,8 +1,14 @@
+import hashlib
 from abc import ABC, abstractmethod
+from my_module.models.StatusFile.StatusFileSection import StatusFileSection
 from my_module.models.StatusFile.StatusFileSectionCollection import StatusFileSectionCollection
+from typing import Iterable, Iterator, Optional, TextIO
 
 
 class StatusFileParserInterface(ABC):
+    # The size in bytes of a section's fingerprint, large enough that two different sections never collide in practice
+    FINGERPRINT_SIZE = 16
+    
     @abstractmethod
     def tokenize(self, file_contents: str) -> list:
         """
@@ -15,4 +21,41 @@ class StatusFileParserInterface(ABC):
         """
         Parses the data in the section to see if it matches any installed packages
         """
-        pass
\ No newline at end of file
+        pass
+    
+    def iter_parse(self, status_file: TextIO) -> Iterator[StatusFileSection]:
+        """
+        Yields the parsed sections of an open status file.
+        Parsers that can stream the file should override this, by default the whole file is parsed first.
+        """
+        yield from self.parse( self.tokenize( status_file.read() ) ).get_status_file_section_collection()
+    
+    def iter_parse_tokens(self, package_data: Iterable[str]) -> Iterator[StatusFileSection]:
+        """
+        Yields the parsed sections of the tokens given (Ex: only the sections whose fingerprints changed).
+        Parsers that can parse a section at a time should override this, by default the tokens are parsed together.
+        """
+        yield from self.parse( list( package_data ) ).get_status_file_section_collection()
+    
+    def iter_fingerprints(self, status_file: TextIO) -> Iterator[tuple[bytes, str]]:
+        """
+        Yields the fingerprint of each section of an open status file along with the section, without parsing it.
+        Parsers that can stream the file should override this, by default the whole file is tokenized first.
+        """
+        for section in self.tokenize( status_file.read() ):
+            yield self.fingerprint( section ), section
+    
+    @classmethod
+    def fingerprint(cls, section_contents: str) -> bytes:
+        """
+        Hashes a section as the parser tokenized it, the hash is the same in every process so sections can be
+        compared with the sections of a snapshot or of another status file.
+        """
+        return hashlib.blake2b( section_contents.encode( "utf-8" ), digest_size=cls.FINGERPRINT_SIZE ).digest()
+    
+    def get_fields(self) -> Optional[tuple]:
+        """
+        Gets the fields read from each section, None if every field is read.
+        Parsers that only read some of the fields should override this.
+        """
+        return None
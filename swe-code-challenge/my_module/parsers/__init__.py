@@ -2,5 +2,10 @@ from .HistoryFileParser import HistoryFileParser
 from .HistoryFileParserInterface import HistoryFileParserInterface
 from .StatusFileParser import StatusFileParser
 from .StatusFileParserInterface import StatusFileParserInterface
+from .MmapHistoryFileParser import MmapHistoryFileParser
+from .MmapStatusFileParser import MmapStatusFileParser
+from .HistoryEventParser import HistoryEventParser
+from .ExtendedStatesParser import ExtendedStatesParser
+from .ExtendedStatesParserInterface import ExtendedStatesParserInterface
 
-__all__ = ["HistoryFileParser", "HistoryFileParserInterface", "StatusFileParser", "StatusFileParserInterface"]
\ No newline at end of file
+__all__ = ["HistoryFileParser", "HistoryFileParserInterface", "StatusFileParser", "StatusFileParserInterface", "MmapHistoryFileParser", "MmapStatusFileParser", "HistoryEventParser", "ExtendedStatesParser", "ExtendedStatesParserInterface"]
\ No newline at end of file
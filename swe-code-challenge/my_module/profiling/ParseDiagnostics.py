@@ -0,0 +1,123 @@
+import logging
+import threading
+from typing import Optional
+
+
+class ParseDiagnostics():
+    """Counts the malformed records found while parsing by category and keeps a bounded sample of each
+    so a run reports them in a single summary rather than a log line per record.
+
+    Recording is only done on the malformed path so the records that parse cleanly never touch it.
+    """
+    # The number of records kept for each category
+    SAMPLE_SIZE = 3
+    # Samples are cut to this many characters so a huge malformed section is not held in memory
+    SAMPLE_LENGTH = 200
+
+    def __init__(self, sample_size: int = SAMPLE_SIZE):
+        self.__sample_size = sample_size
+        self.__counts: dict[str, int] = {}
+        self.__samples: dict[str, list[str]] = {}
+        # The status file and history logs may be parsed in different threads
+        self.__lock = threading.Lock()
+
+    def record(self, category: str, sample: str = ""):
+        """Counts a malformed record and keeps it as a sample if fewer than sample_size of the category are kept
+
+        Args:
+            category (str): What was wrong with the record (Ex: status_missing_package)
+            sample (str): The record or the line that was malformed
+        """
+        with self.__lock:
+            self.__counts[category] = self.__counts.get( category, 0 ) + 1
+            samples = self.__samples.setdefault( category, [] )
+
+            if sample and len( samples ) < self.__sample_size:
+                samples.append( sample[:self.SAMPLE_LENGTH] )
+
+    def merge(self, diagnostics: dict):
+        """Adds the counts and samples recorded elsewhere (Ex: in a worker process)
+
+        Args:
+            diagnostics (dict): The counts and samples as returned by to_dict
+        """
+        with self.__lock:
+            for category, count in diagnostics.get( "counts", {} ).items():
+                self.__counts[category] = self.__counts.get( category, 0 ) + count
+
+            for category, samples in diagnostics.get( "samples", {} ).items():
+                kept = self.__samples.setdefault( category, [] )
+                kept.extend( samples[:self.__sample_size - len( kept )] )
+
+    def to_dict(self) -> dict:
+        """Converts the counts and samples to plain dictionaries that can be pickled or written as JSON
+
+        Returns:
+            dict: The count and the samples of each category
+        """
+        with self.__lock:
+            return { "counts": dict( self.__counts ), "samples": { category: list( samples ) for category, samples in self.__samples.items() } }
+
+    def get_count(self, category: Optional[str] = None) -> int:
+        """Gets the number of malformed records
+
+        Args:
+            category (Optional[str]): The category counted, every category if None
+
+        Returns:
+            int: The number of records recorded
+        """
+        if category is None:
+            return sum( self.__counts.values() )
+
+        return self.__counts.get( category, 0 )
+
+    def get_samples(self, category: str) -> list[str]:
+        """Gets the records kept for the category
+
+        Args:
+            category (str): The category
+
+        Returns:
+            list[str]: Up to sample_size of the records in the order they were recorded
+        """
+        return list( self.__samples.get( category, [] ) )
+
+    def clear(self):
+        """Forgets every count and sample (Ex: before the files are parsed again)"""
+        with self.__lock:
+            self.__counts.clear()
+            self.__samples.clear()
+
+    def log_summary(self, logger: logging, subject: Optional[str] = None):
+        """Writes a single warning with the count and samples of each category, nothing when no records were malformed
+
+        Args:
+            logger (logging): The logger the summary is written to
+            subject (Optional[str]): What was parsed, put at the start of the summary (Ex: a host's name)
+        """
+        summary = self.format_summary()
+
+        if summary:
+            logger.warning( f"{subject}: {summary}" if subject else summary )
+
+    def format_summary(self) -> str:
+        """Formats the count and samples of each category
+
+        Returns:
+            str: The summary, empty when no records were malformed
+        """
+        diagnostics = self.to_dict()
+
+        if not diagnostics["counts"]:
+            return ""
+
+        lines = [f"{sum( diagnostics['counts'].values() )} malformed or incomplete records found while parsing:"]
+
+        for category, count in sorted( diagnostics["counts"].items() ):
+            lines.append( f"  {category}: {count}" )
+
+            for sample in diagnostics["samples"].get( category, [] ):
+                lines.append( f"    {sample!r}" )
+
+        return "\n".join( lines )
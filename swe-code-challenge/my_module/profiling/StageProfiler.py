@@ -0,0 +1,229 @@
+import json
+import time
+import threading
+import tracemalloc
+from typing import Iterable, Iterator, Optional, TextIO
+
+
+class StageRecord():
+    __slots__ = ( "name", "wall_seconds", "cpu_seconds", "count", "calls", "peak_allocated_bytes", "_resumed_wall", "_resumed_cpu", "_resumed_memory" )
+
+    def __init__(self, name: str):
+        self.name = name
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.count = 0
+        self.calls = 0
+        self.peak_allocated_bytes = 0
+        self._resumed_wall = 0.0
+        self._resumed_cpu = 0.0
+        self._resumed_memory = 0
+
+    def to_dict(self) -> dict:
+        """Converts the record to a dictionary for the report
+
+        Returns:
+            dict: The stage's measurements
+        """
+        return {
+            "stage": self.name,
+            "wall_seconds": round( self.wall_seconds, 6 ),
+            "cpu_seconds": round( self.cpu_seconds, 6 ),
+            "count": self.count,
+            "calls": self.calls,
+            "peak_allocated_bytes": self.peak_allocated_bytes,
+        }
+
+
+class _NullStage():
+    """Returned for every stage when profiling is disabled so timing a stage costs a single call"""
+    count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+class _ActiveStage():
+    def __init__(self, profiler, record: StageRecord):
+        self.__profiler = profiler
+        self.__record = record
+
+    def __enter__(self) -> StageRecord:
+        self.__record.calls += 1
+        self.__profiler._resume( self.__record )
+        return self.__record
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.__profiler._pause()
+        return False
+
+
+class StageProfiler():
+    """Records the wall time, CPU time, record count and peak allocations of each stage of a run.
+
+    Stages can be nested or interleaved (Ex: a parser's generator feeding the join) and each stage
+    only records the time spent in its own code, time spent in a nested stage is recorded by that stage.
+    Each thread nests its own stages so stages can run concurrently in an executor, the CPU time is the
+    process's so stages running at the same time each include the CPU time of the others.
+    When the profiler is disabled the stages are no-ops so it can be left in place on the hot path.
+    """
+    _NULL_STAGE = _NullStage()
+
+    def __init__(self, enabled: bool = False):
+        self.__enabled = enabled
+        self.__records: dict[str, StageRecord] = {}
+        # Each thread has its own stack of the stages it has entered
+        self.__local = threading.local()
+        self.__records_lock = threading.Lock()
+        self.__started_wall = time.perf_counter()
+        self.__peak_traced_bytes = 0
+
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def is_enabled(self) -> bool:
+        """Checks whether the profiler is recording
+
+        Returns:
+            bool: True if the stages are being recorded
+        """
+        return self.__enabled
+
+    def stage(self, name: str):
+        """Creates a context manager that records the code within it as the stage
+
+        Args:
+            name (str): The name of the stage
+
+        Returns:
+            A context manager returning the stage's record so the caller can add to its count
+        """
+        if not self.__enabled:
+            return self._NULL_STAGE
+
+        return _ActiveStage( self, self.__get_record( name ) )
+
+    def iterate(self, name: str, iterable: Iterable) -> Iterable:
+        """Records the time spent producing each item of the iterable as the stage and counts the items
+
+        Args:
+            name (str): The name of the stage
+            iterable (Iterable): The iterable to measure, usually a generator
+
+        Returns:
+            Iterable: The iterable unchanged when disabled, otherwise an iterator over the same items
+        """
+        if not self.__enabled:
+            return iterable
+
+        return self.__iterate( self.__get_record( name ), iter( iterable ) )
+
+    def __iterate(self, record: StageRecord, iterator: Iterator) -> Iterator:
+        record.calls += 1
+
+        while True:
+            self._resume( record )
+
+            try:
+                item = next( iterator )
+            except StopIteration:
+                return
+            finally:
+                self._pause()
+
+            record.count += 1
+            yield item
+
+    def _resume(self, record: StageRecord):
+        """Starts measuring the record, pausing the stage it was started from
+
+        Args:
+            record (StageRecord): The stage being entered
+        """
+        wall, cpu = time.perf_counter(), time.process_time()
+
+        stack = self.__get_stack()
+
+        if stack:
+            self.__accumulate( stack[-1], wall, cpu )
+
+        stack.append( record )
+        self.__start( record, wall, cpu )
+
+    def _pause(self):
+        """Stops measuring the current stage and resumes the stage it was started from"""
+        wall, cpu = time.perf_counter(), time.process_time()
+        stack = self.__get_stack()
+        self.__accumulate( stack.pop(), wall, cpu )
+
+        if stack:
+            self.__start( stack[-1], wall, cpu )
+
+    def __start(self, record: StageRecord, wall: float, cpu: float):
+        record._resumed_wall = wall
+        record._resumed_cpu = cpu
+        tracemalloc.reset_peak()
+        record._resumed_memory = tracemalloc.get_traced_memory()[0]
+
+    def __accumulate(self, record: StageRecord, wall: float, cpu: float):
+        record.wall_seconds += wall - record._resumed_wall
+        record.cpu_seconds += cpu - record._resumed_cpu
+        peak_traced_bytes = tracemalloc.get_traced_memory()[1]
+        record.peak_allocated_bytes = max( record.peak_allocated_bytes, peak_traced_bytes - record._resumed_memory )
+        self.__peak_traced_bytes = max( self.__peak_traced_bytes, peak_traced_bytes )
+
+    def __get_stack(self) -> list[StageRecord]:
+        if not hasattr( self.__local, "stack" ):
+            self.__local.stack = []
+
+        return self.__local.stack
+
+    def __get_record(self, name: str) -> StageRecord:
+        with self.__records_lock:
+            if name not in self.__records:
+                self.__records[name] = StageRecord( name )
+
+            return self.__records[name]
+
+    def get_report(self) -> dict:
+        """Builds the report of every stage in the order the stages were first entered
+
+        Returns:
+            dict: The stages' measurements along with the run's total wall time and peak traced memory
+        """
+        return {
+            "total_wall_seconds": round( time.perf_counter() - self.__started_wall, 6 ),
+            "peak_traced_bytes": self.__peak_traced_bytes,
+            "stages": [record.to_dict() for record in self.__records.values()],
+        }
+
+    def write_report(self, output: TextIO, stage_lines: bool = False):
+        """Writes the report as a single JSON document or as one JSON line per stage
+
+        Args:
+            output (TextIO): The stream the report is written to
+            stage_lines (bool): Whether to write one JSON line per stage for structured log collectors
+        """
+        report = self.get_report()
+
+        if not stage_lines:
+            json.dump( report, output, indent=2 )
+            output.write( "\n" )
+            return
+
+        for stage in report["stages"]:
+            output.write( json.dumps( stage ) + "\n" )
+
+    def get_record(self, name: str) -> Optional[StageRecord]:
+        """Gets the record of a stage
+
+        Args:
+            name (str): The name of the stage
+
+        Returns:
+            Optional[StageRecord]: The stage's record or None if it was never entered
+        """
+        return self.__records.get( name )
@@ -0,0 +1,4 @@
+from .StageProfiler import StageProfiler, StageRecord
+from .ParseDiagnostics import ParseDiagnostics
+
+__all__ = ["StageProfiler", "StageRecord", "ParseDiagnostics"]
@@ -8,7 +8,7 @@ setup(
     long_description_content_type='text/markdown',
     author='Devon Connors',
     author_email='dconns1@outlook.com',
-    packages=find_packages(),
+    packages=find_packages(exclude=['tests', 'tests.*']),
     entry_points={
         'console_scripts': [
             'swe-code-challenge=my_module.SWECodeChallenge:main'
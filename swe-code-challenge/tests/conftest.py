@@ -0,0 +1,125 @@
+import logging
+import pytest
+
+
+STATUS_FILE_CONTENTS = """Package: base-files
+Status: install ok installed
+Priority: required
+Section: admin
+Installed-Size: 340
+Architecture: amd64
+Version: 12.4
+Description: Debian base system miscellaneous files
+ This package contains the basic filesystem hierarchy of a Debian system.
+
+Package: libc6
+Status: install ok installed
+Priority: optional
+Section: libs
+Installed-Size: 12988
+Architecture: amd64
+Version: 2.36-9
+Depends: base-files
+Description: GNU C Library: Shared libraries
+ Contains the standard libraries that are used by nearly all programs on
+ the system.
+
+Package: curl
+Status: install ok installed
+Priority: optional
+Section: web
+Installed-Size: 500
+Architecture: amd64
+Version: 7.88.1-10
+Depends: libc6 (>= 2.34), libcurl4 (= 7.88.1-10)
+Description: command line tool for transferring data with URL syntax
+
+Package: libcurl4
+Status: install ok installed
+Priority: optional
+Section: libs
+Installed-Size: 820
+Architecture: amd64
+Version: 7.88.1-10
+Depends: libc6 (>= 2.34)
+Description: easy-to-use client-side URL transfer library
+
+Package: vim
+Status: install ok installed
+Priority: optional
+Section: editors
+Installed-Size: 3760
+Architecture: amd64
+Version: 2:9.0.1378-2
+Depends: libc6 (>= 2.34), vim-runtime
+Description: Vi IMproved - enhanced vi editor
+
+Package: vim-runtime
+Status: install ok installed
+Priority: optional
+Section: editors
+Installed-Size: 38000
+Architecture: all
+Version: 2:9.0.1378-2
+Description: Vi IMproved - Runtime files
+
+Package: joe
+Status: deinstall ok config-files
+Priority: optional
+Section: editors
+Architecture: amd64
+Version: 4.6-1
+Conffiles:
+ /etc/joe/joerc 0123456789abcdef0123456789abcdef
+Description: user friendly full screen text editor
+
+"""
+
+HISTORY_LOG_CONTENTS = """Start-Date: 2024-01-02  10:00:00
+Commandline: apt-get install curl
+Requested-By: alice (1000)
+Install: curl:amd64 (7.88.1-10), libcurl4:amd64 (7.88.1-10, automatic)
+End-Date: 2024-01-02  10:00:05
+
+Start-Date: 2024-01-03  11:00:00
+Commandline: apt install vim
+Requested-By: bob (1001)
+Install: vim:amd64 (2:9.0.1378-2), vim-runtime:amd64 (2:9.0.1378-2, automatic)
+End-Date: 2024-01-03  11:00:09
+
+"""
+
+HISTORY_LOG_APPENDED_CONTENTS = """Start-Date: 2024-01-04  12:00:00
+Commandline: apt-get install nano
+Requested-By: alice (1000)
+Install: nano:amd64 (7.2-1)
+End-Date: 2024-01-04  12:00:03
+
+"""
+
+HISTORY_LOG_IN_PROGRESS_CONTENTS = """Start-Date: 2024-01-05  13:00:00
+Commandline: apt-get install htop
+Requested-By: bob (1001)
+Install: htop:amd64 (3.2.2-2)
+"""
+
+
+@pytest.fixture
+def logger() -> logging:
+    return logging.getLogger( "tests" )
+
+
+@pytest.fixture
+def status_file(tmp_path) -> str:
+    path = tmp_path / "status"
+    path.write_text( STATUS_FILE_CONTENTS )
+
+    return str( path )
+
+
+@pytest.fixture
+def history_log(tmp_path) -> str:
+    path = tmp_path / "history.log"
+    path.write_text( HISTORY_LOG_CONTENTS )
+
+    return str( path )
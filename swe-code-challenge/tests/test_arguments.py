@@ -0,0 +1,67 @@
+import pytest
+from datetime import datetime
+from my_module.SWECodeChallenge import build_argument_parser, validate_arguments
+
+
+def parse_arguments(*arguments: str):
+    argument_parser = build_argument_parser()
+    parsed_arguments = argument_parser.parse_args( list( arguments ) )
+    validate_arguments( argument_parser, parsed_arguments )
+
+    return parsed_arguments
+
+
+@pytest.mark.parametrize( "arguments", [
+    (),
+    ( "--leaves", "--section", "net", "--min-size", "100", "--sort", "size", "--top", "5" ),
+    ( "--mode", "replay", "--leaves" ),
+    ( "--mode", "extended-states", "--enrich" ),
+    ( "--diff", "/tmp/status-old" ),
+    ( "--diff-snapshot", "--since", "2024-01-01" ),
+    ( "--client", "--user", "alice", "--until", "2024-01-31" ),
+    ( "--fleet", "/srv/hosts", "--format", "csv" ),
+    ( "--daemon", "--no-cache" ),
+] )
+def test_valid_combinations_are_accepted(arguments):
+    parse_arguments( *arguments )
+
+
+@pytest.mark.parametrize( "arguments", [
+    ( "--daemon", "--profile" ),
+    ( "--diff", "/tmp/status-old", "--leaves" ),
+    ( "--diff-snapshot", "--sort", "size" ),
+    ( "--diff-snapshot", "--no-cache" ),
+    ( "--client", "--section", "net" ),
+    ( "--fleet", "/srv/hosts", "--min-size", "100" ),
+    ( "--daemon", "--top", "5" ),
+    ( "--client", "--leaves" ),
+    ( "--fleet", "/srv/hosts", "--mode", "replay" ),
+    ( "--daemon", "--mode", "extended-states", "--enrich" ),
+    ( "--top", "0" ),
+    ( "--client", "--fleet", "/srv/hosts" ),
+    ( "--diff", "/tmp/status-old", "--diff-snapshot" ),
+    ( "--since", "yesterday" ),
+    ( "--mode", "everything" ),
+] )
+def test_invalid_combinations_are_rejected(arguments, capsys):
+    with pytest.raises( SystemExit ) as exit_info:
+        parse_arguments( *arguments )
+
+    assert exit_info.value.code == 2
+    assert "error:" in capsys.readouterr().err
+
+
+def test_date_only_until_includes_the_whole_day():
+    arguments = parse_arguments( "--since", "2024-01-31", "--until", "2024-01-31" )
+
+    assert arguments.since == datetime( 2024, 1, 31 )
+    assert arguments.until == datetime( 2024, 1, 31, 23, 59, 59, 999999 )
+
+
+def test_until_with_a_time_is_kept():
+    assert parse_arguments( "--until", "2024-01-31 09:15:00" ).until == datetime( 2024, 1, 31, 9, 15 )
+
+
+def test_extended_states_has_no_default():
+    assert parse_arguments().extended_states is None
+    assert parse_arguments( "--extended-states", "/tmp/extended_states" ).extended_states == "/tmp/extended_states"
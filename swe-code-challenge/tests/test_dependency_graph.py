@@ -0,0 +1,91 @@
+import pytest
+from my_module.models.DependencyGraph.DependencyGraph import DependencyGraph
+from my_module.parsers.StatusFileParser import StatusFileParser
+
+
+PROVIDES_STATUS_FILE_CONTENTS = """Package: mutt
+Status: install ok installed
+Version: 2.2.9-1
+Depends: libc6, default-mta | mail-transport-agent
+
+Package: exim4-daemon-light
+Status: install ok installed
+Version: 4.96-15
+Provides: mail-transport-agent
+
+Package: libc6
+Status: install ok installed
+Version: 2.36-9
+
+Package: postfix
+Status: deinstall ok config-files
+Version: 3.7.9-0
+Depends: libc6
+
+"""
+
+
+@pytest.fixture
+def dependency_graph(status_file, logger) -> DependencyGraph:
+    with open( status_file, "r" ) as status_file_contents:
+        return DependencyGraph.from_status_file_sections( StatusFileParser( logger ).iter_parse( status_file_contents ) )
+
+
+def test_dependencies_ignore_version_constraints(dependency_graph):
+    assert dependency_graph.get_dependencies( "curl" ) == ["libc6", "libcurl4"]
+    assert dependency_graph.get_reverse_dependencies( "libc6" ) == ["curl", "libcurl4", "vim"]
+
+
+def test_leaves_drop_packages_pulled_in_by_another(dependency_graph):
+    assert dependency_graph.get_leaves( ["curl", "libcurl4", "vim"] ) == ["curl", "vim"]
+
+
+def test_leaves_drop_indirect_dependencies(dependency_graph):
+    assert dependency_graph.get_leaves( ["base-files", "curl"] ) == ["curl"]
+
+
+def test_leaves_keep_the_order_given(dependency_graph):
+    assert dependency_graph.get_leaves( ["vim", "libcurl4", "curl"] ) == ["vim", "curl"]
+
+
+def test_shared_dependencies_are_not_leaves(dependency_graph):
+    assert dependency_graph.get_leaves( ["curl", "vim", "libc6"] ) == ["curl", "vim"]
+
+
+def test_packages_that_are_not_installed_are_leaves(dependency_graph):
+    assert dependency_graph.get_leaves( ["nano", "curl", "libc6"] ) == ["nano", "curl"]
+
+
+def test_leaves_through_a_cycle():
+    dependency_graph = DependencyGraph( ["a", "b", "c", "d"], [[1], [2], [1], []] )
+
+    assert dependency_graph.get_leaves( ["a", "c", "d"] ) == ["a", "d"]
+
+
+def test_packages_depending_on_each_other_keep_one_leaf():
+    # perl and perl-modules depend on each other, libperl is pulled in by both
+    dependency_graph = DependencyGraph( ["perl", "perl-modules", "libperl", "vim"], [[1, 2], [0], [], []] )
+
+    assert dependency_graph.get_leaves( ["perl", "perl-modules", "vim"] ) == ["perl", "vim"]
+    assert dependency_graph.get_leaves( ["perl-modules", "perl", "libperl"] ) == ["perl-modules"]
+
+
+def test_cycle_pulled_in_by_another_package_has_no_leaf():
+    dependency_graph = DependencyGraph( ["a", "b", "c"], [[1], [2], [1]] )
+
+    assert dependency_graph.get_leaves( ["a", "b", "c"] ) == ["a"]
+    assert dependency_graph.get_leaves( ["b", "c"] ) == ["b"]
+
+
+def test_alternatives_resolve_through_provides(tmp_path, logger):
+    status_file = tmp_path / "status"
+    status_file.write_text( PROVIDES_STATUS_FILE_CONTENTS )
+
+    with open( status_file, "r" ) as status_file_contents:
+        dependency_graph = DependencyGraph.from_status_file_sections( StatusFileParser( logger ).iter_parse( status_file_contents ) )
+
+    # Packages that are only left as configuration files are not in the graph
+    assert len( dependency_graph ) == 3
+    assert dependency_graph.get_id( "postfix" ) is None
+    assert dependency_graph.get_dependencies( "mutt" ) == ["exim4-daemon-light", "libc6"]
+    assert dependency_graph.get_leaves( ["mutt", "exim4-daemon-light"] ) == ["mutt"]
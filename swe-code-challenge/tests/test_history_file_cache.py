@@ -0,0 +1,113 @@
+import gzip
+import os
+import pytest
+from my_module.cache.HistoryFileCache import HistoryFileCache
+from my_module.parsers.HistoryFileParser import HistoryFileParser
+from tests.conftest import HISTORY_LOG_CONTENTS, HISTORY_LOG_APPENDED_CONTENTS, HISTORY_LOG_IN_PROGRESS_CONTENTS
+
+
+ROTATED_LOG_CONTENTS = """Start-Date: 2023-12-30  09:00:00
+Commandline: apt-get install git
+Requested-By: alice (1000)
+Install: git:amd64 (1:2.39.2-1.1)
+End-Date: 2023-12-30  09:00:07
+
+"""
+
+
+@pytest.fixture
+def history_file_cache(tmp_path, logger) -> HistoryFileCache:
+    return HistoryFileCache( str( tmp_path / "cache" ), HistoryFileParser( logger ), logger )
+
+
+def sections(history_file_section_collection) -> list[tuple]:
+    return [
+        ( section.start_date, section.requested_by, section.packages, section.is_complete )
+        for section in history_file_section_collection.get_history_file_section_collection()
+    ]
+
+
+def append(path: str, contents: str):
+    with open( path, "a" ) as history_file:
+        history_file.write( contents )
+
+
+def test_load_matches_a_full_parse(history_file_cache, history_log, logger):
+    assert sections( history_file_cache.load( history_log ) ) == sections( HistoryFileParser( logger ).parse_history_logs( history_log ) )
+    assert sections( history_file_cache.load( history_log ) ) == sections( HistoryFileParser( logger ).parse_history_logs( history_log ) )
+
+
+def test_appended_sections_are_added(history_file_cache, history_log, logger, monkeypatch):
+    history_file_cache.load( history_log )
+    append( history_log, HISTORY_LOG_APPENDED_CONTENTS )
+    parsed = []
+    parse = history_file_cache.get_history_file_parser().parse
+
+    def record_parse(command_data):
+        command_data = list( command_data )
+        parsed.extend( command_data )
+
+        return parse( command_data )
+
+    monkeypatch.setattr( history_file_cache.get_history_file_parser(), "parse", record_parse )
+    history_file_section_collection = history_file_cache.load( history_log )
+
+    # Only the appended section was parsed
+    assert len( parsed ) == 1
+    assert parsed[0].startswith( "Start-Date: 2024-01-04" )
+    assert sections( history_file_section_collection ) == sections( HistoryFileParser( history_file_cache.get_logger() ).parse_history_logs( history_log ) )
+    assert history_file_section_collection.has_package( "nano" )
+
+
+def test_rotated_log_is_rescanned(history_file_cache, history_log, tmp_path):
+    history_file_cache.load( history_log )
+
+    # Logrotate moves the log away and apt starts a new one
+    os.rename( history_log, f"{history_log}.1" )
+
+    with gzip.open( f"{history_log}.2.gz", "wt" ) as rotated_log:
+        rotated_log.write( ROTATED_LOG_CONTENTS )
+
+    with open( history_log, "w" ) as history_file:
+        history_file.write( HISTORY_LOG_APPENDED_CONTENTS )
+
+    history_file_section_collection = history_file_cache.load( history_log )
+
+    assert [section.start_date.day for section in history_file_section_collection.get_history_file_section_collection()] == [30, 2, 3, 4]
+
+
+def test_truncated_log_is_rescanned(history_file_cache, history_log):
+    history_file_cache.load( history_log )
+
+    with open( history_log, "w" ) as history_file:
+        history_file.write( HISTORY_LOG_APPENDED_CONTENTS )
+
+    assert [section.packages for section in history_file_cache.load( history_log ).get_history_file_section_collection()] == [["nano"]]
+
+
+def test_in_progress_section_is_returned_but_not_stored(history_file_cache, history_log):
+    append( history_log, HISTORY_LOG_IN_PROGRESS_CONTENTS )
+
+    history_file_section_collection = history_file_cache.load( history_log )
+
+    assert [section.is_complete for section in history_file_section_collection.get_history_file_section_collection()] == [True, True, False]
+    assert history_file_section_collection.has_package( "htop" )
+
+    # apt finishes the command, the section is parsed again and is not returned twice
+    append( history_log, "End-Date: 2024-01-05  13:00:04\n\n" )
+    history_file_section_collection = history_file_cache.load( history_log )
+
+    assert [section.is_complete for section in history_file_section_collection.get_history_file_section_collection()] == [True, True, True]
+    assert len( history_file_section_collection.get_history_file_sections_by_package( "htop" ) ) == 1
+
+
+def test_partial_end_date_line_waits_for_its_newline(history_file_cache, history_log):
+    append( history_log, HISTORY_LOG_IN_PROGRESS_CONTENTS + "End-Date: 2024-01-05  13:00:04" )
+
+    assert len( history_file_cache.load( history_log ).get_history_file_sections_by_package( "htop" ) ) == 1
+
+    append( history_log, "\n\n" )
+    history_file_section_collection = history_file_cache.load( history_log )
+
+    assert len( history_file_section_collection.get_history_file_sections_by_package( "htop" ) ) == 1
+    assert history_file_section_collection.get_history_file_section_by_package( "htop" ).is_complete
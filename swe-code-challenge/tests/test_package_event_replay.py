@@ -0,0 +1,90 @@
+from datetime import datetime
+from my_module.models.HistoryFile.HistoryEvent import HistoryEvent
+from my_module.models.HistoryFile.PackageEventReplay import PackageEventReplay
+from my_module.parsers.HistoryEventParser import HistoryEventParser
+
+
+HISTORY_LOG_CONTENTS = """Start-Date: 2024-01-02  10:00:00
+Commandline: apt-get install curl
+Requested-By: alice (1000)
+Install: curl:amd64 (7.88.1-10), libcurl4:amd64 (7.88.1-10, automatic)
+End-Date: 2024-01-02  10:00:05
+
+Start-Date: 2024-01-03  11:00:00
+Commandline: apt-get install libcurl4
+Requested-By: bob (1001)
+End-Date: 2024-01-03  11:00:01
+
+Start-Date: 2024-01-04  12:00:00
+Commandline: apt-get purge curl
+Requested-By: alice (1000)
+Purge: curl:amd64 (7.88.1-10)
+End-Date: 2024-01-04  12:00:02
+
+Start-Date: 2024-01-05  13:00:00
+Commandline: apt-get upgrade
+Upgrade: libc6:amd64 (2.36-8, 2.36-9)
+End-Date: 2024-01-05  13:00:09
+
+"""
+
+
+def install(package: str, automatic: bool = False, day: int = 1, user: str = "alice") -> HistoryEvent:
+    return HistoryEvent( HistoryEvent.INSTALL, package, automatic=automatic, date=datetime( 2024, 1, day ), requested_by=user )
+
+
+def test_explicit_install_is_listed():
+    replay = PackageEventReplay().replay( [install( "curl" ), install( "libcurl4", automatic=True )] )
+
+    assert replay.is_installed( "libcurl4" )
+    assert replay.get_explicit_install( "libcurl4" ) is None
+    assert list( replay.get_explicitly_installed() ) == ["curl"]
+
+
+def test_removed_package_is_dropped():
+    replay = PackageEventReplay().replay( [install( "curl" ), HistoryEvent( HistoryEvent.REMOVE, "curl" )] )
+
+    assert not replay.is_installed( "curl" )
+    assert replay.get_explicitly_installed() == {}
+
+
+def test_reinstall_as_dependency_drops_the_explicit_install():
+    replay = PackageEventReplay().replay( [install( "curl" ), HistoryEvent( HistoryEvent.REMOVE, "curl" ), install( "curl", automatic=True )] )
+
+    assert replay.is_installed( "curl" )
+    assert replay.get_explicit_install( "curl" ) is None
+
+
+def test_requesting_an_installed_dependency_marks_it_explicit():
+    requested = HistoryEvent( HistoryEvent.REQUESTED, "libcurl4", date=datetime( 2024, 1, 3 ), requested_by="bob" )
+    replay = PackageEventReplay().replay( [install( "libcurl4", automatic=True ), requested] )
+
+    assert replay.get_explicit_install( "libcurl4" ) is requested
+
+
+def test_upgrade_of_an_unknown_package_is_installed_but_not_explicit():
+    replay = PackageEventReplay().replay( [HistoryEvent( HistoryEvent.UPGRADE, "libc6" )] )
+
+    assert replay.is_installed( "libc6" )
+    assert replay.get_explicit_install( "libc6" ) is None
+
+
+def test_explicitly_installed_filters():
+    replay = PackageEventReplay().replay( [install( "curl", day=2 ), install( "vim", day=3, user="bob" ), install( "nano", day=4 )] )
+
+    assert sorted( replay.get_explicitly_installed( user="alice" ) ) == ["curl", "nano"]
+    assert sorted( replay.get_explicitly_installed( since=datetime( 2024, 1, 3 ) ) ) == ["nano", "vim"]
+    assert sorted( replay.get_explicitly_installed( until=datetime( 2024, 1, 3 ) ) ) == ["curl", "vim"]
+
+
+def test_replay_of_a_history_log(tmp_path, logger):
+    history_log = tmp_path / "history.log"
+    history_log.write_text( HISTORY_LOG_CONTENTS )
+
+    replay = PackageEventReplay().replay( HistoryEventParser( logger ).iter_events( str( history_log ) ) )
+    explicitly_installed = replay.get_explicitly_installed()
+
+    assert not replay.is_installed( "curl" )
+    assert replay.is_installed( "libc6" )
+    assert list( explicitly_installed ) == ["libcurl4"]
+    assert explicitly_installed["libcurl4"].requested_by == "bob"
@@ -0,0 +1,91 @@
+import io
+import pytest
+from my_module.parsers.StatusFileParser import StatusFileParser
+from my_module.parsers.MmapStatusFileParser import MmapStatusFileParser
+from my_module.parsers.HistoryFileParser import HistoryFileParser
+from my_module.parsers.MmapHistoryFileParser import MmapHistoryFileParser
+from tests.conftest import HISTORY_LOG_CONTENTS, HISTORY_LOG_IN_PROGRESS_CONTENTS
+
+
+def status_rows(status_file_sections, description: bool = True) -> list[tuple]:
+    return [
+        ( section.package, section.section, section.version, section.installed_size, section.status, section.description if description else None )
+        for section in status_file_sections
+    ]
+
+
+def history_rows(history_file_section_collection) -> list[tuple]:
+    return [
+        ( section.start_date, section.end_date, section.requested_by, section.packages, section.is_complete )
+        for section in history_file_section_collection.get_history_file_section_collection()
+    ]
+
+
+@pytest.mark.parametrize( "parser_class", [StatusFileParser, MmapStatusFileParser] )
+def test_status_file_streaming_matches_whole_file(parser_class, status_file, logger):
+    # Depends is read so the whole file collection keeps the raw sections the descriptions are decoded from
+    parser = parser_class( logger, fields=[*StatusFileParser.FIELDS, "Depends"] )
+
+    with open( status_file, "r" ) as status_file_contents:
+        whole_file = parser.parse( parser.tokenize( status_file_contents.read() ) )
+
+    with open( status_file, "r" ) as status_file_contents:
+        streamed = list( parser.iter_parse( status_file_contents ) )
+
+    assert len( streamed ) == 7
+    assert status_rows( streamed ) == status_rows( whole_file.get_status_file_section_collection() )
+
+
+def test_status_file_parsers_agree_on_kept_fields(status_file, logger):
+    with open( status_file, "r" ) as status_file_contents:
+        text = list( StatusFileParser( logger ).iter_parse( status_file_contents ) )
+
+    with open( status_file, "r" ) as status_file_contents:
+        mmap = list( MmapStatusFileParser( logger ).iter_parse( status_file_contents ) )
+
+    # The memory mapped parser never decodes descriptions
+    assert status_rows( text, description=False ) == status_rows( mmap, description=False )
+
+
+def test_whole_file_parse_drops_raw_sections_of_column_fields(status_file, logger):
+    parser = StatusFileParser( logger )
+
+    with open( status_file, "r" ) as status_file_contents:
+        whole_file = parser.parse( parser.tokenize( status_file_contents.read() ) )
+
+    with open( status_file, "r" ) as status_file_contents:
+        streamed = list( parser.iter_parse( status_file_contents ) )
+
+    assert status_rows( whole_file.get_status_file_section_collection(), description=False ) == status_rows( streamed, description=False )
+    assert all( section.raw == "" for section in whole_file.get_status_file_section_collection() )
+
+
+def test_status_file_fields_limit_what_is_parsed(status_file, logger):
+    parser = StatusFileParser( logger, fields=["Package", "Version"] )
+
+    with open( status_file, "r" ) as status_file_contents:
+        status_file_sections = list( parser.iter_parse( status_file_contents ) )
+
+    assert [section.package for section in status_file_sections] == ["base-files", "libc6", "curl", "libcurl4", "vim", "vim-runtime", "joe"]
+    assert status_file_sections[4].version == "2:9.0.1378-2"
+
+
+@pytest.mark.parametrize( "parser_class", [HistoryFileParser, MmapHistoryFileParser] )
+def test_history_file_streaming_matches_whole_file(parser_class, tmp_path, logger):
+    history_log = tmp_path / "history.log"
+    history_log.write_text( HISTORY_LOG_CONTENTS + HISTORY_LOG_IN_PROGRESS_CONTENTS )
+    parser = parser_class( logger )
+
+    whole_file = parser.parse( parser.tokenize( history_log.read_text() ) )
+    streamed = parser.parse_history_logs( str( history_log ) )
+
+    assert history_rows( streamed ) == history_rows( whole_file )
+    assert [section.is_complete for section in streamed.get_history_file_section_collection()] == [True, True, False]
+
+
+def test_history_file_in_progress_stanza_can_be_left_out(logger):
+    parser = HistoryFileParser( logger )
+    tokens = list( parser.iter_tokens( io.StringIO( HISTORY_LOG_CONTENTS + HISTORY_LOG_IN_PROGRESS_CONTENTS ), include_in_progress=False ) )
+
+    assert len( tokens ) == 2
+    assert parser.get_diagnostics().get_count( HistoryFileParser.IN_PROGRESS_STANZA ) == 1
@@ -0,0 +1,50 @@
+import os
+import logging
+import pytest
+from my_module.SWECodeChallenge import SWECodeChallenge
+from my_module.daemon.QueryDaemon import QueryDaemon
+from my_module.parsers.HistoryFileParser import HistoryFileParser
+from my_module.parsers.StatusFileParser import StatusFileParser
+
+
+@pytest.fixture
+def query_daemon(tmp_path, status_file, history_log, logger) -> QueryDaemon:
+    application = SWECodeChallenge( HistoryFileParser( logger ), StatusFileParser( logger ), status_file=status_file, history_log=history_log, logger=logger )
+
+    return QueryDaemon( application, str( tmp_path / "daemon.sock" ), logger )
+
+
+def fail_to_load():
+    raise TypeError( "'str' object cannot be interpreted as an integer" )
+
+
+def test_reload_answers_queries(query_daemon):
+    assert query_daemon.reload()
+
+    response = query_daemon.handle_query( { "query": "packages", "format": "records" } )
+
+    assert response["ok"]
+    assert sorted( package["package"] for package in response["packages"] ) == ["curl", "vim"]
+
+
+def test_failed_reload_keeps_the_previous_snapshot(query_daemon, monkeypatch, caplog):
+    query_daemon.reload()
+    snapshot = query_daemon.get_snapshot()
+    monkeypatch.setattr( query_daemon.get_application(), "load_status_file_section_collection", fail_to_load )
+
+    with caplog.at_level( logging.ERROR ):
+        assert not query_daemon.reload()
+
+    assert query_daemon.get_snapshot() == snapshot
+    assert query_daemon.handle_query( { "query": "status" } )["reloads"] == 1
+    assert "Reload failed" in caplog.text
+    assert "TypeError" in caplog.text
+
+
+def test_missing_file_keeps_the_previous_snapshot(query_daemon, history_log):
+    query_daemon.reload()
+    snapshot = query_daemon.get_snapshot()
+    os.unlink( history_log )
+
+    assert not query_daemon.reload()
+    assert query_daemon.get_snapshot() == snapshot
@@ -0,0 +1,161 @@
+import os
+import pytest
+from my_module.cache.StatusFileCache import StatusFileCache
+from my_module.parsers.StatusFileParser import StatusFileParser
+from my_module.parsers.MmapStatusFileParser import MmapStatusFileParser
+from my_module.models.StatusFile.StatusFileSectionCollection import StatusFileSectionCollection
+
+
+# An hour before the status file is loaded, well outside the filesystem's timestamp granularity
+OLD_MTIME_NS = 3600 * 1_000_000_000
+
+
+@pytest.fixture
+def status_file_cache(tmp_path, logger) -> StatusFileCache:
+    return StatusFileCache( str( tmp_path / "cache" ), StatusFileParser( logger, fields=["Package", "Version", "Installed-Size", "Section"] ), logger )
+
+
+def packages(status_file_section_collection) -> list[tuple]:
+    return [( section.package, section.version, section.installed_size, section.section ) for section in status_file_section_collection.get_status_file_section_collection()]
+
+
+def age_file(path: str):
+    file_stat = os.stat( path )
+    os.utime( path, ns=( file_stat.st_atime_ns, file_stat.st_mtime_ns - OLD_MTIME_NS ) )
+
+
+def rewrite_keeping_identity(path: str, old: str, new: str):
+    """Changes the file in place without changing its size or modified time"""
+    file_stat = os.stat( path )
+
+    with open( path, "r+" ) as file:
+        contents = file.read().replace( old, new, 1 )
+        file.seek( 0 )
+        file.write( contents )
+
+    os.utime( path, ns=( file_stat.st_atime_ns, file_stat.st_mtime_ns ) )
+
+
+def fail_to_parse(*args, **kwargs):
+    raise AssertionError( "the status file was parsed instead of read from the snapshot" )
+
+
+def test_miss_parses_and_takes_a_snapshot(status_file_cache, status_file):
+    assert not os.path.exists( status_file_cache.get_cache_file() )
+
+    status_file_section_collection = status_file_cache.load( status_file )
+
+    assert os.path.exists( status_file_cache.get_cache_file() )
+    assert len( status_file_section_collection ) == 7
+    assert packages( status_file_section_collection )[1] == ( "libc6", "2.36-9", "12988", "libs" )
+
+
+def test_hit_reads_the_snapshot_without_parsing(status_file_cache, status_file, monkeypatch):
+    age_file( status_file )
+    parsed = status_file_cache.load( status_file )
+    monkeypatch.setattr( status_file_cache.get_status_file_parser(), "iter_parse", fail_to_parse )
+
+    cached = status_file_cache.load( status_file )
+
+    assert packages( cached ) == packages( parsed )
+    assert list( cached.get_installed_sizes() ) == list( parsed.get_installed_sizes() )
+
+
+@pytest.mark.parametrize( "parser_class", [StatusFileParser, MmapStatusFileParser] )
+def test_hit_returns_the_rows_of_the_miss(parser_class, tmp_path, status_file, logger):
+    status_file_cache = StatusFileCache( str( tmp_path / "cache" ), parser_class( logger, fields=["Package", "Version", "Installed-Size", "Section", "Status"] ), logger )
+    age_file( status_file )
+
+    parsed = status_file_cache.load( status_file )
+    cached = status_file_cache.load( status_file )
+
+    assert packages( cached ) == packages( parsed )
+    assert [section.status for section in cached.get_status_file_section_collection()] == [section.status for section in parsed.get_status_file_section_collection()]
+
+    # The package left as configuration files has no installed size
+    assert packages( cached )[-1] == ( "joe", "4.6-1", "", "editors" )
+    assert cached.get_status_file_section_collection()[-1].installed_size_kib is None
+    assert cached.get_installed_sizes()[-1] == StatusFileSectionCollection.MISSING_INSTALLED_SIZE
+
+
+def test_hit_keeps_raw_sections_for_other_fields(tmp_path, status_file, logger):
+    status_file_cache = StatusFileCache( str( tmp_path / "cache" ), StatusFileParser( logger, fields=["Package", "Version", "Depends"] ), logger )
+    status_file_cache.load( status_file )
+
+    cached = status_file_cache.load( status_file )
+
+    assert cached.get_status_file_section_collection()[2].get_field( "Depends" ) == "libc6 (>= 2.34), libcurl4 (= 7.88.1-10)"
+    assert cached.get_status_file_section_collection()[0].description.startswith( "Debian base system" )
+
+
+def test_raw_sections_are_only_kept_for_fields_outside_the_columns(tmp_path, status_file, logger, monkeypatch):
+    cache_directory = str( tmp_path / "cache" )
+    column_fields_cache = StatusFileCache( cache_directory, StatusFileParser( logger ), logger )
+
+    assert all( section.raw == "" for section in column_fields_cache.load( status_file ).get_status_file_section_collection() )
+    assert all( section.raw == "" for section in column_fields_cache.load( status_file ).get_status_file_section_collection() )
+
+    # The snapshot without raw sections is not used by a parser reading Depends
+    depends_cache = StatusFileCache( cache_directory, StatusFileParser( logger, fields=[*StatusFileParser.FIELDS, "Depends"] ), logger )
+
+    assert depends_cache.load( status_file ).get_status_file_section_collection()[2].get_field( "Depends" ) == "libc6 (>= 2.34), libcurl4 (= 7.88.1-10)"
+
+    # Its snapshot with raw sections is used by the parser reading only the columns, which leaves them out
+    monkeypatch.setattr( column_fields_cache.get_status_file_parser(), "iter_parse", fail_to_parse )
+
+    assert all( section.raw == "" for section in column_fields_cache.load( status_file ).get_status_file_section_collection() )
+
+
+def test_changed_status_file_is_parsed_again(status_file_cache, status_file):
+    status_file_cache.load( status_file )
+
+    with open( status_file, "a" ) as status_file_contents:
+        status_file_contents.write( "Package: nano\nStatus: install ok installed\nSection: editors\nInstalled-Size: 2800\nVersion: 7.2-1\n\n" )
+
+    status_file_section_collection = status_file_cache.load( status_file )
+
+    assert packages( status_file_section_collection )[-1] == ( "nano", "7.2-1", "2800", "editors" )
+
+
+def test_identity_match_is_trusted_outside_the_racy_window(status_file_cache, status_file):
+    age_file( status_file )
+    status_file_cache.load( status_file )
+    rewrite_keeping_identity( status_file, "Version: 2.36-9", "Version: 2.36-X" )
+
+    assert packages( status_file_cache.load( status_file ) )[1][1] == "2.36-9"
+
+
+def test_stale_snapshot_within_the_racy_window_is_detected(status_file_cache, status_file):
+    status_file_cache.load( status_file )
+    rewrite_keeping_identity( status_file, "Version: 2.36-9", "Version: 2.36-X" )
+
+    assert packages( status_file_cache.load( status_file ) )[1][1] == "2.36-X"
+
+
+def test_snapshot_of_another_parser_is_not_used(tmp_path, status_file, logger, monkeypatch):
+    cache_directory = str( tmp_path / "cache" )
+    StatusFileCache( cache_directory, StatusFileParser( logger ), logger ).load( status_file )
+    mmap_parser = MmapStatusFileParser( logger )
+    status_file_cache = StatusFileCache( cache_directory, mmap_parser, logger )
+    parsed = []
+    iter_parse = mmap_parser.iter_parse
+
+    def record_parse(status_file_contents):
+        parsed.append( status_file_contents.name )
+
+        return iter_parse( status_file_contents )
+
+    monkeypatch.setattr( mmap_parser, "iter_parse", record_parse )
+
+    assert len( status_file_cache.load( status_file ) ) == 7
+    assert parsed == [status_file]
+
+
+def test_corrupt_snapshot_is_rebuilt(status_file_cache, status_file):
+    os.makedirs( os.path.dirname( status_file_cache.get_cache_file() ) )
+
+    with open( status_file_cache.get_cache_file(), "w" ) as cache_file:
+        cache_file.write( "not a database" )
+
+    assert len( status_file_cache.load( status_file ) ) == 7
+    assert len( status_file_cache.load( status_file ) ) == 7
@@ -0,0 +1,96 @@
+import os
+import pytest
+from my_module.cache.StatusFileCache import StatusFileCache
+from my_module.parsers.StatusFileParser import StatusFileParser
+from my_module.parsers.MmapStatusFileParser import MmapStatusFileParser
+from tests.conftest import STATUS_FILE_CONTENTS
+
+
+NANO_SECTION = "Package: nano\nStatus: install ok installed\nSection: editors\nInstalled-Size: 2800\nVersion: 7.2-1\n\n"
+
+
+@pytest.fixture(params=[StatusFileParser, MmapStatusFileParser])
+def status_file_cache(request, tmp_path, logger) -> StatusFileCache:
+    return StatusFileCache( str( tmp_path / "cache" ), request.param( logger, fields=["Package", "Version", "Installed-Size"] ), logger )
+
+
+def versions(status_file_sections) -> list[tuple]:
+    return sorted( ( section.package, section.version ) for section in status_file_sections )
+
+
+def test_first_diff_only_takes_a_baseline(status_file_cache, status_file):
+    assert status_file_cache.diff( status_file ) is None
+    assert os.path.exists( status_file_cache.get_baseline_file() )
+    assert status_file_cache.diff( status_file ) == ( [], [] )
+
+
+def test_diff_of_a_package_without_an_installed_size(status_file_cache, status_file):
+    status_file_cache.diff( status_file )
+
+    with open( status_file, "w" ) as status_file_contents:
+        status_file_contents.write( STATUS_FILE_CONTENTS.replace( "Version: 4.6-1", "Version: 4.6-2" ) )
+
+    old_sections, new_sections = status_file_cache.diff( status_file )
+
+    assert versions( old_sections ) == [( "joe", "4.6-1" )]
+    assert versions( new_sections ) == [( "joe", "4.6-2" )]
+    assert old_sections[0].installed_size_kib is None
+
+
+def test_diff_lists_removed_added_and_changed_sections(status_file_cache, status_file):
+    status_file_cache.diff( status_file )
+
+    with open( status_file, "w" ) as status_file_contents:
+        status_file_contents.write( STATUS_FILE_CONTENTS.replace( "Version: 7.88.1-10\nDepends: libc6 (>= 2.34), libcurl4", "Version: 8.5.0-2\nDepends: libc6 (>= 2.34), libcurl4" ).replace( "Package: vim-runtime", "Package: vim-tiny" ) + NANO_SECTION )
+
+    old_sections, new_sections = status_file_cache.diff( status_file )
+
+    assert versions( old_sections ) == [( "curl", "7.88.1-10" ), ( "vim-runtime", "2:9.0.1378-2" )]
+    assert versions( new_sections ) == [( "curl", "8.5.0-2" ), ( "nano", "7.2-1" ), ( "vim-tiny", "2:9.0.1378-2" )]
+
+    # The diff moved the baseline forward
+    assert status_file_cache.diff( status_file ) == ( [], [] )
+
+
+def test_loading_the_status_file_keeps_the_baseline(status_file_cache, status_file):
+    status_file_cache.diff( status_file )
+
+    with open( status_file, "a" ) as status_file_contents:
+        status_file_contents.write( NANO_SECTION )
+
+    status_file_cache.load( status_file )
+    old_sections, new_sections = status_file_cache.diff( status_file )
+
+    assert old_sections == []
+    assert versions( new_sections ) == [( "nano", "7.2-1" )]
+
+
+def test_unchanged_sections_are_not_parsed(status_file_cache, status_file, monkeypatch):
+    status_file_cache.diff( status_file )
+
+    with open( status_file, "a" ) as status_file_contents:
+        status_file_contents.write( NANO_SECTION )
+
+    status_file_parser = status_file_cache.get_status_file_parser()
+    parsed = []
+    iter_parse_tokens = status_file_parser.iter_parse_tokens
+
+    def record_parse_tokens(package_data):
+        package_data = list( package_data )
+        parsed.extend( package_data )
+
+        return iter_parse_tokens( package_data )
+
+    monkeypatch.setattr( status_file_parser, "iter_parse_tokens", record_parse_tokens )
+
+    status_file_cache.diff( status_file )
+
+    assert len( parsed ) == 1
+    assert parsed[0].startswith( "Package: nano" )
+
+
+def test_fingerprint_changes_with_the_section():
+    section = "Package: nano\nVersion: 7.2-1\n"
+
+    assert StatusFileParser.fingerprint( section ) == StatusFileParser.fingerprint( "Package: nano\nVersion: 7.2-1\n" )
+    assert StatusFileParser.fingerprint( section ) != StatusFileParser.fingerprint( "Package: nano\nVersion: 7.2-2\n" )